@@ -14,6 +14,7 @@ from docx import Document
 from tkinter import messagebox
 from modules.utils.error_handler import ErrorHandler
 from modules.ai.openai.content_reviewer import review_with_ai as openai_review
+from modules.document.text_processing.sentences import count_sentences
 
 def review_with_ai(app):
     """
@@ -124,26 +125,32 @@ def _perform_local_review(app):
     
     total_paragraphs = 0
     total_words = 0
+    total_sentences = 0
     chapter_stats = []
     
     for i, chapter in enumerate(app.chapters):
         chapter_paragraphs = len(chapter['content'])
         chapter_words = sum(len(p.text.split()) for p in chapter['content'])
+        chapter_sentences = sum(count_sentences(p.text) for p in chapter['content'])
         
         total_paragraphs += chapter_paragraphs
         total_words += chapter_words
+        total_sentences += chapter_sentences
         
         chapter_stats.append({
             'title': chapter['title'],
             'paragraphs': chapter_paragraphs,
-            'words': chapter_words
+            'words': chapter_words,
+            'sentences': chapter_sentences
         })
     
     stats_para = review_doc.add_paragraph()
     stats_para.add_run(f"Total chapters: {len(app.chapters)}").bold = True
     stats_para.add_run(f"\nTotal paragraphs: {total_paragraphs}")
     stats_para.add_run(f"\nTotal words: {total_words}")
+    stats_para.add_run(f"\nTotal sentences: {total_sentences}")
     stats_para.add_run(f"\nAverage words per chapter: {total_words // max(1, len(app.chapters))}")
+    stats_para.add_run(f"\nAverage sentence length: {total_words // max(1, total_sentences)} words")
     
     # Add chapter breakdowns
     review_doc.add_heading("Chapter Breakdown", level=2)
@@ -155,6 +162,7 @@ def _perform_local_review(app):
         chapter_para = review_doc.add_paragraph(style='List Bullet')
         chapter_para.add_run(f"Paragraphs: {stats['paragraphs']}")
         chapter_para.add_run(f"\nWords: {stats['words']}")
+        chapter_para.add_run(f"\nSentences: {stats['sentences']}")
         chapter_para.add_run(f"\nAverage paragraph length: {stats['words'] // max(1, stats['paragraphs'])} words")
     
     # Add simple recommendations
@@ -5,6 +5,9 @@ import openai
 from docx import Document
 from tkinter import messagebox
 from modules.ai.openai.api_client import get_api_key
+from modules.document.text_processing.sentences import chunk_sentences
+
+REVIEW_CHUNK_SIZE = 24000  # Characters of chapter text sent per review request
 
 def review_with_ai(app):
     """Review document content with AI to provide feedback and suggestions."""
@@ -60,9 +63,10 @@ def _get_review_parameters(app):
     
     return review_params
 
-def _create_review_prompt(chapter, chapter_index, review_focus, book_title):
-    """Create the system and user prompts for the review."""
-    chapter_text = "\n".join([p.text for p in chapter['content']])
+def _create_review_prompt(chapter, chapter_index, review_focus, book_title, chapter_text=None):
+    """Create the system and user prompts for the review of a chapter, or of one chunk of its text."""
+    if chapter_text is None:
+        chapter_text = "\n".join([p.text for p in chapter['content']])
     
     system_prompt = "You are an expert editor and writing coach. Provide a concise, helpful review of the text focusing on the requested aspects. Be specific and constructive with your feedback."
     
@@ -77,28 +81,40 @@ def _review_chapter(client, app, chapter, chapter_index, review_params):
         return None
     
     review_focus = ", ".join(review_params)
-    system_prompt, user_prompt, _ = _create_review_prompt(
-        chapter, 
-        chapter_index, 
-        review_focus, 
-        app.book_title.get()
-    )
+    
+    # Long chapters are reviewed in chunks that end between sentences
+    chunks = list(chunk_sentences((p.text for p in chapter['content']), REVIEW_CHUNK_SIZE)) or [""]
     
     app.log(f"Sending review request for chapter {chapter_index+1} to OpenAI...")
     model = app.openai_model.get()
     
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            max_tokens=2000,
-            temperature=0.3
-        )
+        feedback_parts = []
+        for part, chunk in enumerate(chunks):
+            system_prompt, user_prompt, _ = _create_review_prompt(
+                chapter, 
+                chapter_index, 
+                review_focus, 
+                app.book_title.get(),
+                chunk
+            )
+            
+            response = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                max_tokens=2000,
+                temperature=0.3
+            )
+            
+            feedback = response.choices[0].message.content.strip()
+            if len(chunks) > 1:
+                feedback = f"### Part {part+1} of {len(chunks)}\n\n{feedback}"
+            feedback_parts.append(feedback)
         
-        feedback = response.choices[0].message.content.strip()
+        feedback = "\n\n".join(feedback_parts)
         return f"## Chapter {chapter_index+1}: {chapter['title']}\n\n{feedback}\n\n"
     
     except openai.RateLimitError as e:
@@ -15,6 +15,10 @@ from typing import List, Dict, Any
 from tkinter import messagebox
 from modules.utils.error_handler import ErrorHandler
 
+# Batches are packed by estimated peak loading memory, never below this budget
+BATCH_MIN_MEMORY_BUDGET = 200 * 1024 * 1024  # 200MB
+BATCH_MEMORY_FRACTION = 0.25  # Share of available memory one batch may use
+
 def _get_memory_usage() -> float:
     """
     Get current memory usage in MB
@@ -29,6 +33,58 @@ def _get_memory_usage() -> float:
     except Exception:
         return 0.0
 
+def _get_batch_memory_budget() -> int:
+    """
+    Get the estimated memory a batch of files may use between collections
+    
+    Returns:
+        Memory budget in bytes
+    """
+    try:
+        available = psutil.virtual_memory().available
+    except Exception:
+        available = 0
+    return max(BATCH_MIN_MEMORY_BUDGET, int(available * BATCH_MEMORY_FRACTION))
+
+def _pack_batches(inspections: List[Any], memory_budget: int) -> List[List[Any]]:
+    """
+    Pack inspected files into batches that fit a memory budget
+    
+    Args:
+        inspections: PreflightResult objects in processing order
+        memory_budget: Maximum summed estimated memory per batch, in bytes
+        
+    Returns:
+        List of batches, each a list of PreflightResult objects
+    """
+    batches = []
+    current_batch = []
+    current_batch_memory = 0
+    
+    for inspection in inspections:
+        estimate = inspection.estimated_memory
+        # Process files that exceed the budget on their own individually
+        if estimate > memory_budget:
+            if current_batch:
+                batches.append(current_batch)
+                current_batch = []
+                current_batch_memory = 0
+            batches.append([inspection])
+        # Otherwise batch until reaching the budget
+        elif current_batch_memory + estimate > memory_budget:
+            batches.append(current_batch)
+            current_batch = [inspection]
+            current_batch_memory = estimate
+        else:
+            current_batch.append(inspection)
+            current_batch_memory += estimate
+    
+    # Add final batch if not empty
+    if current_batch:
+        batches.append(current_batch)
+    
+    return batches
+
 def _batch_process_documents(app):
     """Process multiple documents in batch with memory optimization and progress tracking.
     
@@ -36,49 +92,41 @@ def _batch_process_documents(app):
         app: The application instance containing UI elements and data
     """
     try:
-        # Estimate document sizes to determine processing order
-        file_sizes = [(file_path, os.path.getsize(file_path)) for file_path in app.input_files]
+        # Inspect every queued file up front, in parallel worker processes
+        app.update_progress(0, f"Inspecting {len(app.input_files)} files...")
+        from modules.document.preflight import inspect_files
+        inspections = inspect_files(app.input_files)
+        
+        # Report unsupported and corrupt files before any work is done
+        error_count = 0
+        for inspection in inspections:
+            if not inspection.is_supported:
+                error_count += 1
+                app.log.warning(f"Skipping {inspection.file_path}: {inspection.error}")
         
-        # Sort files by size (process smaller files first for quicker feedback)
-        sorted_files = sorted(file_sizes, key=lambda x: x[1])
+        # Sort files by estimated memory (process lighter files first for quicker feedback)
+        sorted_files = sorted(
+            (inspection for inspection in inspections if inspection.is_supported),
+            key=lambda inspection: inspection.estimated_memory
+        )
         
         # Performance tracking
         start_time = time.time()
         processed_count = 0
-        error_count = 0
+        processed_paragraphs = 0
         memory_before = _get_memory_usage()
         peak_memory = memory_before
         
         # Log start of batch processing
-        app.log.info(f"Starting batch processing of {len(sorted_files)} files. Initial memory: {memory_before:.2f} MB")
-        
-        # Group files into batches based on size to optimize memory usage
-        # Large files are processed individually to prevent memory issues
-        batches = []
-        current_batch = []
-        current_batch_size = 0
-        
-        # Batch files based on size thresholds
-        for file_path, size in sorted_files:
-            # Process very large files individually (>100MB)
-            if size > 100 * 1024 * 1024:
-                if current_batch:
-                    batches.append(current_batch)
-                    current_batch = []
-                    current_batch_size = 0
-                batches.append([(file_path, size)])
-            # For medium and small files, batch until reaching ~200MB total
-            elif current_batch_size + size > 200 * 1024 * 1024:
-                batches.append(current_batch)
-                current_batch = [(file_path, size)]
-                current_batch_size = size
-            else:
-                current_batch.append((file_path, size))
-                current_batch_size += size
+        total_paragraphs = sum(inspection.estimated_paragraphs for inspection in sorted_files)
+        app.log.info(
+            f"Starting batch processing of {len(sorted_files)} files "
+            f"(~{total_paragraphs} paragraphs). Initial memory: {memory_before:.2f} MB"
+        )
         
-        # Add final batch if not empty
-        if current_batch:
-            batches.append(current_batch)
+        # Group files into batches based on estimated peak memory
+        # Files that would exceed the budget on their own are processed individually
+        batches = _pack_batches(sorted_files, _get_batch_memory_budget())
         
         # Process each batch
         for batch_index, batch in enumerate(batches):
@@ -101,7 +149,9 @@ def _batch_process_documents(app):
                     peak_memory = current_memory
             
             # Process files in current batch
-            for file_path, size in batch:
+            for inspection in batch:
+                file_path = inspection.file_path
+                size = inspection.file_size
                 try:
                     # Check memory before processing each file
                     current_memory = _get_memory_usage()
@@ -118,10 +168,10 @@ def _batch_process_documents(app):
                     filename = os.path.basename(file_path)
                     
                     # Update progress with estimated time
-                    if processed_count > 0:
+                    if processed_count > 0 and processed_paragraphs > 0:
                         elapsed_time = time.time() - start_time
-                        avg_time_per_file = elapsed_time / processed_count
-                        estimated_remaining = avg_time_per_file * (len(sorted_files) - processed_count)
+                        avg_time_per_paragraph = elapsed_time / processed_paragraphs
+                        estimated_remaining = avg_time_per_paragraph * (total_paragraphs - processed_paragraphs)
                         minutes = int(estimated_remaining // 60)
                         seconds = int(estimated_remaining % 60)
                         time_str = f"{minutes}m {seconds}s" if minutes > 0 else f"{seconds}s"
@@ -156,6 +206,7 @@ def _batch_process_documents(app):
                         app.docx_content = None
                     
                     processed_count += 1
+                    processed_paragraphs += inspection.estimated_paragraphs
                     
                     # Force GC after processing very large files
                     if size > 50 * 1024 * 1024:
@@ -2,17 +2,30 @@
 from modules.document.format_handler import (
     extract_chapters_from_headings, detect_chapter_patterns
 )
+from modules.document.structure_index import get_structure_index, FLAG_BLANK
 
-def extract_chapters(app):
-    """Extract chapters from loaded document using multiple detection methods."""
+def extract_chapters(app, index=None):
+    """
+    Extract chapters from loaded document using multiple detection methods.
+    
+    Args:
+        app: The application instance containing the loaded document
+        index: StructureIndex of the document, built (and stored on the app) if not given
+    """
     app.update_progress(40, "Extracting chapters...")
     app.chapters = []
     
+    # One pass over the document serves every detection method below
+    if index is None:
+        index = get_structure_index(app, rebuild=True)
+    paragraphs = app.docx_content.paragraphs
+    
     # First try to extract based on heading styles
     heading_chapters = extract_chapters_from_headings(
         app.docx_content,
         min_heading_level=1,
-        max_heading_level=2
+        max_heading_level=2,
+        index=index
     )
     
     if heading_chapters:
@@ -22,7 +35,7 @@ def extract_chapters(app):
         app.log("No chapters found by heading analysis, trying pattern detection...")
         
         # Try to detect chapter patterns
-        chapter_indices = detect_chapter_patterns(app.docx_content)
+        chapter_indices = detect_chapter_patterns(app.docx_content, index=index)
         
         if chapter_indices:
             app.log(f"Found {len(chapter_indices)} potential chapter patterns")
@@ -30,14 +43,15 @@ def extract_chapters(app):
             # Convert chapter indices to chapters
             for i, idx in enumerate(chapter_indices):
                 # Determine end index (start of next chapter or end of document)
-                end_idx = chapter_indices[i+1] if i+1 < len(chapter_indices) else len(app.docx_content.paragraphs)
+                end_idx = chapter_indices[i+1] if i+1 < len(chapter_indices) else len(paragraphs)
                 
-                chapter_title = app.docx_content.paragraphs[idx].text
-                chapter_content = app.docx_content.paragraphs[idx:end_idx]
+                chapter_title = paragraphs[idx].text
+                chapter_content = paragraphs[idx:end_idx]
                 
                 app.chapters.append({
                     'title': chapter_title,
-                    'content': chapter_content
+                    'content': chapter_content,
+                    'start': idx
                 })
         else:
             # If no patterns found, try to split by blank lines
@@ -45,40 +59,27 @@ def extract_chapters(app):
             
             current_chapter = None
             chapter_content = []
-            section_break_count = 0
+            flags = index.flags
+            blank_runs = index.blank_runs
             
-            for i, para in enumerate(app.docx_content.paragraphs):
-                # Check if this paragraph is empty (potential section break)
-                if not para.text.strip():
-                    section_break_count += 1
+            for i, para in enumerate(paragraphs):
+                # Empty paragraphs are potential section breaks, not content
+                if flags[i] & FLAG_BLANK:
+                    continue
+                
+                # Consecutive blank lines before text start a new section, titled
+                # by its first paragraph, as does the first paragraph with text
+                if current_chapter is None or blank_runs[i] >= 2:
+                    if current_chapter and chapter_content:
+                        app.chapters.append({
+                            'title': current_chapter,
+                            'content': chapter_content
+                        })
+                    current_chapter = para.text
+                    chapter_content = [para]
                 else:
-                    # If we have consecutive blank lines and text after, potential new section
-                    if section_break_count >= 2 and i > 0:
-                        # If we have content already, save as chapter
-                        if current_chapter and chapter_content:
-                            app.chapters.append({
-                                'title': current_chapter,
-                                'content': chapter_content
-                            })
-                            
-                            # Start new chapter with this paragraph as title
-                            current_chapter = para.text
-                            chapter_content = [para]
-                        else:
-                            # First chapter
-                            current_chapter = para.text
-                            chapter_content = [para]
-                    else:
-                        # Continue current chapter
-                        if current_chapter:
-                            chapter_content.append(para)
-                        else:
-                            # First paragraph becomes chapter title
-                            current_chapter = para.text
-                            chapter_content = [para]
-                    
-                    # Reset section break counter
-                    section_break_count = 0
+                    # Continue current chapter
+                    chapter_content.append(para)
             
             # Add the last chapter if it exists
             if current_chapter and chapter_content:
@@ -92,7 +93,8 @@ def extract_chapters(app):
         app.log("No chapters found with any method, creating a single chapter...")
         app.chapters.append({
             'title': app.book_title.get() or "Untitled Chapter",
-            'content': app.docx_content.paragraphs
+            'content': paragraphs,
+            'start': 0
         })
     
     app.log(f"Extracted {len(app.chapters)} chapters")
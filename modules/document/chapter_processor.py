@@ -5,6 +5,7 @@ from docx import Document
 from docx.shared import Pt, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from tkinter import messagebox
+from modules.document.loaders.styles import get_style_cache
 
 def save_all_chapters(app):
     if not app.chapters:
@@ -19,6 +20,7 @@ def save_all_chapters(app):
         os.makedirs(app.output_dir.get(), exist_ok=True)
         
         total_chapters = len(app.chapters)
+        styles = get_style_cache(app.docx_content)
         for i, chapter in enumerate(app.chapters):
             app.update_progress((i / total_chapters) * 100, f"Saving chapter {i+1} of {total_chapters}")
             
@@ -36,8 +38,8 @@ def save_all_chapters(app):
             
             # Add the chapter content
             for para in chapter['content'][1:]:  # Skip the title paragraph
-                if para.style.name.startswith('Heading'):
-                    level = int(para.style.name[-1])
+                level = styles.heading_level(para)
+                if level:
                     doc.add_heading(para.text, level=level)
                 else:
                     doc.add_paragraph(para.text)
@@ -104,6 +106,7 @@ def generate_complete_book(app):
         # Add each chapter
         app.update_progress(40, "Adding chapters...")
         total_chapters = len(app.chapters)
+        styles = get_style_cache(app.docx_content)
         
         for i, chapter in enumerate(app.chapters):
             app.update_progress(40 + (i / total_chapters) * 50, f"Adding chapter {i+1} of {total_chapters}")
@@ -114,8 +117,8 @@ def generate_complete_book(app):
             
             # Add chapter content
             for para in chapter['content'][1:]:  # Skip the title paragraph
-                if para.style.name.startswith('Heading'):
-                    level = int(para.style.name[-1])
+                level = styles.heading_level(para)
+                if level:
                     doc.add_heading(para.text, level=level)
                 else:
                     doc.add_paragraph(para.text)
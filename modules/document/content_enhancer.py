@@ -1,6 +1,103 @@
 
 import re
 from tkinter import messagebox
+from modules.document.paragraph_patch import apply_paragraph_text
+from modules.document.text_processing.paragraph_cache import ParagraphCache, log_cache_stats
+from modules.document.text_processing.sentences import iter_sentence_spans, space_after_punctuation
+from modules.document.structure_index import (
+    StructureIndex, get_chapter_index, FLAG_HEADING, FLAG_BLANK
+)
+
+def enhance_paragraph_text(text):
+    """Apply the local text improvements to a single paragraph text."""
+    # Apply multiple enhancement techniques
+    new_text = text
+
+    # 1. Fix multiple spaces
+    new_text = ' '.join(new_text.split())
+
+    # 2. Fix capitalization at beginning of sentences, leaving abbreviations alone
+    starts = [start for start, _ in iter_sentence_spans(new_text) if new_text[start].islower()]
+    if starts:
+        chars = list(new_text)
+        for start in starts:
+            chars[start] = chars[start].upper()
+        new_text = ''.join(chars)
+
+    # 3. Fix common grammatical issues
+    common_fixes = {
+        ' i ': ' I ',
+        ' dont ': " don't ",
+        ' cant ': " can't ",
+        ' wont ': " won't ",
+        ' didnt ': " didn't ",
+        ' its ': " it's ",  # possessive vs contraction
+        ' youre ': " you're ",
+        ' theyre ': " they're ",
+        ' theres ': " there's ",
+        ' shouldnt ': " shouldn't ",
+        ' couldnt ': " couldn't ",
+        ' wouldnt ': " wouldn't ",
+        ' wasnt ': " wasn't ",
+        ' werent ': " weren't ",
+        ' havent ': " haven't ",
+        ' hasnt ': " hasn't ",
+        ' doesnt ': " doesn't ",
+        ' dont ': " don't ",
+        ' isnt ': " isn't ",
+        ' arent ': " aren't ",
+    }
+
+    for error, fix in common_fixes.items():
+        if error in ' ' + new_text.lower() + ' ':
+            new_text = (' ' + new_text + ' ').replace(' ' + error + ' ', fix)
+            new_text = new_text.strip()
+
+    # 4. Fix spacing after punctuation, keeping abbreviations like "U.S.C." together
+    new_text = space_after_punctuation(new_text)
+
+    # 5. Fix repeated punctuation
+    new_text = re.sub(r'([.!?]){2,}', r'\1', new_text)
+
+    # 6. Fix common typography errors
+    new_text = new_text.replace(" - ", " – ")  # Use en dash for ranges
+
+    return new_text
+
+def enhance_chapter_content(app, paragraphs, index=None, offset=0, enhance_text=enhance_paragraph_text):
+    """
+    Apply the local text improvements to a run of paragraphs.
+    
+    Args:
+        app: The application instance
+        paragraphs: The paragraphs to enhance, in document order
+        index: StructureIndex covering the paragraphs, built if not given
+        offset: Position of the first paragraph in the index
+        enhance_text: Function returning the enhanced text of a paragraph
+        
+    Returns:
+        int: Number of paragraphs that were changed
+    """
+    if index is None:
+        index = StructureIndex(paragraphs)
+        offset = 0
+    flags = index.flags
+    
+    enhanced_paragraphs = 0
+    for position, para in enumerate(paragraphs, offset):
+        # Skip headings and empty paragraphs
+        if flags[position] & (FLAG_HEADING | FLAG_BLANK):
+            continue
+        
+        original_text = para.text
+        new_text = enhance_text(original_text)
+        
+        # If the text was changed, update the paragraph
+        if new_text != original_text:
+            apply_paragraph_text(para, new_text)
+            enhanced_paragraphs += 1
+    
+    return enhanced_paragraphs
 
 def enhance_book_content(app):
     """Enhanced book content processing with more sophisticated text improvements."""
@@ -8,79 +105,18 @@ def enhance_book_content(app):
     
     # Stats to track changes
     enhanced_paragraphs = 0
+    cache = ParagraphCache()
+    enhance_text = cache.memoize(enhance_paragraph_text)
     
-    # Process each chapter
+    # Process each chapter, applying the enhancements once per distinct text
     for chapter in app.chapters:
-        # Process paragraphs in this chapter
-        for para in chapter['content']:
-            original_text = para.text
-            
-            # Skip headings and empty paragraphs
-            if para.style.name.startswith('Heading') or not original_text.strip():
-                continue
-            
-            # Apply multiple enhancement techniques
-            new_text = original_text
-            
-            # 1. Fix multiple spaces
-            new_text = ' '.join(new_text.split())
-            
-            # 2. Fix capitalization at beginning of sentences
-            sentences = re.split(r'(\.|\?|\!)\s+', new_text)
-            processed_sentences = []
-            for i in range(0, len(sentences), 2):
-                sentence = sentences[i]
-                if sentence and sentence[0].islower():
-                    sentence = sentence[0].upper() + sentence[1:]
-                processed_sentences.append(sentence)
-                if i+1 < len(sentences):
-                    processed_sentences.append(sentences[i+1])
-            new_text = ''.join(processed_sentences)
-            
-            # 3. Fix common grammatical issues
-            common_fixes = {
-                ' i ': ' I ',
-                ' dont ': " don't ",
-                ' cant ': " can't ",
-                ' wont ': " won't ",
-                ' didnt ': " didn't ",
-                ' its ': " it's ",  # possessive vs contraction
-                ' youre ': " you're ",
-                ' theyre ': " they're ",
-                ' theres ': " there's ",
-                ' shouldnt ': " shouldn't ",
-                ' couldnt ': " couldn't ",
-                ' wouldnt ': " wouldn't ",
-                ' wasnt ': " wasn't ",
-                ' werent ': " weren't ",
-                ' havent ': " haven't ",
-                ' hasnt ': " hasn't ",
-                ' doesnt ': " doesn't ",
-                ' dont ': " don't ",
-                ' isnt ': " isn't ",
-                ' arent ': " aren't ",
-            }
-            
-            for error, fix in common_fixes.items():
-                if error in ' ' + new_text.lower() + ' ':
-                    new_text = (' ' + new_text + ' ').replace(' ' + error + ' ', fix)
-                    new_text = new_text.strip()
-            
-            # 4. Fix spacing after punctuation
-            new_text = re.sub(r'([.!?:;,])([^\s\d"])', r'\1 \2', new_text)
-            
-            # 5. Fix repeated punctuation
-            new_text = re.sub(r'([.!?]){2,}', r'\1', new_text)
-            
-            # 6. Fix common typography errors
-            new_text = new_text.replace(" - ", " – ")  # Use en dash for ranges
-            
-            # If the text was changed, update the paragraph
-            if new_text != original_text:
-                para.text = new_text
-                enhanced_paragraphs += 1
+        index, offset = get_chapter_index(app, chapter)
+        enhanced_paragraphs += enhance_chapter_content(
+            app, chapter['content'], index, offset, enhance_text
+        )
     
     app.log(f"Enhanced {enhanced_paragraphs} paragraphs")
+    log_cache_stats("enhance_book_content", cache.hits, cache.misses)
 
 def apply_ai_enhancements(app, chapter_idx, content_type='grammar'):
     """Apply AI-based enhancements to a specific chapter with improved error handling."""
@@ -128,14 +164,15 @@ def apply_ai_enhancements(app, chapter_idx, content_type='grammar'):
             # Update the content while preserving headings
             heading_style = None
             paragraph_idx = 0
+            index, offset = get_chapter_index(app, chapter)
             
             for i, para in enumerate(chapter['content']):
-                if para.style.name.startswith('Heading'):
+                if index.flags[offset + i] & FLAG_HEADING:
                     # Preserve headings
                     heading_style = para.style
                 elif paragraph_idx < len(new_paragraphs):
-                    # Update paragraph text with enhanced content
-                    para.text = new_paragraphs[paragraph_idx]
+                    # Update paragraph text with enhanced content, keeping run formatting
+                    apply_paragraph_text(para, new_paragraphs[paragraph_idx])
                     paragraph_idx += 1
             
             messagebox.showinfo("Success", f"Chapter '{chapter['title']}' has been enhanced successfully")
@@ -147,13 +184,14 @@ def apply_ai_enhancements(app, chapter_idx, content_type='grammar'):
                 
                 # Apply basic text improvements to chapter
                 improved = False
-                for para in chapter['content']:
-                    if not para.style.name.startswith('Heading'):
+                index, offset = get_chapter_index(app, chapter)
+                for i, para in enumerate(chapter['content']):
+                    if not index.flags[offset + i] & FLAG_HEADING:
                         original_text = para.text
                         
                         # Apply some basic improvements locally
                         new_text = ' '.join(para.text.split())  # Fix spacing
-                        new_text = re.sub(r'([.!?:;,])([^\s\d"])', r'\1 \2', new_text)  # Fix punctuation
+                        new_text = space_after_punctuation(new_text)  # Fix punctuation
                         
                         # Apply common fixes
                         common_fixes = {
@@ -167,7 +205,7 @@ def apply_ai_enhancements(app, chapter_idx, content_type='grammar'):
                                 new_text = new_text.strip()
                         
                         if new_text != original_text:
-                            para.text = new_text
+                            apply_paragraph_text(para, new_text)
                             improved = True
                 
                 if improved:
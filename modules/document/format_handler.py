@@ -1,7 +1,6 @@
 
 from docx import Document
 from bs4 import BeautifulSoup
-import re
 import os
 
 def detect_file_format(file_path):
@@ -17,172 +16,121 @@ def detect_file_format(file_path):
         return 'md'
     elif ext == '.html' or ext == '.htm':
         return 'html'
+    elif ext == '.pdf':
+        return 'pdf'
     else:
         return 'unknown'
 
 def load_docx_document(file_path):
-    """Load a DOCX document and return a Document object."""
-    return Document(file_path)
+    """Load a DOCX document and return it wrapped in a DocumentSnapshot."""
+    from modules.document.loaders.records import DocumentSnapshot
+    
+    return DocumentSnapshot(Document(file_path))
 
-def load_text_document(file_path, encoding='utf-8'):
+def load_text_document(file_path, encoding=None):
     """Load a text document and return its content."""
+    if encoding is None:
+        from modules.document.text_processing.encoding import sniff_encoding
+        encoding, _ = sniff_encoding(file_path)
+    
     try:
         with open(file_path, 'r', encoding=encoding) as f:
             return f.read()
     except UnicodeDecodeError:
-        # If UTF-8 fails, try with latin-1 (which can read any byte sequence)
+        # If decoding fails, try with latin-1 (which can read any byte sequence)
         with open(file_path, 'r', encoding='latin-1') as f:
             return f.read()
 
-def load_html_document(file_path, encoding='utf-8'):
-    """Load an HTML document and return a BeautifulSoup object."""
+def load_html_document(file_path, encoding=None, sanitize=False):
+    """Load an HTML document and return a BeautifulSoup object, optionally sanitizing it first."""
+    if encoding is None:
+        from modules.document.text_processing.encoding import sniff_encoding
+        encoding, _ = sniff_encoding(file_path)
+    
     try:
         with open(file_path, 'r', encoding=encoding) as f:
             content = f.read()
-        return BeautifulSoup(content, 'html.parser')
     except UnicodeDecodeError:
-        # If UTF-8 fails, try with latin-1
+        # If decoding fails, try with latin-1
         with open(file_path, 'r', encoding='latin-1') as f:
             content = f.read()
-        return BeautifulSoup(content, 'html.parser')
+    
+    if sanitize:
+        from modules.utils.security_utils import sanitize_html
+        content = sanitize_html(content)
+    return BeautifulSoup(content, 'html.parser')
 
 def convert_html_to_document(html_soup):
-    """Convert an HTML BeautifulSoup object to a Document object."""
-    doc = Document()
-    
-    # Process headings
-    for i in range(1, 7):
-        for heading in html_soup.find_all(f'h{i}'):
-            doc.add_heading(heading.get_text(), level=i)
-            
-    # Process paragraphs
-    for para in html_soup.find_all('p'):
-        doc.add_paragraph(para.get_text())
-        
-    # Process lists
-    for ul in html_soup.find_all('ul'):
-        for li in ul.find_all('li'):
-            doc.add_paragraph(f"• {li.get_text()}", style='List Bullet')
-            
-    for ol in html_soup.find_all('ol'):
-        for i, li in enumerate(ol.find_all('li')):
-            doc.add_paragraph(f"{i+1}. {li.get_text()}", style='List Number')
+    """Convert an HTML BeautifulSoup object (or HTML string) to a DocumentModel."""
+    from modules.document.loaders.html_loader import parse_html_blocks
+    from modules.document.loaders.records import DocumentModel
     
-    return doc
+    # Walk the markup once so headings, paragraphs and lists keep their order
+    return DocumentModel(parse_html_blocks(str(html_soup)))
 
 def convert_markdown_to_document(markdown_content):
-    """Convert Markdown content to a Document object."""
-    doc = Document()
+    """Convert Markdown content to a DocumentModel."""
+    from modules.document.loaders.markdown_loader import parse_markdown_blocks
+    from modules.document.loaders.records import DocumentModel
     
-    lines = markdown_content.split('\n')
-    i = 0
+    return DocumentModel(parse_markdown_blocks(markdown_content))
+
+def extract_chapters_from_headings(doc, min_heading_level=1, max_heading_level=2, index=None):
+    """
+    Extract chapters from a document based on heading levels.
     
-    while i < len(lines):
-        line = lines[i].strip()
-        
-        # Process headings
-        heading_match = re.match(r'^(#{1,6})\s+(.+)$', line)
-        if heading_match:
-            level = len(heading_match.group(1))
-            text = heading_match.group(2)
-            doc.add_heading(text, level=level)
-        
-        # Process paragraphs (collect consecutive lines)
-        elif line and not line.startswith('```'):
-            paragraph_text = [line]
-            j = i + 1
-            while j < len(lines) and lines[j].strip() and not lines[j].strip().startswith('#') and not lines[j].strip().startswith('```'):
-                paragraph_text.append(lines[j].strip())
-                j += 1
-            
-            # Join the paragraph lines and add to document
-            full_paragraph = ' '.join(paragraph_text)
-            
-            # Check if it's a list item
-            if full_paragraph.startswith('* ') or full_paragraph.startswith('- '):
-                doc.add_paragraph(full_paragraph[2:], style='List Bullet')
-            elif re.match(r'^\d+\.\s', full_paragraph):
-                doc.add_paragraph(full_paragraph, style='List Number')
-            else:
-                doc.add_paragraph(full_paragraph)
-            
-            i = j - 1  # -1 because of the i+=1 at the end of the loop
-        
-        # Skip code blocks
-        elif line.startswith('```'):
-            j = i + 1
-            while j < len(lines) and not lines[j].strip() == '```':
-                j += 1
-            i = j
-        
-        i += 1
+    Args:
+        doc: The document to split
+        min_heading_level: Shallowest heading level that starts a chapter
+        max_heading_level: Deepest heading level that starts a chapter
+        index: Optional StructureIndex of the document's paragraphs
+    """
+    from modules.document.structure_index import StructureIndex
     
-    return doc
-
-def extract_chapters_from_headings(doc, min_heading_level=1, max_heading_level=2):
-    """Extract chapters from a document based on heading levels."""
-    chapters = []
-    current_chapter = None
-    chapter_content = []
+    paragraphs = doc.paragraphs
+    if index is None:
+        index = StructureIndex(paragraphs, doc)
     
-    for para in doc.paragraphs:
-        # Check if paragraph is a heading of the specified levels
-        if para.style.name.startswith('Heading') or para.style.name.startswith('Title'):
-            # Get heading level
-            if para.style.name.startswith('Heading'):
-                level = int(para.style.name[-1])
-            else:  # Title
-                level = 1
-                
-            # If the heading is within our chapter level range
-            if min_heading_level <= level <= max_heading_level:
-                # If we already have a chapter in progress, save it
-                if current_chapter:
-                    chapters.append({
-                        'title': current_chapter,
-                        'content': chapter_content
-                    })
-                
-                # Start a new chapter
-                current_chapter = para.text
-                chapter_content = [para]
-            else:
-                # Add the heading to the current chapter
-                if current_chapter:
-                    chapter_content.append(para)
-        else:
-            # Add to current chapter if one exists, otherwise ignore
-            if current_chapter:
-                chapter_content.append(para)
+    # Headings within our chapter level range start chapters (Title counts as level 1)
+    levels = index.heading_levels
+    starts = [
+        position for position in index.headings_in()
+        if min_heading_level <= levels[position] <= max_heading_level
+    ]
     
-    # Add the last chapter if it exists
-    if current_chapter:
+    chapters = []
+    for i, start in enumerate(starts):
+        # A heading without text ends the previous chapter but starts none
+        title = paragraphs[start].text
+        if not title:
+            continue
+        
+        # The chapter runs up to the next chapter heading, including lower-level headings
+        end = starts[i + 1] if i + 1 < len(starts) else len(paragraphs)
         chapters.append({
-            'title': current_chapter,
-            'content': chapter_content
+            'title': title,
+            'content': paragraphs[start:end],
+            'start': start
         })
     
     return chapters
 
-def detect_chapter_patterns(doc):
-    """Heuristically detect chapter patterns in a document."""
-    potential_chapter_starts = []
+def detect_chapter_patterns(doc, index=None):
+    """
+    Heuristically detect chapter patterns in a document.
     
-    # Look for common chapter patterns in the first 30 paragraphs
-    chapter_patterns = [
-        r'^chapter\s+\d+',  # "Chapter 1"
-        r'^section\s+\d+',  # "Section 1"
-        r'^part\s+\d+',     # "Part 1"
-        r'^\d+\.\s',        # "1. Chapter Title"
-        r'^chapter\s+[\w\s]+:',  # "Chapter One: The Beginning"
-    ]
-    
-    sample_paragraphs = doc.paragraphs[:min(30, len(doc.paragraphs))]
-    
-    for i, para in enumerate(sample_paragraphs):
-        for pattern in chapter_patterns:
-            if re.match(pattern, para.text.lower()):
-                potential_chapter_starts.append(i)
-                break
+    Args:
+        doc: The document to search
+        index: Optional StructureIndex of the document's paragraphs
+        
+    Returns:
+        list: Positions of the potential chapter starts among the first paragraphs
+    """
+    from modules.document.structure_index import (
+        StructureIndex, FLAG_CHAPTER_START, CHAPTER_PATTERN_SAMPLE
+    )
     
-    return potential_chapter_starts
+    # Look for common chapter patterns in the first 30 paragraphs
+    if index is None:
+        index = StructureIndex(doc.paragraphs[:CHAPTER_PATTERN_SAMPLE])
+    return index.find(FLAG_CHAPTER_START, 0, CHAPTER_PATTERN_SAMPLE)
@@ -3,9 +3,9 @@ import os
 import gc
 import time
 import psutil
-from docx import Document
 from tkinter import messagebox
 from modules.document.format_handler import detect_file_format
+from modules.document.loaders.styles import get_style_cache
 
 def load_document(app):
     """Main function to load document from file."""
@@ -40,91 +40,29 @@ def load_document(app):
         file_format = detect_file_format(file_path)
         app.log.info(f"Detected file format: {file_format}")
         
-        # Set chunk sizes based on available memory
         if memory_critical:
-            text_chunk_size = 500  # Smaller chunks for low memory
-            docx_chunk_size = 50
-        else:
-            text_chunk_size = 1000  # Larger chunks for normal memory
-            docx_chunk_size = 200
-        
-        # Import format-specific loaders
-        from modules.document.loaders.docx_loader import load_docx_document, load_large_docx_document
-        from modules.document.loaders.text_loader import load_text_document, load_large_text_document
-        from modules.document.loaders.markdown_loader import convert_large_markdown_to_document
-        from modules.document.loaders.html_loader import load_html_document, convert_large_html_to_document
-        from modules.document.format_handler import convert_markdown_to_document, convert_html_to_document
+            app.log.warning(f"Available memory is low ({available_memory_mb:.2f} MB)")
         
         # Load document based on format
-        if file_format == 'docx':
-            # For large DOCX files, use optimized loading
+        if file_format == 'docx' and not (is_large_file and memory_critical):
+            # Keep the python-docx document, so runs, tables, images and
+            # styles survive processing and saving
+            from modules.document.loaders.docx_loader import load_docx_document, load_large_docx_document
             if is_large_file:
-                doc = load_large_docx_document(file_path, app, docx_chunk_size)
+                doc = load_large_docx_document(file_path, app)
             else:
-                # Load the DOCX document normally
                 doc = load_docx_document(file_path)
             app.docx_content = doc
             
-        elif file_format == 'txt':
-            # Load text file with optimizations for large files
-            if is_large_file:
-                content = load_large_text_document(file_path, app, text_chunk_size)
-            else:
-                content = load_text_document(file_path)
-            
-            # Create a Document object from text
-            doc = Document()
-            
-            # For large text files, process in chunks
-            if is_large_file:
-                lines = content.split('\n')
-                chunk_size = text_chunk_size
-                total_lines = len(lines)
-                
-                for i in range(0, total_lines, chunk_size):
-                    end_idx = min(i + chunk_size, total_lines)
-                    chunk = lines[i:end_idx]
-                    
-                    for line in chunk:
-                        if line.strip():  # Skip empty lines
-                            doc.add_paragraph(line)
-                    
-                    # Update progress
-                    progress = 10 + (i / total_lines) * 30
-                    app.update_progress(progress, f"Processing text content ({i}/{total_lines} lines)...")
-                    
-                    # Force garbage collection between chunks
-                    if i % (chunk_size * 3) == 0:
-                        gc.collect()
-            else:
-                # Split the text content by lines and add as paragraphs
-                lines = content.split('\n')
-                for line in lines:
-                    if line.strip():  # Skip empty lines
-                        doc.add_paragraph(line)
-            
-            app.docx_content = doc
-            
-        elif file_format == 'md':
-            # Load markdown file
-            content = load_text_document(file_path)
-            
-            # Convert markdown to Document with optimizations for large files
-            if is_large_file:
-                doc = convert_large_markdown_to_document(content, app, text_chunk_size)
-            else:
-                doc = convert_markdown_to_document(content)
-            app.docx_content = doc
-            
-        elif file_format == 'html':
-            # Load HTML file
-            soup = load_html_document(file_path)
-            
-            # Convert HTML to Document with optimizations for large files
-            if is_large_file:
-                doc = convert_large_html_to_document(soup, app, text_chunk_size)
-            else:
-                doc = convert_html_to_document(soup)
+        elif file_format in ('docx', 'pdf', 'txt', 'md', 'html'):
+            # Stream paragraph records straight from the file (or the parse
+            # cache) into the lightweight document model. A large DOCX file
+            # only gets here when memory is too low for python-docx, and
+            # loses its formatting
+            if file_format == 'docx':
+                app.log.warning("Low memory: loading DOCX text and styles only, formatting will not be kept")
+            from modules.document.loaders.records import DocumentModel
+            doc = DocumentModel(_load_document_records(app, file_path, file_format, is_large_file))
             app.docx_content = doc
             
         else:
@@ -157,13 +95,90 @@ def load_document(app):
         messagebox.showerror("Error", f"Failed to load document: {str(e)}")
         app.update_progress(0, "Error loading document")
 
+def _load_document_records(app, file_path, file_format, is_large_file):
+    """Return the paragraph records of a file, using the parse cache when possible."""
+    from modules.document.loaders.parse_cache import get_parse_cache
+    
+    filename = os.path.basename(file_path)
+    cache = get_parse_cache()
+    try:
+        key = cache.make_key(file_path, file_format)
+        records = cache.load(key)
+    except OSError as e:
+        app.log.warning(f"Parse cache unavailable: {str(e)}")
+        return _iter_document_records(app, file_path, file_format, is_large_file)
+    
+    if records is not None:
+        app.log.info(f"Parse cache hit for {filename}: {len(records)} paragraphs")
+        return records
+    
+    app.log.info(f"Parse cache miss for {filename}, parsing file")
+    return cache.iter_and_store(key, _iter_document_records(app, file_path, file_format, is_large_file))
+
+def _iter_document_records(app, file_path, file_format, is_large_file):
+    """Select the streaming loader for a file format and return its record iterator."""
+    from modules.document.loaders.records import ParagraphRecord
+    
+    # Only report progress for large files
+    progress_app = app if is_large_file else None
+    
+    if file_format == 'docx':
+        from modules.document.loaders.docx_loader import iter_docx_paragraphs
+        return iter_docx_paragraphs(file_path, progress_app)
+    
+    if file_format == 'pdf':
+        from modules.document.loaders.pdf_loader import iter_pdf_paragraphs
+        app.log.info("Extracting PDF pages in parallel")
+        return iter_pdf_paragraphs(file_path, progress_app)
+    
+    # Text formats are decoded with the sniffed encoding instead of assuming UTF-8
+    from modules.document.text_processing.encoding import sniff_encoding
+    encoding, confidence = sniff_encoding(file_path)
+    app.log.info(f"Detected encoding: {encoding} (confidence {confidence:.2f})")
+    
+    # Reject binary content before parsing. Only the leading window is read,
+    # so the file is not scanned twice; script and style content in HTML is
+    # dropped by the HTML parser, so unsafe tags do not stop loading. Empty
+    # files have nothing to check and load as empty documents
+    if os.path.getsize(file_path):
+        from modules.document.text_processing.format_processors import (
+            validate_file_stream, VALIDATION_WINDOW_SIZE
+        )
+        is_valid, error = validate_file_stream(
+            file_path, 'txt', encoding=encoding, max_size=None, sample_size=VALIDATION_WINDOW_SIZE
+        )
+        if not is_valid:
+            raise ValueError(error)
+    
+    if file_format == 'txt':
+        from modules.document.loaders.text_loader import (
+            iter_text_paragraphs, iter_text_paragraphs_mmap, MMAP_MIN_FILE_SIZE
+        )
+        from modules.document.loaders.reflow import reflow_lines
+        if os.path.getsize(file_path) >= MMAP_MIN_FILE_SIZE:
+            app.log.info("Using memory-mapped loading for very large text file")
+            lines = iter_text_paragraphs_mmap(file_path, progress_app, encoding=encoding, skip_empty=False)
+        else:
+            lines = iter_text_paragraphs(file_path, progress_app, encoding=encoding, skip_empty=False)
+        # Join hard-wrapped lines into logical paragraphs as they stream in
+        return (ParagraphRecord(text) for text in reflow_lines(lines))
+    
+    if file_format == 'md':
+        from modules.document.loaders.markdown_loader import iter_markdown_blocks
+        return iter_markdown_blocks(file_path, progress_app, encoding=encoding)
+    
+    from modules.document.loaders.html_loader import iter_html_blocks
+    return iter_html_blocks(file_path, progress_app, encoding=encoding)
+
 def extract_document_title(app, doc, file_path):
     """Extract document title from content or filename."""
     if not app.book_title.get():
         # First check if there's a Title style paragraph
         title_found = False
+        styles = get_style_cache(doc)
         for para in doc.paragraphs[:10]:  # Only check first 10 paragraphs for efficiency
-            if para.style.name.startswith('Title') or para.style.name.startswith('Heading 1'):
+            name, level = styles.resolve(para)
+            if name.startswith('Title') or level == 1:
                 app.book_title.set(para.text)
                 title_found = True
                 break
@@ -1,19 +1,142 @@
 
+import zipfile
+from xml.etree import ElementTree
 from docx import Document
+from modules.document.loaders.records import ParagraphRecord, DocumentSnapshot
+from modules.document.loaders.styles import style_heading_level
+
+# WordprocessingML element and attribute names
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_VAL = W_NS + 'val'
+_BODY = W_NS + 'body'
+_P = W_NS + 'p'
+_R = W_NS + 'r'
+_T = W_NS + 't'
+_TAB = W_NS + 'tab'
+_BREAKS = (W_NS + 'br', W_NS + 'cr')
+_SKIPPED = (W_NS + 'pPr', W_NS + 'rPr', W_NS + 'del', W_NS + 'moveFrom')
 
 def load_docx_document(file_path):
-    """Load a standard DOCX file."""
-    return Document(file_path)
+    """Load a standard DOCX file, with its paragraph list built only once."""
+    return DocumentSnapshot(Document(file_path))
+
+def read_docx_styles(archive):
+    """
+    Map paragraph style ids to their name and heading level.
+
+    Args:
+        archive: An open zipfile.ZipFile of the DOCX package
+
+    Returns:
+        dict: style id -> (style name, heading level or 0)
+    """
+    styles = {}
+    try:
+        with archive.open('word/styles.xml') as f:
+            root = ElementTree.parse(f).getroot()
+    except KeyError:
+        return styles
+
+    for style in root.iter(W_NS + 'style'):
+        if style.get(W_NS + 'type') != 'paragraph':
+            continue
+        style_id = style.get(W_NS + 'styleId')
+        name_element = style.find(W_NS + 'name')
+        name = name_element.get(W_VAL) if name_element is not None else style_id
+
+        styles[style_id] = (name, style_heading_level(name, style))
+
+    return styles
+
+def _collect_run_text(element, parts):
+    """Append the visible text of all runs below element to parts."""
+    for child in element:
+        tag = child.tag
+        if tag == _R:
+            for item in child:
+                if item.tag == _T:
+                    parts.append(item.text or '')
+                elif item.tag == _TAB:
+                    parts.append('\t')
+                elif item.tag in _BREAKS:
+                    parts.append('\n')
+        elif tag not in _SKIPPED:
+            # Hyperlinks, insertions, smart tags and fields wrap further runs
+            _collect_run_text(child, parts)
+
+def _paragraph_record(element, styles):
+    """Build a ParagraphRecord from a parsed w:p element."""
+    parts = []
+    _collect_run_text(element, parts)
+
+    style_id = 'Normal'
+    style_element = element.find(f'{W_NS}pPr/{W_NS}pStyle')
+    if style_element is not None:
+        style_id = style_element.get(W_VAL, 'Normal')
+
+    name, level = styles.get(style_id, (style_id, 0))
+    if name == 'Title':
+        style_id = 'Title'
+
+    return ParagraphRecord(''.join(parts), style_id, level)
+
+def iter_docx_paragraphs(file_path, app=None):
+    """
+    Lazily yield the body paragraphs of a DOCX file as ParagraphRecords.
+
+    word/document.xml is streamed out of the zip package with an incremental
+    parser, and every top-level body element is discarded as soon as it has
+    been read, so the full document tree is never built. As with
+    python-docx's Document.paragraphs, paragraphs nested in tables and
+    content controls are not included.
+
+    Args:
+        file_path: Path to the DOCX file
+        app: Optional application instance used for progress reporting
+
+    Yields:
+        ParagraphRecord: One record per body paragraph, in document order
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        styles = read_docx_styles(archive)
+        total_size = archive.getinfo('word/document.xml').file_size or 1
+
+        with archive.open('word/document.xml') as stream:
+            body = None
+            body_depth = 0
+            depth = 0
+            count = 0
+
+            for event, element in ElementTree.iterparse(stream, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    if element.tag == _BODY:
+                        body = element
+                        body_depth = depth
+                    continue
+
+                # Only direct children of w:body are handled and then dropped
+                if body is not None and depth == body_depth + 1:
+                    if element.tag == _P:
+                        yield _paragraph_record(element, styles)
+                        count += 1
+
+                        if app is not None and count % 1000 == 0:
+                            progress = 10 + min(stream.tell() / total_size, 1) * 30
+                            app.update_progress(progress, f"Loading large DOCX file ({count} paragraphs)...")
+                    body.remove(element)
+                depth -= 1
 
 def load_large_docx_document(file_path, app, chunk_size=200):
     """Optimized loading for large DOCX files."""
     app.log.info("Using optimized loading for large DOCX file")
-    
-    # Load document with minimal processing
-    doc = Document(file_path)
-    
+
+    # Load the full python-docx document, so formatting is kept; callers
+    # short on memory stream text-only records with iter_docx_paragraphs
+    doc = load_docx_document(file_path)
+
     # Count paragraphs and update progress
     total_paragraphs = len(doc.paragraphs)
     app.log.info(f"Large document loaded: {total_paragraphs} paragraphs")
-    
+
     return doc
@@ -1,53 +1,151 @@
 
-import gc
+import os
+from html.parser import HTMLParser
 from bs4 import BeautifulSoup
-from docx import Document
+from modules.document.text_processing.encoding import sniff_encoding
+from modules.document.loaders.records import ParagraphRecord, DocumentModel
 
-def load_html_document(file_path):
-    """Load an HTML file as BeautifulSoup object."""
-    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+READ_CHUNK_SIZE = 1024 * 1024  # 1MB chunks for reading
+
+_HEADING_LEVELS = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6}
+_BLOCK_TAGS = {'p', 'li', *_HEADING_LEVELS}
+_LIST_STYLES = {'ul': 'ListBullet', 'ol': 'ListNumber'}
+_SKIPPED_TAGS = {'script', 'style', 'template'}
+
+class HtmlBlockParser(HTMLParser):
+    """
+    Event-driven HTML parser that emits content blocks in document order.
+
+    Headings, paragraphs and list items are turned into ParagraphRecords as
+    soon as they are closed, without building a DOM. Blocks do not nest:
+    opening a new block or list closes the block that is currently open.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._blocks = []
+        self._lists = []  # Stack of enclosing 'ul'/'ol' tags
+        self._block_tag = None
+        self._parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in _LIST_STYLES:
+            self._flush()
+            self._lists.append(tag)
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+            self._block_tag = tag
+        elif tag == 'br':
+            self._parts.append(' ')
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _LIST_STYLES:
+            self._flush()
+            if self._lists and self._lists[-1] == tag:
+                self._lists.pop()
+        elif tag == self._block_tag:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._block_tag is not None and not self._skip_depth:
+            self._parts.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+    def pop_blocks(self):
+        """Return the blocks completed so far and forget them."""
+        blocks = self._blocks
+        self._blocks = []
+        return blocks
+
+    def _flush(self):
+        """Emit the currently open block, if it has any text."""
+        if self._block_tag is None:
+            return
+
+        text = ' '.join(''.join(self._parts).split())
+        if text:
+            if self._block_tag in _HEADING_LEVELS:
+                self._blocks.append(ParagraphRecord.heading(text, _HEADING_LEVELS[self._block_tag]))
+            elif self._block_tag == 'li' and self._lists:
+                self._blocks.append(ParagraphRecord(text, _LIST_STYLES[self._lists[-1]]))
+            else:
+                self._blocks.append(ParagraphRecord(text))
+
+        self._block_tag = None
+        self._parts = []
+
+def parse_html_blocks(html_content):
+    """Parse an HTML string into a list of ParagraphRecords in document order."""
+    parser = HtmlBlockParser()
+    parser.feed(html_content)
+    parser.close()
+    return parser.pop_blocks()
+
+def iter_html_blocks(file_path, app=None, read_chunk_size=READ_CHUNK_SIZE, encoding='utf-8'):
+    """
+    Lazily yield the content blocks of an HTML file in one pass.
+
+    Args:
+        file_path: Path to the HTML file
+        app: Optional application instance used for progress reporting
+        read_chunk_size: Number of characters fed to the parser at a time
+        encoding: Text encoding of the file
+
+    Yields:
+        ParagraphRecord: One record per heading, paragraph or list item
+    """
+    file_size = os.path.getsize(file_path) or 1
+    processed_size = 0
+    parser = HtmlBlockParser()
+
+    with open(file_path, 'r', encoding=encoding, errors='replace') as f:
+        while True:
+            chunk = f.read(read_chunk_size)
+            if not chunk:
+                break
+            # Progress is measured in bytes, like the file size; decoded
+            # characters undercount multi-byte encodings
+            processed_size = f.buffer.tell()
+
+            parser.feed(chunk)
+            yield from parser.pop_blocks()
+
+            if app is not None:
+                progress = 10 + min(processed_size / file_size, 1) * 30
+                app.update_progress(progress, f"Converting HTML content ({processed_size/1024/1024:.1f}MB/{file_size/1024/1024:.1f}MB)...")
+
+                # Periodically yield to UI to prevent freezing
+                app.update()
+
+    parser.close()
+    yield from parser.pop_blocks()
+
+def load_html_document(file_path, encoding=None, sanitize=False):
+    """
+    Load an HTML file as BeautifulSoup object, sniffing its encoding unless one is given.
+
+    Args:
+        file_path: Path to the HTML file
+        encoding: Text encoding of the file, or None to sniff it
+        sanitize: Whether to sanitize the markup before parsing it
+    """
+    encoding = encoding or sniff_encoding(file_path)[0]
+    with open(file_path, 'r', encoding=encoding, errors='replace') as f:
         html_content = f.read()
+    if sanitize:
+        from modules.utils.security_utils import sanitize_html
+        html_content = sanitize_html(html_content)
     return BeautifulSoup(html_content, 'html.parser')
 
 def convert_large_html_to_document(soup, app, chunk_size=100):
     """Optimized conversion for large HTML content."""
-    app.log.info("Using optimized conversion for large HTML content")
-    
-    # Create a new document
-    doc = Document()
-    
-    # Find all content blocks
-    content_blocks = soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol'])
-    total_blocks = len(content_blocks)
-    
-    # Process in chunks
-    for i in range(0, total_blocks, chunk_size):
-        end_idx = min(i + chunk_size, total_blocks)
-        chunk = content_blocks[i:end_idx]
-        
-        # Process each element in the chunk
-        for element in chunk:
-            if element.name.startswith('h') and len(element.name) == 2:
-                # Heading element
-                level = int(element.name[1])
-                doc.add_heading(element.get_text(), level=level)
-            elif element.name == 'p':
-                # Paragraph element
-                doc.add_paragraph(element.get_text())
-            elif element.name in ['ul', 'ol']:
-                # List element
-                for li in element.find_all('li'):
-                    doc.add_paragraph(li.get_text(), style='List Bullet' if element.name == 'ul' else 'List Number')
-        
-        # Update progress
-        progress = 20 + (i / total_blocks) * 30
-        app.update_progress(progress, f"Converting HTML content ({i}/{total_blocks} blocks)...")
-        
-        # Periodically yield to UI to prevent freezing
-        app.update()
-        
-        # Force garbage collection between chunks
-        if i % (chunk_size * 3) == 0:
-            gc.collect()
-    
-    return doc
+    app.log.info("Using single-pass conversion for large HTML content")
+    return DocumentModel(parse_html_blocks(str(soup)))
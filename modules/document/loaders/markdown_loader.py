@@ -1,45 +1,145 @@
 
-import gc
-from docx import Document
+import os
+import re
+from modules.document.loaders.records import ParagraphRecord, DocumentModel
+
+READ_CHUNK_SIZE = 1024 * 1024  # 1MB chunks for reading
+
+_HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+?)(?:\s+#+)?$')
+_BULLET_PATTERN = re.compile(r'^[*+-]\s+(.*)$')
+_NUMBERED_PATTERN = re.compile(r'^\d+[.)]\s+(.*)$')
+
+class MarkdownBlockParser:
+    """
+    Line-oriented Markdown state machine that emits blocks as they complete.
+
+    Headings, paragraphs, list items and fenced code blocks are turned into
+    ParagraphRecords. Text can be fed in arbitrary chunks: partial lines,
+    open paragraphs and open code fences are all carried over to the next
+    chunk, so chunk boundaries never split a block.
+    """
+
+    def __init__(self):
+        self._blocks = []
+        self._pending_line = ''
+        self._style_id = None  # Style of the open paragraph or list item
+        self._lines = []
+        self._fence = None  # Fence marker while inside a code block
+
+    def feed(self, text):
+        """Feed a chunk of Markdown text."""
+        lines = (self._pending_line + text).split('\n')
+        self._pending_line = lines.pop()
+        for line in lines:
+            self.feed_line(line)
+
+    def feed_line(self, line):
+        """Feed a single line of Markdown, without its line terminator."""
+        stripped = line.strip()
+
+        if self._fence is not None:
+            if stripped.startswith(self._fence) and not stripped.strip(self._fence[0]):
+                self._flush()
+            else:
+                self._lines.append(line.rstrip('\r'))
+            return
+
+        if not stripped:
+            self._flush()
+        elif stripped.startswith(('```', '~~~')):
+            self._flush()
+            self._fence = stripped[:3]
+            self._style_id = 'Code'
+        elif stripped.startswith('#') and _HEADING_PATTERN.match(stripped):
+            self._flush()
+            match = _HEADING_PATTERN.match(stripped)
+            self._blocks.append(ParagraphRecord.heading(match.group(2), len(match.group(1))))
+        else:
+            bullet = _BULLET_PATTERN.match(stripped)
+            numbered = None if bullet else _NUMBERED_PATTERN.match(stripped)
+            if bullet or numbered:
+                # Every list marker starts a new item
+                self._flush()
+                self._style_id = 'ListBullet' if bullet else 'ListNumber'
+                stripped = (bullet or numbered).group(1)
+            elif self._style_id is None:
+                self._style_id = 'Normal'
+            self._lines.append(stripped)
+
+    def close(self):
+        """Flush any partial line and the block that is still open."""
+        if self._pending_line:
+            self.feed_line(self._pending_line)
+            self._pending_line = ''
+        self._flush()
+
+    def pop_blocks(self):
+        """Return the blocks completed so far and forget them."""
+        blocks = self._blocks
+        self._blocks = []
+        return blocks
+
+    def _flush(self):
+        """Emit the open paragraph, list item or code block."""
+        if self._style_id is not None:
+            if self._style_id == 'Code':
+                text = '\n'.join(self._lines)
+            else:
+                text = ' '.join(self._lines)
+            if text.strip():
+                self._blocks.append(ParagraphRecord(text, self._style_id))
+
+        self._style_id = None
+        self._lines = []
+        self._fence = None
+
+def parse_markdown_blocks(markdown_content):
+    """Parse a Markdown string into a list of ParagraphRecords in document order."""
+    parser = MarkdownBlockParser()
+    parser.feed(markdown_content)
+    parser.close()
+    return parser.pop_blocks()
+
+def iter_markdown_blocks(file_path, app=None, read_chunk_size=READ_CHUNK_SIZE, encoding='utf-8'):
+    """
+    Lazily yield the blocks of a Markdown file in one pass.
+
+    Args:
+        file_path: Path to the Markdown file
+        app: Optional application instance used for progress reporting
+        read_chunk_size: Number of characters fed to the parser at a time
+        encoding: Text encoding of the file
+
+    Yields:
+        ParagraphRecord: One record per heading, paragraph, list item or code block
+    """
+    file_size = os.path.getsize(file_path) or 1
+    processed_size = 0
+    parser = MarkdownBlockParser()
+
+    with open(file_path, 'r', encoding=encoding, errors='replace') as f:
+        while True:
+            chunk = f.read(read_chunk_size)
+            if not chunk:
+                break
+            # Progress is measured in bytes, like the file size; decoded
+            # characters undercount multi-byte encodings
+            processed_size = f.buffer.tell()
+
+            parser.feed(chunk)
+            yield from parser.pop_blocks()
+
+            if app is not None:
+                progress = 10 + min(processed_size / file_size, 1) * 30
+                app.update_progress(progress, f"Converting markdown content ({processed_size/1024/1024:.1f}MB/{file_size/1024/1024:.1f}MB)...")
+
+                # Periodically yield to UI to prevent freezing
+                app.update()
+
+    parser.close()
+    yield from parser.pop_blocks()
 
 def convert_large_markdown_to_document(content, app, chunk_size=1000):
     """Optimized conversion for large markdown content."""
-    app.log.info("Using optimized conversion for large markdown content")
-    
-    # Create a new document
-    doc = Document()
-    
-    # Split content into lines for chunk processing
-    lines = content.split('\n')
-    total_lines = len(lines)
-    
-    # Process in chunks
-    for i in range(0, total_lines, chunk_size):
-        end_idx = min(i + chunk_size, total_lines)
-        chunk = lines[i:end_idx]
-        
-        # Join chunk back into text
-        chunk_text = '\n'.join(chunk)
-        
-        # Convert chunk
-        from modules.document.format_handler import convert_markdown_to_document
-        temp_doc = convert_markdown_to_document(chunk_text)
-        
-        # Add paragraphs from temp_doc to main doc
-        for para in temp_doc.paragraphs:
-            p = doc.add_paragraph()
-            p.text = para.text
-            p.style = para.style
-        
-        # Update progress
-        progress = 20 + (i / total_lines) * 30
-        app.update_progress(progress, f"Converting markdown content ({i}/{total_lines} lines)...")
-        
-        # Periodically yield to UI to prevent freezing
-        app.update()
-        
-        # Force garbage collection between chunks
-        if i % (chunk_size * 3) == 0:
-            gc.collect()
-    
-    return doc
+    app.log.info("Using streaming conversion for large markdown content")
+    return DocumentModel(parse_markdown_blocks(content))
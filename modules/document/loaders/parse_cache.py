@@ -0,0 +1,264 @@
+
+"""
+Parse Cache Module
+
+This module provides a persistent, content-addressed cache for the paragraph
+record streams produced by the loaders, so unchanged input files do not have
+to be parsed again in batch and iterative editing runs.
+
+Entries are keyed by a hash of the file content plus the loader version and
+stored in a compact binary layout: a table of style ids, four packed arrays
+(style index, heading level, source page and text length per paragraph) and
+one UTF-8 blob holding all paragraph text. The cache directory is bounded in size and
+the least recently used entries are evicted first.
+"""
+
+import os
+import array
+import struct
+import hashlib
+import logging
+import tempfile
+from modules.document.loaders.records import ParagraphRecord
+
+# Bump whenever a loader changes the records it produces for the same input
+LOADER_VERSION = 4
+
+DEFAULT_CACHE_DIR = os.path.join(os.getcwd(), "Cache", "parse")
+DEFAULT_MAX_CACHE_SIZE = 512 * 1024 * 1024  # 512MB
+
+_MAGIC = b'CSPC'
+_HEADER = struct.Struct('<4sHII')  # magic, format version, style count, record count
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+class ParseCache:
+    """
+    Size-bounded on-disk cache of parsed paragraph records
+
+    Attributes:
+        cache_dir: Directory holding one file per cached document
+        max_size: Maximum total size of the cache directory in bytes
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_size=DEFAULT_MAX_CACHE_SIZE):
+        """
+        Initialize the parse cache
+
+        Args:
+            cache_dir: Directory holding the cache entries
+            max_size: Maximum total size of the cache directory in bytes
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._digests = {}  # (path, size, mtime) -> content hash, for this session
+
+    def make_key(self, file_path, file_format):
+        """
+        Build the cache key for a file
+
+        Args:
+            file_path: Path to the input file
+            file_format: Detected file format (e.g. 'docx', 'txt')
+
+        Returns:
+            The cache key as a string
+        """
+        stat = os.stat(file_path)
+        stat_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+        digest = self._digests.get(stat_key)
+        if digest is None:
+            hasher = hashlib.blake2b(digest_size=20)
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            self._digests[stat_key] = digest
+
+        return f"{digest}-{file_format}-v{LOADER_VERSION}"
+
+    def load(self, key):
+        """
+        Load the cached records for a key
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            List of ParagraphRecord objects, or None on a cache miss
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            records = _decode_records(data)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error, UnicodeDecodeError) as e:
+            logger.warning(f"Discarding unreadable parse cache entry {key}: {str(e)}")
+            self._remove(path)
+            return None
+
+        # Touch the entry so eviction sees it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return records
+
+    def store(self, key, records):
+        """
+        Write records to the cache, then evict old entries if over budget
+
+        Args:
+            key: Cache key from make_key
+            records: Sequence of ParagraphRecord objects
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data = _encode_records(records)
+
+        # Write to a temporary file first so readers never see partial entries
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self._entry_path(key))
+        except OSError:
+            self._remove(temp_path)
+            raise
+
+        self.evict()
+
+    def iter_and_store(self, key, records):
+        """
+        Pass records through while collecting them, and cache them at the end
+
+        Nothing is stored if the stream is abandoned or raises before it is
+        exhausted.
+
+        Args:
+            key: Cache key from make_key
+            records: Iterable of ParagraphRecord objects
+
+        Yields:
+            The records, unchanged
+        """
+        collected = []
+        for record in records:
+            collected.append(record)
+            yield record
+
+        try:
+            self.store(key, collected)
+        except OSError as e:
+            logger.warning(f"Could not write parse cache entry {key}: {str(e)}")
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits its size limit."""
+        try:
+            entries = []
+            total_size = 0
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith('.cache'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total_size += stat.st_size
+        except OSError:
+            return
+
+        entries.sort()
+        while total_size > self.max_size and entries:
+            _, size, path = entries.pop(0)
+            self._remove(path)
+            total_size -= size
+            logger.info(f"Evicted parse cache entry {os.path.basename(path)}")
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.cache")
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def _encode_records(records):
+    """Serialize records into the compact binary cache layout."""
+    style_index = {}
+    styles = array.array('H')
+    levels = array.array('B')
+    pages = array.array('I')
+    lengths = array.array('I')
+    texts = []
+
+    for record in records:
+        index = style_index.get(record.style_id)
+        if index is None:
+            index = style_index[record.style_id] = len(style_index)
+        styles.append(index)
+        levels.append(record.level)
+        pages.append(record.page)
+        lengths.append(len(record.text))
+        texts.append(record.text)
+
+    style_table = '\0'.join(style_index).encode('utf-8')
+    parts = [
+        _HEADER.pack(_MAGIC, LOADER_VERSION, len(style_index), len(lengths)),
+        struct.pack('<I', len(style_table)),
+        style_table,
+        styles.tobytes(),
+        levels.tobytes(),
+        pages.tobytes(),
+        lengths.tobytes(),
+        ''.join(texts).encode('utf-8', 'surrogatepass'),
+    ]
+    return b''.join(parts)
+
+def _decode_records(data):
+    """Deserialize records written by _encode_records."""
+    magic, version, style_count, count = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != LOADER_VERSION:
+        raise ValueError("unrecognized cache entry format")
+
+    offset = _HEADER.size
+    (table_size,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    style_ids = data[offset:offset + table_size].decode('utf-8').split('\0') if style_count else []
+    offset += table_size
+
+    arrays = []
+    for typecode in ('H', 'B', 'I', 'I'):
+        values = array.array(typecode)
+        size = values.itemsize * count
+        values.frombytes(data[offset:offset + size])
+        offset += size
+        arrays.append(values)
+    styles, levels, pages, lengths = arrays
+
+    text = data[offset:].decode('utf-8', 'surrogatepass')
+
+    records = []
+    position = 0
+    for style, level, page, length in zip(styles, levels, pages, lengths):
+        records.append(ParagraphRecord(text[position:position + length], style_ids[style], level, page))
+        position += length
+
+    if position != len(text):
+        raise ValueError("cache entry text length mismatch")
+
+    return records
+
+_parse_cache = None
+
+def get_parse_cache():
+    """Return the shared ParseCache instance, creating it on first use."""
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = ParseCache()
+    return _parse_cache
@@ -0,0 +1,114 @@
+
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from PyPDF2 import PdfReader
+from modules.document.loaders.records import ParagraphRecord
+
+PAGES_PER_TASK = 25  # Pages extracted by one worker task
+PARALLEL_MIN_PAGES = 50  # Smaller PDFs are extracted in this process
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+def get_pdf_page_count(file_path):
+    """Return the number of pages in a PDF file."""
+    return len(PdfReader(file_path).pages)
+
+def extract_page_range(file_path, start, stop):
+    """
+    Extract the text of a range of PDF pages.
+
+    Runs in worker processes, so it opens its own reader and returns plain
+    tuples that are cheap to send back.
+
+    Args:
+        file_path: Path to the PDF file
+        start: Index of the first page (0-based)
+        stop: Index one past the last page
+
+    Returns:
+        list: (page number, page text) tuples, with 1-based page numbers
+    """
+    reader = PdfReader(file_path)
+    pages = []
+    for index in range(start, stop):
+        try:
+            text = reader.pages[index].extract_text() or ''
+        except Exception as e:
+            logger.warning(f"Could not extract text from page {index + 1} of {file_path}: {str(e)}")
+            text = ''
+        pages.append((index + 1, text))
+    return pages
+
+def _page_ranges(page_count, pages_per_task):
+    """Split page_count pages into consecutive (start, stop) ranges."""
+    return [
+        (start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    ]
+
+def _iter_page_batches(file_path, page_count, pages_per_task, max_workers):
+    """Yield lists of (page number, text) in page order, extracting in parallel when worthwhile."""
+    ranges = _page_ranges(page_count, pages_per_task)
+    done = 0
+
+    if page_count >= PARALLEL_MIN_PAGES and len(ranges) > 1:
+        workers = min(max_workers or os.cpu_count() or 1, len(ranges))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # map returns results in submission order, so pages stay in
+                # order while later ranges are still being extracted
+                for batch in executor.map(
+                    extract_page_range,
+                    [file_path] * len(ranges),
+                    [start for start, _ in ranges],
+                    [stop for _, stop in ranges]
+                ):
+                    done += 1
+                    yield batch
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning(
+                f"Parallel PDF extraction stopped after {done} of {len(ranges)} page ranges, "
+                f"continuing serially: {str(e)}"
+            )
+
+    # Serial extraction for small files, or the ranges a failed pool left over
+    for start, stop in ranges[done:]:
+        yield extract_page_range(file_path, start, stop)
+
+def iter_pdf_paragraphs(file_path, app=None, pages_per_task=PAGES_PER_TASK, max_workers=None):
+    """
+    Lazily yield the text lines of a PDF file as paragraphs, in page order.
+
+    Page ranges are extracted in a process pool, so throughput scales with
+    the number of cores, and each range is yielded as soon as it and every
+    range before it are done.
+
+    Args:
+        file_path: Path to the PDF file
+        app: Optional application instance used for progress reporting
+        pages_per_task: Number of pages extracted per worker task
+        max_workers: Maximum number of worker processes (default: CPU count)
+
+    Yields:
+        ParagraphRecord: One record per non-empty line, with its page number
+    """
+    page_count = get_pdf_page_count(file_path)
+    processed_pages = 0
+
+    for batch in _iter_page_batches(file_path, page_count, pages_per_task, max_workers):
+        for page_number, text in batch:
+            for line in text.split('\n'):
+                line = line.rstrip()
+                if line.strip():  # Skip empty lines
+                    yield ParagraphRecord(line, page=page_number)
+
+        processed_pages += len(batch)
+        if app is not None:
+            progress = 10 + (processed_pages / max(page_count, 1)) * 30
+            app.update_progress(progress, f"Extracting PDF text ({processed_pages}/{page_count} pages)...")
+
+            # Periodically yield to UI to prevent freezing
+            app.update()
@@ -0,0 +1,221 @@
+
+"""
+Paragraph Records Module
+
+This module defines the lightweight document model used as the working
+representation of loaded PDF, text, Markdown and HTML documents: compact
+paragraph records produced by the streaming loaders, held in a DocumentModel
+container. Records expose the same text and style.name attributes as
+python-docx paragraphs, so processing stages work on either. DOCX files keep
+their python-docx Document, wrapped in a DocumentSnapshot so its paragraph
+list is only built once, and their formatting survives processing.
+"""
+
+from modules.document.loaders.styles import StyleCache
+
+# python-docx display names for the list style ids the loaders emit
+DOCX_STYLE_NAMES = {
+    'ListBullet': 'List Bullet',
+    'ListNumber': 'List Number',
+}
+
+class ParagraphStyle:
+    """
+    Read-only stand-in for a python-docx paragraph style.
+
+    Attributes:
+        style_id: The raw paragraph style id
+        name: The display name, e.g. 'Heading 1' or 'List Bullet'
+    """
+
+    __slots__ = ('style_id', 'name')
+
+    def __init__(self, style_id, name):
+        self.style_id = style_id
+        self.name = name
+
+    def __repr__(self):
+        return f"ParagraphStyle({self.style_id!r}, {self.name!r})"
+
+# Shared style objects, one per (style id, heading level)
+_styles = {}
+
+def get_paragraph_style(style_id, level=0):
+    """
+    Return the shared ParagraphStyle for a style id and heading level.
+
+    Headings are named 'Heading N' whatever their style id, so custom heading
+    styles are recognized by the processing stages like built-in ones.
+    """
+    style = _styles.get((style_id, level))
+    if style is None:
+        if level:
+            name = f'Heading {level}'
+        else:
+            name = DOCX_STYLE_NAMES.get(style_id, style_id)
+        style = _styles[(style_id, level)] = ParagraphStyle(style_id, name)
+    return style
+
+class ParagraphRecord:
+    """
+    A single paragraph reduced to the data the processing stages need.
+
+    Attributes:
+        text: The paragraph text
+        style_id: The raw paragraph style id (e.g. 'Normal', 'Heading1', 'Title')
+        level: Heading level 1-9 for headings, 0 for everything else
+        page: 1-based source page number for paginated inputs, 0 if unknown
+    """
+
+    __slots__ = ('text', 'style_id', 'level', 'page')
+
+    def __init__(self, text, style_id='Normal', level=0, page=0):
+        self.text = text
+        self.style_id = style_id
+        self.level = level
+        self.page = page
+
+    @property
+    def style(self):
+        """The paragraph style, with the python-docx style.name interface."""
+        return get_paragraph_style(self.style_id, self.level)
+
+    @classmethod
+    def heading(cls, text, level):
+        """Create a heading record; level 0 is the document title."""
+        if level == 0:
+            return cls(text, 'Title', 0)
+        return cls(text, f'Heading{level}', level)
+
+    def __eq__(self, other):
+        if not isinstance(other, ParagraphRecord):
+            return NotImplemented
+        return (
+            (self.text, self.style_id, self.level, self.page) ==
+            (other.text, other.style_id, other.level, other.page)
+        )
+
+    def __repr__(self):
+        if self.page:
+            return f"ParagraphRecord({self.text!r}, {self.style_id!r}, {self.level}, page={self.page})"
+        return f"ParagraphRecord({self.text!r}, {self.style_id!r}, {self.level})"
+
+class DocumentModel:
+    """
+    In-memory document made of ParagraphRecords.
+
+    Mirrors the parts of the python-docx Document interface the processing
+    stages use (paragraphs, add_paragraph, add_heading), with indexed access
+    to the paragraphs.
+
+    Attributes:
+        paragraphs: List of ParagraphRecord objects in document order
+    """
+
+    __slots__ = ('paragraphs',)
+
+    def __init__(self, paragraphs=None):
+        self.paragraphs = list(paragraphs) if paragraphs is not None else []
+
+    def add_paragraph(self, text='', style_id='Normal'):
+        """Append a paragraph and return its record."""
+        record = ParagraphRecord(text, style_id)
+        self.paragraphs.append(record)
+        return record
+
+    def add_heading(self, text='', level=1):
+        """Append a heading (level 0 is the title) and return its record."""
+        record = ParagraphRecord.heading(text, level)
+        self.paragraphs.append(record)
+        return record
+
+    def __len__(self):
+        return len(self.paragraphs)
+
+    def __getitem__(self, index):
+        return self.paragraphs[index]
+
+    def __iter__(self):
+        return iter(self.paragraphs)
+
+    def __bool__(self):
+        # A loaded document counts as present even when it has no paragraphs
+        return True
+
+    def __repr__(self):
+        return f"DocumentModel({len(self.paragraphs)} paragraphs)"
+
+# python-docx Document methods that add to the body, invalidating a snapshot
+_DOCX_MUTATORS = frozenset({
+    'add_paragraph', 'add_heading', 'add_page_break', 'add_picture', 'add_section', 'add_table',
+})
+
+class DocumentSnapshot:
+    """
+    python-docx Document wrapper that materializes the paragraph list once.
+
+    python-docx builds a fresh list of Paragraph proxies on every access to
+    Document.paragraphs, so indexing it in a loop is quadratic. The snapshot
+    keeps the list until the document is changed through one of the wrapped
+    add_* methods, or invalidate() is called after changing the document
+    another way. Everything else is passed through to the wrapped document.
+
+    Attributes:
+        document: The wrapped python-docx Document
+        style_cache: StyleCache resolving the document's paragraph styles
+    """
+
+    __slots__ = ('document', 'style_cache', '_paragraphs')
+
+    def __init__(self, document):
+        self.document = document
+        self.style_cache = StyleCache()
+        self._paragraphs = None
+
+    @property
+    def paragraphs(self):
+        """The document's paragraphs, as a list built on first access."""
+        if self._paragraphs is None:
+            self._paragraphs = self.document.paragraphs
+        return self._paragraphs
+
+    def invalidate(self):
+        """Drop the paragraph list so the next access rebuilds it."""
+        self._paragraphs = None
+
+    def __getattr__(self, name):
+        attribute = getattr(self.document, name)
+        if name not in _DOCX_MUTATORS:
+            return attribute
+
+        def mutate(*args, **kwargs):
+            self._paragraphs = None
+            return attribute(*args, **kwargs)
+        return mutate
+
+    def __len__(self):
+        return len(self.paragraphs)
+
+    def __getitem__(self, index):
+        return self.paragraphs[index]
+
+    def __iter__(self):
+        return iter(self.paragraphs)
+
+    def __bool__(self):
+        return True
+
+    def __repr__(self):
+        return f"DocumentSnapshot({len(self.paragraphs)} paragraphs)"
+
+def snapshot_document(document):
+    """
+    Return a document whose paragraphs can be read repeatedly at no extra cost.
+
+    DocumentModels and snapshots already hold a paragraph list and are
+    returned as they are; anything else, normally a python-docx Document,
+    is wrapped in a DocumentSnapshot.
+    """
+    if isinstance(document, (DocumentModel, DocumentSnapshot)):
+        return document
+    return DocumentSnapshot(document)
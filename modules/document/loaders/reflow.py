@@ -0,0 +1,143 @@
+
+"""
+Line Reflow Module
+
+This module joins the hard-wrapped lines of plain-text transcripts back into
+logical paragraphs. Court transcripts are typically wrapped at a fixed column,
+so loading them line by line produces many times more paragraphs than the
+text really has. The wrap width is estimated from the first lines of the file;
+a paragraph then ends at a blank line, before a Q/A or speaker marker, before
+a line indented further than the one above it, and after a line that stops
+well short of the wrap width. Words hyphenated across a line break are
+rejoined, keeping the hyphen for compounds seen earlier in the text.
+
+Text that does not look hard-wrapped passes through unchanged, one paragraph
+per non-empty line.
+"""
+
+import re
+from itertools import chain, islice
+
+REFLOW_SAMPLE_LINES = 200  # Lines read ahead to estimate the wrap width
+REFLOW_MIN_SAMPLE_LINES = 10  # Fewer non-empty sample lines are never reflowed
+REFLOW_MIN_WRAP_WIDTH = 40  # Narrowest column treated as a hard wrap
+REFLOW_MAX_WRAP_WIDTH = 120  # Widest column treated as a hard wrap
+REFLOW_FULL_LINE_RATIO = 0.75  # Lines at least this fraction of the wrap width are full
+REFLOW_MIN_INDENT_STEP = 2  # Extra indentation that starts a new paragraph
+
+# "Q." / "A." markers and speaker labels such as "THE COURT:" or "BY MR. SMITH:"
+_SPEAKER_MARKER = re.compile(r"[QA](?:[.:]|\t| {2})|[A-Z][A-Z .'-]{1,40}:")
+_LEADING_WORD = re.compile(r"[A-Za-z]+")
+_WORD_PUNCTUATION = '.,;:!?"\'()[]“”‘’'
+_CLOSING_CHARS = '"\')]”’'
+_TERMINAL_CHARS = '.?!:'
+
+def _ends_sentence(line):
+    """Check whether a line ends with terminal punctuation, allowing closing quotes."""
+    stripped = line.rstrip().rstrip(_CLOSING_CHARS)
+    return bool(stripped) and stripped[-1] in _TERMINAL_CHARS
+
+def estimate_wrap_width(lines):
+    """
+    Estimate the column at which lines were hard-wrapped.
+
+    Most lines of hard-wrapped text run close to the wrap width and end in
+    the middle of a sentence, while text with one paragraph per line has
+    lines of any length that end with terminal punctuation.
+
+    Args:
+        lines: Sample of lines from the start of the text
+
+    Returns:
+        int: The wrap width, or None if the lines do not look hard-wrapped
+    """
+    lengths = sorted(len(line.rstrip()) for line in lines if line.strip())
+    if len(lengths) < REFLOW_MIN_SAMPLE_LINES:
+        return None
+
+    # A few lines may overrun the wrap column, so use the 90th percentile
+    width = lengths[len(lengths) * 9 // 10]
+    if not REFLOW_MIN_WRAP_WIDTH <= width <= REFLOW_MAX_WRAP_WIDTH:
+        return None
+
+    full_lines = [line for line in lines if len(line.rstrip()) >= width * REFLOW_FULL_LINE_RATIO]
+    open_lines = sum(1 for line in full_lines if not _ends_sentence(line))
+    if len(full_lines) * 3 < len(lengths) or open_lines * 2 < len(full_lines):
+        return None
+    return width
+
+def _join_lines(lines, compounds):
+    """Join the right-stripped lines of one paragraph, rejoining words hyphenated at line ends."""
+    text = lines[0]
+    for line in lines[1:]:
+        line = line.lstrip()
+        if not (text.endswith('-') and line[0].islower()):
+            text = f"{text} {line}"
+            continue
+
+        # Only the last part of the word before the hyphen is a word fragment
+        prefix = text[text.rfind(' ') + 1:-1].rsplit('-', 1)[-1]
+        word = _LEADING_WORD.match(line)
+        if not (prefix.isalpha() and word):
+            text = f"{text} {line}"
+        elif f"{prefix}-{word.group()}".lower() in compounds:
+            text += line
+        else:
+            text = text[:-1] + line
+    return text
+
+def reflow_lines(lines, sample_size=REFLOW_SAMPLE_LINES):
+    """
+    Lazily join hard-wrapped lines into logical paragraphs.
+
+    Only the first sample_size lines are read ahead; after that each
+    paragraph is emitted as soon as the line that ends it is seen.
+
+    Args:
+        lines: Iterable of lines without line terminators, including empty ones
+        sample_size: Number of lines used to estimate the wrap width
+
+    Yields:
+        str: Each paragraph as a single line of text
+    """
+    lines = iter(lines)
+    sample = list(islice(lines, sample_size))
+    width = estimate_wrap_width(sample)
+    if width is None:
+        # Not hard-wrapped, every non-empty line is a paragraph of its own
+        for line in chain(sample, lines):
+            if line.strip():
+                yield line
+        return
+
+    short_length = width * REFLOW_FULL_LINE_RATIO
+    compounds = set()  # Hyphenated words seen so far, lowercased
+    paragraph = []  # Right-stripped lines of the open paragraph
+    previous_indent = 0
+    for line in chain(sample, lines):
+        line = line.rstrip()
+        if not line:
+            if paragraph:
+                yield _join_lines(paragraph, compounds)
+                paragraph = []
+            continue
+
+        if '-' in line:
+            compounds.update(word.strip(_WORD_PUNCTUATION).lower() for word in line.split() if '-' in word)
+
+        indent = len(line) - len(line.lstrip())
+        if paragraph and (
+            # A Q/A or speaker marker, or a deeper indent, starts a new paragraph
+            _SPEAKER_MARKER.match(line, indent)
+            or indent >= previous_indent + REFLOW_MIN_INDENT_STEP
+            # A short line ends its paragraph unless the sentence clearly continues
+            or (len(paragraph[-1]) < short_length
+                and (_ends_sentence(paragraph[-1]) or not line[indent].islower()))
+        ):
+            yield _join_lines(paragraph, compounds)
+            paragraph = []
+        paragraph.append(line)
+        previous_indent = indent
+
+    if paragraph:
+        yield _join_lines(paragraph, compounds)
@@ -0,0 +1,97 @@
+
+"""
+Paragraph Style Module
+
+This module resolves paragraph styles to a (name, heading level) pair.
+Reading para.style.name on a python-docx paragraph looks the style id up
+in the styles part every time, so StyleCache reads the raw w:pStyle value
+of each paragraph and resolves every distinct style id only once per
+document. Heading levels come from the style name for built-in headings
+and from the outline level for custom heading styles, the same rule the
+streaming DOCX loader applies to styles.xml.
+"""
+
+import re
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_VAL = W_NS + 'val'
+
+HEADING_NAME_PATTERN = re.compile(r'^heading\s*([1-9])$', re.IGNORECASE)
+
+def style_heading_level(name, style_element=None):
+    """
+    Return the heading level of a paragraph style.
+
+    Args:
+        name: The style name
+        style_element: The style's w:style element, if available, for its outline level
+
+    Returns:
+        int: Heading level 1-9, or 0 if the style is not a heading
+    """
+    # Built-in headings are recognized by name, custom ones by outline level
+    match = HEADING_NAME_PATTERN.match(name or '')
+    if match:
+        return int(match.group(1))
+    if style_element is not None:
+        outline = style_element.find(f'{W_NS}pPr/{W_NS}outlineLvl')
+        if outline is not None and outline.get(W_VAL, '9').isdigit() and int(outline.get(W_VAL)) < 9:
+            return int(outline.get(W_VAL)) + 1
+    return 0
+
+class StyleCache:
+    """
+    Per-document cache from paragraph style id to (name, heading level)
+
+    One cache should only see paragraphs of a single document, since style
+    ids are local to a document.
+    """
+
+    def __init__(self):
+        self._styles = {}  # Raw style id (None for the default style) -> (name, level)
+
+    def resolve(self, para):
+        """
+        Return the style name and heading level of a paragraph.
+
+        Args:
+            para: A python-docx paragraph or a ParagraphRecord
+
+        Returns:
+            tuple: (style name, heading level or 0)
+        """
+        element = getattr(para, '_p', None)
+        if element is None:
+            level = getattr(para, 'level', None)
+            if level is not None:
+                # ParagraphRecords carry their heading level and a shared style
+                return para.style.name, level
+            name = para.style.name or ''
+            return name, style_heading_level(name)
+
+        style_id = element.style
+        info = self._styles.get(style_id)
+        if info is None:
+            style = para.style
+            name = style.name or ''
+            info = self._styles[style_id] = (name, style_heading_level(name, style.element))
+        return info
+
+    def heading_level(self, para):
+        """Return the heading level of a paragraph, 0 for anything but a heading."""
+        return self.resolve(para)[1]
+
+    def is_heading(self, para):
+        """Check whether a paragraph has a heading style."""
+        name, level = self.resolve(para)
+        return bool(level) or name.startswith('Heading')
+
+def get_style_cache(document=None):
+    """
+    Return the style cache for a document.
+
+    A DocumentSnapshot keeps one cache for its whole lifetime; for any other
+    document a new cache is returned, to be reused for that document.
+    """
+    cache = getattr(document, 'style_cache', None)
+    return cache if isinstance(cache, StyleCache) else StyleCache()
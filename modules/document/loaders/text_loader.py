@@ -1,35 +1,172 @@
 
-def load_text_document(file_path):
-    """Load a text file."""
-    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+import os
+import mmap
+import codecs
+from modules.document.text_processing.encoding import sniff_encoding
+
+READ_CHUNK_SIZE = 1024 * 1024  # 1MB chunks for reading
+MMAP_MIN_FILE_SIZE = 100 * 1024 * 1024  # Memory-map text files larger than 100MB
+
+def load_text_document(file_path, encoding=None):
+    """Load a text file, sniffing its encoding unless one is given."""
+    encoding = encoding or sniff_encoding(file_path)[0]
+    with open(file_path, 'r', encoding=encoding, errors='replace') as f:
         return f.read()
 
+def iter_text_paragraphs(file_path, app=None, read_chunk_size=READ_CHUNK_SIZE, encoding='utf-8', skip_empty=True):
+    """
+    Lazily yield the non-empty lines of a text file as paragraphs.
+
+    The file is read in fixed-size chunks and any partial line at the end of a
+    chunk is carried over to the next one, so memory stays flat and the whole
+    file is scanned exactly once regardless of its size.
+
+    Args:
+        file_path: Path to the text file
+        app: Optional application instance used for progress reporting
+        read_chunk_size: Number of characters to read per chunk
+        encoding: Text encoding of the file
+        skip_empty: Whether to leave out empty lines
+
+    Yields:
+        str: Each non-empty line, without its line terminator
+    """
+    file_size = os.path.getsize(file_path) or 1
+    processed_size = 0
+    pending = []  # Pieces of a line that spans chunk boundaries
+
+    with open(file_path, 'r', encoding=encoding, errors='replace') as f:
+        while True:
+            chunk = f.read(read_chunk_size)
+            if not chunk:
+                break
+            # Progress is measured in bytes, like the file size; decoded
+            # characters undercount multi-byte encodings
+            processed_size = f.buffer.tell()
+
+            lines = chunk.split('\n')
+            if len(lines) > 1:
+                # Complete the line carried over from the previous chunk
+                if pending:
+                    pending.append(lines[0])
+                    lines[0] = ''.join(pending)
+                    pending = []
+                for line in lines[:-1]:
+                    if not skip_empty or line.strip():
+                        yield line
+            pending.append(lines[-1])
+
+            if app is not None:
+                progress = 10 + min(processed_size / file_size, 1) * 30
+                app.update_progress(progress, f"Loading large text file ({processed_size/1024/1024:.1f}MB/{file_size/1024/1024:.1f}MB)...")
+
+                # Periodically yield to UI to prevent freezing
+                app.update()
+
+    last_line = ''.join(pending)
+    if last_line.strip():
+        yield last_line
+
+def _is_newline_transparent(encoding):
+    """Check whether a LF byte in the encoded stream always means a line break."""
+    try:
+        return 'a\n'.encode(encoding)[-2:] == b'a\n'
+    except (LookupError, UnicodeError):
+        return False
+
+def iter_text_paragraphs_mmap(file_path, app=None, window_size=READ_CHUNK_SIZE, encoding='utf-8', skip_empty=True):
+    """
+    Lazily yield the non-empty lines of a memory-mapped text file.
+
+    The file is mapped read-only and scanned in windows that always end on a
+    line break. Each window is handed to an incremental decoder as a zero-copy
+    memoryview slice, so peak memory stays close to the decoded size of one
+    window no matter how large the file is.
+
+    Encodings in which a LF byte can be part of another character (UTF-16,
+    UTF-32) cannot be split on raw bytes and fall back to iter_text_paragraphs.
+
+    Args:
+        file_path: Path to the text file
+        app: Optional application instance used for progress reporting
+        window_size: Approximate number of bytes decoded at a time
+        encoding: Text encoding of the file
+        skip_empty: Whether to leave out empty lines
+
+    Yields:
+        str: Each non-empty line, without its line terminator
+    """
+    if not _is_newline_transparent(encoding):
+        yield from iter_text_paragraphs(file_path, app, window_size, encoding, skip_empty)
+        return
+
+    file_size = os.path.getsize(file_path)
+    if file_size == 0:
+        return  # Empty files cannot be memory-mapped
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+    with open(file_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            memoryview(mm) as view:
+        start = 0
+        while start < file_size:
+            # Find the last line break inside the window so no line is split
+            end = min(start + window_size, file_size)
+            if end < file_size:
+                newline = mm.rfind(b'\n', start, end)
+                if newline == -1:
+                    # A single line is longer than the window, extend to its end
+                    newline = mm.find(b'\n', end)
+                end = file_size if newline == -1 else newline + 1
+
+            text = decoder.decode(view[start:end], end == file_size)
+            start = end
+
+            if '\r' in text:
+                # Match the universal newline handling of text mode reads
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+
+            lines = text.split('\n')
+            if text.endswith('\n'):
+                lines.pop()  # Windows end on a line break, not on an empty line
+            for line in lines:
+                if not skip_empty or line.strip():
+                    yield line
+
+            if app is not None:
+                progress = 10 + (start / file_size) * 30
+                app.update_progress(progress, f"Loading large text file ({start/1024/1024:.1f}MB/{file_size/1024/1024:.1f}MB)...")
+
+                # Periodically yield to UI to prevent freezing
+                app.update()
+
 def load_large_text_document(file_path, app, chunk_size=1000):
     """Optimized loading for large text files."""
     app.log.info("Using chunked loading for large text file")
-    
+
     # Get file size
     file_size = os.path.getsize(file_path)
-    
-    # Read file in chunks to minimize memory usage
-    content = ""
-    read_chunk_size = 1024 * 1024  # 1MB chunks for reading
+
+    # Collect chunks and join once to avoid quadratic string concatenation
+    chunks = []
     processed_size = 0
-    
-    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+    encoding, _ = sniff_encoding(file_path)
+
+    with open(file_path, 'r', encoding=encoding, errors='replace') as f:
         while True:
-            chunk = f.read(read_chunk_size)
+            chunk = f.read(READ_CHUNK_SIZE)
             if not chunk:
                 break
-                
-            content += chunk
+
+            chunks.append(chunk)
             processed_size += len(chunk)
-            
+
             # Update progress
             progress = 10 + (processed_size / file_size) * 30
             app.update_progress(progress, f"Loading large text file ({processed_size/1024/1024:.1f}MB/{file_size/1024/1024:.1f}MB)...")
-            
+
             # Periodically yield to UI to prevent freezing
             app.update()
-    
-    return content
+
+    return ''.join(chunks)
@@ -5,8 +5,10 @@ Optimized Chapter Extractor Module
 This module provides memory-efficient chapter extraction for large documents.
 """
 
-import re
 import gc
+from modules.document.structure_index import (
+    get_structure_index, CHAPTER_HEADING_PATTERN, FLAG_HEADING, FLAG_CHAPTER_HEADING
+)
 
 def is_chapter_heading(text):
     """
@@ -18,22 +20,8 @@ def is_chapter_heading(text):
     Returns:
         bool: True if the text appears to be a chapter heading
     """
-    # Common chapter patterns
-    patterns = [
-        r'^chapter\s+\d+', 
-        r'^section\s+\d+',
-        r'^\d+\.\s+',
-        r'^part\s+\d+'
-    ]
-    
-    text_lower = text.lower().strip()
-    
-    # Check against patterns
-    for pattern in patterns:
-        if re.match(pattern, text_lower):
-            return True
-    
-    return False
+    # "Chapter 1", "Section 1", "1. Title" or "Part 1", ignoring case and leading whitespace
+    return CHAPTER_HEADING_PATTERN.match(text) is not None
 
 def extract_chapters_optimized(app):
     """
@@ -44,26 +32,23 @@ def extract_chapters_optimized(app):
     """
     app.log.info("Using optimized chapter extraction for large document")
     
-    # Process paragraphs in chunks to reduce memory usage
+    # Summarize the document structure in one pass, shared with the later stages
+    index = get_structure_index(app, rebuild=True)
+    paragraphs = app.docx_content.paragraphs
+    
+    # Scan the index in chunks so progress can be reported
     chunk_size = 500  # Process 500 paragraphs at a time
-    total_paragraphs = len(app.docx_content.paragraphs)
+    total_paragraphs = len(index)
     chunks = (total_paragraphs + chunk_size - 1) // chunk_size  # Ceiling division
     
-    # Create a temporary document structure for chapter detection
-    from modules.document.format_handler import extract_chapters_from_headings
-    
     # First pass: scan for headings to find chapter boundaries
     headings_found = []
     for i in range(chunks):
         start_idx = i * chunk_size
         end_idx = min((i + 1) * chunk_size, total_paragraphs)
         
-        # Scan this chunk for headings
-        for j in range(start_idx, end_idx):
-            para = app.docx_content.paragraphs[j]
-            # Check if this paragraph is a heading
-            if para.style.name.startswith('Heading') or is_chapter_heading(para.text):
-                headings_found.append((j, para.text, para.style.name))
+        # Headings by style, and paragraphs that read like chapter headings
+        headings_found.extend(index.find(FLAG_HEADING | FLAG_CHAPTER_HEADING, start_idx, end_idx))
         
         # Update progress
         progress = 40 + (i / chunks) * 20
@@ -73,21 +58,22 @@ def extract_chapters_optimized(app):
     if not headings_found:
         app.log.warning("No headings found in large document, using standard extraction")
         from modules.document.chapter_extractor import extract_chapters
-        extract_chapters(app)
+        extract_chapters(app, index=index)
         return
     
     # Second pass: build chapters from the located headings
     app.chapters = []
     for i in range(len(headings_found)):
-        start_idx = headings_found[i][0]
-        end_idx = headings_found[i+1][0] if i+1 < len(headings_found) else total_paragraphs
+        start_idx = headings_found[i]
+        end_idx = headings_found[i+1] if i+1 < len(headings_found) else total_paragraphs
         
-        chapter_title = headings_found[i][1]
-        chapter_content = app.docx_content.paragraphs[start_idx:end_idx]
+        chapter_title = paragraphs[start_idx].text
+        chapter_content = paragraphs[start_idx:end_idx]
         
         app.chapters.append({
             'title': chapter_title,
-            'content': chapter_content
+            'content': chapter_content,
+            'start': start_idx
         })
         
         # Update progress
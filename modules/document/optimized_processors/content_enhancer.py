@@ -14,10 +14,16 @@ def enhance_book_content_chunked(app):
     Args:
         app: The application instance containing UI elements and data
     """
-    from modules.document.content_enhancer import enhance_chapter_content
+    from modules.document.content_enhancer import enhance_chapter_content, enhance_paragraph_text
+    from modules.document.structure_index import get_chapter_index
+    from modules.document.text_processing.paragraph_cache import ParagraphCache, log_cache_stats
     
     app.log.info("Using chunked content enhancement for large document")
     
+    # Enhance each distinct paragraph text once across all chapters
+    cache = ParagraphCache()
+    enhance_text = cache.memoize(enhance_paragraph_text)
+    
     total_chapters = len(app.chapters)
     for i, chapter in enumerate(app.chapters):
         # Update progress
@@ -26,6 +32,7 @@ def enhance_book_content_chunked(app):
         
         # For very large chapters, process in sections
         content_paragraphs = chapter['content']
+        index, offset = get_chapter_index(app, chapter)
         if len(content_paragraphs) > 200:  # If chapter has more than 200 paragraphs
             app.log.info(f"Processing large chapter {i+1} in sections ({len(content_paragraphs)} paragraphs)")
             
@@ -39,7 +46,7 @@ def enhance_book_content_chunked(app):
                 
                 # Process this section
                 section_paras = content_paragraphs[start_idx:end_idx]
-                enhance_chapter_content(app, section_paras)
+                enhance_chapter_content(app, section_paras, index, offset + start_idx, enhance_text)
                 
                 # Update section progress
                 section_progress = progress + (j / sections) * (15 / total_chapters)
@@ -51,4 +58,6 @@ def enhance_book_content_chunked(app):
                     gc.collect()
         else:
             # Process smaller chapters normally
-            enhance_chapter_content(app, content_paragraphs)
+            enhance_chapter_content(app, content_paragraphs, index, offset, enhance_text)
+    
+    log_cache_stats("enhance_book_content_chunked", cache.hits, cache.misses)
@@ -0,0 +1,172 @@
+
+"""
+Paragraph Patch Module
+
+This module applies text edits to paragraphs without destroying their runs.
+The edit is computed once on the whole paragraph text, and the changed
+character ranges are mapped back onto the runs that hold them, so only the
+runs whose text actually changes are rewritten and their formatting is
+kept. Lightweight model paragraphs, which have no runs, simply take the new
+text.
+
+The edit is found by a greedy alignment in linear time rather than a full
+difflib match, which is quadratic in paragraph length: the text fixes
+applied here are local, so after each difference the two texts resynchronize
+on a short anchor found within a bounded window.
+"""
+
+from bisect import bisect_right
+
+DIFF_BLOCK_SIZE = 64  # Characters compared at a time while skipping equal text
+DIFF_ANCHOR_LENGTH = 8  # Characters of old text that must reappear to resynchronize
+DIFF_WINDOW = 64  # Furthest skip, in old and in new text, searched for an anchor
+
+def _common_length(old_text, i, new_text, j):
+    """Return the length of the common run of old_text from i and new_text from j."""
+    start = i
+    while old_text[i:i + DIFF_BLOCK_SIZE] == new_text[j:j + DIFF_BLOCK_SIZE] and i < len(old_text):
+        i += DIFF_BLOCK_SIZE
+        j += DIFF_BLOCK_SIZE
+    limit = min(len(old_text) - i, len(new_text) - j)
+    k = 0
+    while k < limit and old_text[i + k] == new_text[j + k]:
+        k += 1
+    return min(i + k, len(old_text)) - start
+
+def _resynchronize(old_text, i, new_text, j):
+    """
+    Find where two texts that differ at i and j agree again.
+
+    Returns:
+        tuple: (i, j) of the next common anchor, or None if there is none in the window
+    """
+    for skip in range(DIFF_WINDOW + 1):
+        anchor = old_text[i + skip:i + skip + DIFF_ANCHOR_LENGTH]
+        if not anchor:
+            return None
+        position = new_text.find(anchor, j, j + DIFF_WINDOW + len(anchor))
+        if position != -1:
+            return i + skip, position
+    return None
+
+def _diff_opcodes(old_text, new_text):
+    """
+    Compute difflib-style opcodes between two strings in linear time.
+
+    Equal spans are always real matches; the differences between them are
+    found greedily, so they may be larger than a minimal diff would make them.
+    """
+    opcodes = []
+    i = j = 0
+    while i < len(old_text) and j < len(new_text):
+        length = _common_length(old_text, i, new_text, j)
+        if length:
+            opcodes.append(('equal', i, i + length, j, j + length))
+            i += length
+            j += length
+            continue
+
+        anchor = _resynchronize(old_text, i, new_text, j)
+        if anchor is None:
+            break
+        next_i, next_j = anchor
+        tag = 'replace' if next_i > i and next_j > j else ('delete' if next_i > i else 'insert')
+        opcodes.append((tag, i, next_i, j, next_j))
+        i, j = next_i, next_j
+
+    # Whatever is left over differs as a whole
+    if i < len(old_text) or j < len(new_text):
+        tag = 'replace' if i < len(old_text) and j < len(new_text) else ('delete' if i < len(old_text) else 'insert')
+        opcodes.append((tag, i, len(old_text), j, len(new_text)))
+    return opcodes
+
+def map_edits_to_runs(run_texts, new_text):
+    """
+    Distribute a new paragraph text over existing runs.
+
+    Unchanged characters stay in the run that held them. Replaced text goes
+    to the run holding the first replaced character, and inserted text to
+    the run holding the character before the insertion point.
+
+    Args:
+        run_texts: List of the current run texts, in order
+        new_text: The new text of the whole paragraph
+
+    Returns:
+        List of new run texts, one per run
+    """
+    old_text = ''.join(run_texts)
+
+    # Start offsets of the non-empty runs, for locating character positions
+    starts = []
+    run_indices = []
+    offset = 0
+    for index, text in enumerate(run_texts):
+        if text:
+            starts.append(offset)
+            run_indices.append(index)
+        offset += len(text)
+
+    if not starts:
+        # Nothing to map onto: all new text goes to the first run
+        return [new_text] + [''] * (len(run_texts) - 1)
+
+    def run_at(position):
+        """Index of the run holding the character at position."""
+        return run_indices[max(bisect_right(starts, position) - 1, 0)]
+
+    pieces = [[] for _ in run_texts]
+    for tag, i1, i2, j1, j2 in _diff_opcodes(old_text, new_text):
+        if tag == 'equal':
+            # Split the unchanged span at run boundaries
+            position = i1
+            while position < i2:
+                k = bisect_right(starts, position) - 1
+                run_end = starts[k + 1] if k + 1 < len(starts) else len(old_text)
+                end = min(i2, run_end)
+                pieces[run_indices[k]].append(new_text[j1 + position - i1:j1 + end - i1])
+                position = end
+        elif j2 > j1:
+            # Replacements belong to the first replaced character's run,
+            # insertions to the run of the character before them
+            owner = run_at(i1) if tag == 'replace' else run_at(max(i1 - 1, 0))
+            pieces[owner].append(new_text[j1:j2])
+
+    return [''.join(run_pieces) for run_pieces in pieces]
+
+def apply_paragraph_text(paragraph, new_text):
+    """
+    Set the text of a paragraph while keeping its runs and their formatting.
+
+    Args:
+        paragraph: A python-docx paragraph or a lightweight model paragraph
+        new_text: The new paragraph text
+
+    Returns:
+        bool: True if the paragraph text changed
+    """
+    if paragraph.text == new_text:
+        return False
+
+    # Model paragraphs have no runs and take the text directly
+    runs = getattr(paragraph, 'runs', None)
+    if runs is None:
+        paragraph.text = new_text
+        return True
+
+    run_texts = [run.text for run in runs]
+    if not runs or ''.join(run_texts) != paragraph.text:
+        # Text outside plain runs (e.g. in hyperlinks) cannot be mapped, so
+        # fall back to replacing the paragraph content
+        paragraph.text = new_text
+        return True
+
+    if len(runs) == 1:
+        runs[0].text = new_text
+        return True
+
+    for run, old_run_text, new_run_text in zip(runs, run_texts, map_edits_to_runs(run_texts, new_text)):
+        if new_run_text != old_run_text:
+            run.text = new_run_text
+
+    return True
@@ -0,0 +1,258 @@
+
+"""
+Pre-flight Inspection Module
+
+This module inspects queued input files before a batch starts. Every file is
+examined in a worker process: its real format is identified from magic bytes,
+text files have their encoding sniffed, and the paragraph count and peak
+loading memory are estimated from a sample. The batch scheduler uses the
+results to order and pack work, and to report unsupported or corrupt files
+up front instead of failing on them halfway through a run.
+"""
+
+import os
+import zipfile
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+from modules.document.format_handler import detect_file_format
+
+SUPPORTED_FORMATS = ('docx', 'pdf', 'txt', 'md', 'html')
+
+SAMPLE_SIZE = 64 * 1024  # Bytes read from each file for format and paragraph sampling
+
+# Rough cost model for a loaded paragraph: python-docx keeps an lxml element
+# tree plus proxy objects per paragraph, and text is held both as str and XML
+PARAGRAPH_MEMORY_OVERHEAD = 2 * 1024
+TEXT_MEMORY_FACTOR = 4
+DOCX_XML_MEMORY_FACTOR = 6
+PDF_LINES_PER_PAGE = 25  # Typical transcript page
+
+_ZIP_SIGNATURE = b'PK\x03\x04'
+_PDF_SIGNATURE = b'%PDF'
+_HTML_PREFIXES = (b'<!doctype html', b'<html')
+_DOCX_MIME_TYPES = (
+    'application/zip',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+)
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+class PreflightResult:
+    """
+    Outcome of inspecting a single input file
+
+    Attributes:
+        file_path: Path to the inspected file
+        file_size: Size of the file in bytes
+        file_format: Format the loader will use, from the file extension
+        content_format: Format identified from the file content
+        mime_type: MIME type reported by libmagic, if available
+        encoding: Sniffed encoding for text formats, None otherwise
+        estimated_paragraphs: Estimated number of paragraphs in the file
+        estimated_memory: Estimated peak memory for loading the file, in bytes
+        error: Reason the file cannot be processed, or None
+    """
+
+    __slots__ = (
+        'file_path', 'file_size', 'file_format', 'content_format', 'mime_type',
+        'encoding', 'estimated_paragraphs', 'estimated_memory', 'error'
+    )
+
+    def __init__(self, file_path, file_size=0, file_format='unknown'):
+        self.file_path = file_path
+        self.file_size = file_size
+        self.file_format = file_format
+        self.content_format = None
+        self.mime_type = None
+        self.encoding = None
+        self.estimated_paragraphs = 0
+        self.estimated_memory = 0
+        self.error = None
+
+    @property
+    def is_supported(self):
+        """Whether the file can be handed to the document loader."""
+        return self.error is None
+
+    def __repr__(self):
+        return (
+            f"PreflightResult({self.file_path!r}, format={self.file_format!r}, "
+            f"paragraphs~{self.estimated_paragraphs}, memory~{self.estimated_memory}, "
+            f"error={self.error!r})"
+        )
+
+def _detect_mime_type(head: bytes) -> Optional[str]:
+    """Return the MIME type libmagic reports for a sample, or None if unavailable."""
+    try:
+        import magic
+        return magic.from_buffer(head, mime=True)
+    except ImportError:
+        return None
+    except Exception as e:
+        logger.debug(f"libmagic could not classify sample: {str(e)}")
+        return None
+
+def _detect_content_format(head: bytes, mime_type: Optional[str]) -> str:
+    """Identify the file format from its leading bytes."""
+    if head.startswith(_ZIP_SIGNATURE) or mime_type in _DOCX_MIME_TYPES:
+        return 'zip'
+    if head.startswith(_PDF_SIGNATURE) or mime_type == 'application/pdf':
+        return 'pdf'
+
+    lowered = head.lstrip()[:64].lower()
+    if mime_type == 'text/html' or lowered.startswith(_HTML_PREFIXES):
+        return 'html'
+
+    # libmagic labels plain text in many ways (JSON, CSV, ...), so binary
+    # content is recognized by NUL bytes, which only occur in text that
+    # carries a UTF-16/32 byte order mark
+    if b'\0' in head and not head.startswith((b'\xff\xfe', b'\xfe\xff', b'\0\0\xfe\xff')):
+        return 'binary'
+    return 'text'
+
+def _inspect_docx(result: PreflightResult):
+    """Check the DOCX package and estimate its size from word/document.xml."""
+    try:
+        with zipfile.ZipFile(result.file_path) as archive:
+            try:
+                info = archive.getinfo('word/document.xml')
+            except KeyError:
+                result.error = "ZIP archive is not a Word document (no word/document.xml)"
+                return
+
+            with archive.open(info) as stream:
+                sample = stream.read(SAMPLE_SIZE)
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, EOFError) as e:
+        result.error = f"Corrupt DOCX package: {str(e)}"
+        return
+
+    sampled_paragraphs = sample.count(b'<w:p>') + sample.count(b'<w:p ')
+    scale = info.file_size / max(len(sample), 1)
+    result.estimated_paragraphs = int(sampled_paragraphs * scale)
+    result.estimated_memory = (
+        info.file_size * DOCX_XML_MEMORY_FACTOR +
+        result.estimated_paragraphs * PARAGRAPH_MEMORY_OVERHEAD
+    )
+
+def _inspect_pdf(result: PreflightResult):
+    """Check that the PDF opens and estimate its size from the page count."""
+    from modules.document.loaders.pdf_loader import get_pdf_page_count
+
+    try:
+        page_count = get_pdf_page_count(result.file_path)
+    except Exception as e:
+        result.error = f"Corrupt PDF file: {str(e)}"
+        return
+
+    result.estimated_paragraphs = page_count * PDF_LINES_PER_PAGE
+    result.estimated_memory = (
+        result.file_size * TEXT_MEMORY_FACTOR +
+        result.estimated_paragraphs * PARAGRAPH_MEMORY_OVERHEAD
+    )
+
+def _inspect_text(result: PreflightResult, head: bytes):
+    """Sniff the encoding and estimate the paragraph count of a text file."""
+    from modules.document.text_processing.encoding import sniff_encoding
+
+    result.encoding, _ = sniff_encoding(result.file_path)
+    sample = head.decode(result.encoding, errors='replace')
+
+    if result.file_format == 'html':
+        lowered = sample.lower()
+        sampled_paragraphs = sum(lowered.count(tag) for tag in ('<p', '<li', '<h1', '<h2', '<h3', '<h4', '<h5', '<h6'))
+    elif result.file_format == 'md':
+        # Blocks are separated by blank lines
+        sampled_paragraphs = sum(1 for block in sample.split('\n\n') if block.strip())
+    else:
+        sampled_paragraphs = sum(1 for line in sample.splitlines() if line.strip())
+
+    scale = result.file_size / max(len(head), 1)
+    result.estimated_paragraphs = int(sampled_paragraphs * scale)
+    result.estimated_memory = (
+        result.file_size * TEXT_MEMORY_FACTOR +
+        result.estimated_paragraphs * PARAGRAPH_MEMORY_OVERHEAD
+    )
+
+def inspect_file(file_path: str) -> PreflightResult:
+    """
+    Inspect a single input file.
+
+    Problems are recorded on the result instead of being raised, so one bad
+    file never aborts the inspection of the others.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        PreflightResult describing the file
+    """
+    result = PreflightResult(file_path, file_format=detect_file_format(file_path))
+
+    try:
+        result.file_size = os.path.getsize(file_path)
+        with open(file_path, 'rb') as f:
+            head = f.read(SAMPLE_SIZE)
+    except OSError as e:
+        result.error = f"Cannot read file: {str(e)}"
+        return result
+
+    if result.file_format not in SUPPORTED_FORMATS:
+        result.error = f"Unsupported file format: {os.path.splitext(file_path)[1] or 'no extension'}"
+        return result
+
+    if not head:
+        result.error = "File is empty"
+        return result
+
+    result.mime_type = _detect_mime_type(head)
+    result.content_format = _detect_content_format(head, result.mime_type)
+
+    try:
+        if result.file_format == 'docx':
+            if result.content_format != 'zip':
+                result.error = f"File has a .docx extension but contains {result.content_format} data"
+            else:
+                _inspect_docx(result)
+        elif result.file_format == 'pdf':
+            if result.content_format != 'pdf':
+                result.error = f"File has a .pdf extension but contains {result.content_format} data"
+            else:
+                _inspect_pdf(result)
+        elif result.content_format in ('text', 'html'):
+            _inspect_text(result, head)
+        else:
+            result.error = f"File has a text extension but contains {result.content_format} data"
+    except Exception as e:
+        result.error = f"Inspection failed: {str(e)}"
+
+    return result
+
+def inspect_files(file_paths: List[str], max_workers: Optional[int] = None) -> List[PreflightResult]:
+    """
+    Inspect a list of input files in parallel worker processes.
+
+    Falls back to inspecting files in this process when a pool cannot be
+    started or breaks, or when there is only one file.
+
+    Args:
+        file_paths: Paths of the files to inspect
+        max_workers: Maximum number of worker processes (default: CPU count)
+
+    Returns:
+        List of PreflightResult objects in the same order as file_paths
+    """
+    file_paths = list(file_paths)
+    if len(file_paths) < 2:
+        return [inspect_file(file_path) for file_path in file_paths]
+
+    workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(file_paths) // (workers * 4))
+            return list(executor.map(inspect_file, file_paths, chunksize=chunksize))
+    except (OSError, BrokenProcessPool) as e:
+        logger.warning(f"Parallel pre-flight inspection unavailable, inspecting serially: {str(e)}")
+        return [inspect_file(file_path) for file_path in file_paths]
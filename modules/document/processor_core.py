@@ -64,6 +64,10 @@ def _process_document_thread(app, show_message=True):
         app.log.info(f"Book title: {app.book_title.get()}")
         app.log.info(f"Author: {app.author_name.get()}")
         
+        # Build a python-docx paragraph list once for all processing stages
+        from modules.document.loaders.records import snapshot_document
+        app.docx_content = snapshot_document(app.docx_content)
+        
         # Estimate document size for optimization
         doc_size = len(app.docx_content.paragraphs)
         is_large_document = doc_size > 1000  # Consider documents with >1000 paragraphs as large
@@ -0,0 +1,184 @@
+
+"""
+Structure Index Module
+
+This module provides StructureIndex, a compact per-paragraph summary of a
+document's structure built in a single pass: heading level, pattern-match
+flags, the length of the blank run before each paragraph and the text
+length. Chapter extraction, table of contents generation and content
+enhancement all read these arrays instead of asking every paragraph for its
+style and text again, which is slow for python-docx paragraphs and adds up
+for long transcripts.
+
+The index for the loaded document is kept on the app as structure_index.
+Chapters record the position of their first paragraph as 'start', so later
+stages can look up a chapter's paragraphs in the shared index.
+"""
+
+import re
+from array import array
+from bisect import bisect_left
+from modules.document.loaders.records import snapshot_document
+from modules.document.loaders.styles import get_style_cache
+
+# Per-paragraph flags
+FLAG_HEADING = 0x01  # Heading style: named 'Heading...' or with a heading level
+FLAG_TITLE = 0x02  # Style name starts with 'Title'
+FLAG_BLANK = 0x04  # Text is empty or whitespace
+FLAG_CHAPTER_START = 0x08  # Text matches a chapter pattern ("Chapter 1", "Part 2", "Chapter One: ...")
+FLAG_CHAPTER_HEADING = 0x10  # Text looks like a chapter heading, ignoring leading whitespace
+
+CHAPTER_PATTERN_SAMPLE = 30  # Leading paragraphs searched for chapter patterns
+
+CHAPTER_START_PATTERN = re.compile(
+    r'chapter\s+\d+|section\s+\d+|part\s+\d+|\d+\.\s|chapter\s+[\w\s]+:',
+    re.IGNORECASE
+)
+CHAPTER_HEADING_PATTERN = re.compile(
+    r'\s*(?:chapter\s+\d+|section\s+\d+|\d+\.\s+\S|part\s+\d+)',
+    re.IGNORECASE
+)
+
+def _style_info(name, level):
+    """Return the (heading level, flags) implied by a paragraph style's name and level."""
+    if level or name.startswith('Heading'):
+        return level, FLAG_HEADING
+    if name.startswith('Title'):
+        return 1, FLAG_TITLE
+    return 0, 0
+
+class StructureIndex:
+    """
+    Structural summary of a sequence of paragraphs, one array entry per paragraph
+
+    Attributes:
+        document: The document the paragraphs came from, if any
+        heading_levels: Heading level per paragraph (Title counts as 1, 0 for body text)
+        flags: Bitwise OR of the FLAG_* values per paragraph
+        blank_runs: Number of blank paragraphs immediately before each paragraph
+        text_lengths: Length of each paragraph's text
+        heading_positions: Positions of the paragraphs with a heading level, in order
+    """
+
+    def __init__(self, paragraphs, document=None, style_cache=None):
+        """
+        Build the index in one pass over the paragraphs
+
+        Args:
+            paragraphs: Sequence of paragraphs with text and style.name
+            document: The document the paragraphs came from, if any
+            style_cache: StyleCache for the paragraphs' document, the document's own if not given
+        """
+        self.document = document
+        self.heading_levels = heading_levels = array('B')
+        self.flags = flags = array('B')
+        self.blank_runs = blank_runs = array('I')
+        self.text_lengths = text_lengths = array('I')
+        self.heading_positions = array('I')
+
+        resolve = (style_cache or get_style_cache(document)).resolve
+        styles = {}  # (style name, heading level) -> (heading level, flags)
+        blank_run = 0
+        for position, para in enumerate(paragraphs):
+            text = para.text
+            style = resolve(para)
+            info = styles.get(style)
+            if info is None:
+                info = styles[style] = _style_info(*style)
+            level, flag = info
+
+            if level:
+                self.heading_positions.append(position)
+            if not text or text.isspace():
+                flag |= FLAG_BLANK
+            else:
+                if CHAPTER_START_PATTERN.match(text):
+                    flag |= FLAG_CHAPTER_START
+                if CHAPTER_HEADING_PATTERN.match(text):
+                    flag |= FLAG_CHAPTER_HEADING
+
+            heading_levels.append(min(level, 255))
+            flags.append(flag)
+            blank_runs.append(blank_run)
+            text_lengths.append(len(text))
+            blank_run = blank_run + 1 if flag & FLAG_BLANK else 0
+
+    def __len__(self):
+        return len(self.flags)
+
+    def headings_in(self, start=0, stop=None):
+        """
+        Return the positions of headings and titles in a range of paragraphs.
+
+        Args:
+            start: First position of the range
+            stop: End of the range (exclusive), or None for the end of the index
+
+        Returns:
+            list: Positions of the paragraphs with a heading level, in order
+        """
+        positions = self.heading_positions
+        low = bisect_left(positions, start)
+        high = len(positions) if stop is None else bisect_left(positions, stop, low)
+        return positions[low:high].tolist()
+
+    def find(self, mask, start=0, stop=None):
+        """
+        Return the positions of paragraphs with any of the given flags.
+
+        Args:
+            mask: Bitwise OR of FLAG_* values
+            start: First position searched
+            stop: End of the search (exclusive), or None for the end of the index
+
+        Returns:
+            list: Matching positions, in order
+        """
+        stop = len(self.flags) if stop is None else min(stop, len(self.flags))
+        flags = self.flags
+        return [position for position in range(start, stop) if flags[position] & mask]
+
+def get_structure_index(app, rebuild=False):
+    """
+    Return the structure index of the app's loaded document, building it if needed.
+
+    A python-docx document is wrapped in a DocumentSnapshot first, so the
+    stages reading app.docx_content.paragraphs after it share one list.
+
+    Args:
+        app: The application instance holding docx_content
+        rebuild: Build a fresh index even if one exists, e.g. after loading a document
+
+    Returns:
+        StructureIndex: The index, also stored as app.structure_index
+    """
+    document = app.docx_content = snapshot_document(app.docx_content)
+    paragraphs = document.paragraphs
+    index = getattr(app, 'structure_index', None)
+    if (rebuild or not isinstance(index, StructureIndex)
+            or index.document is not document or len(index) != len(paragraphs)):
+        index = app.structure_index = StructureIndex(paragraphs, document)
+    return index
+
+def get_chapter_index(app, chapter):
+    """
+    Return a structure index covering a chapter's paragraphs.
+
+    Chapters extracted from the loaded document share its index; other
+    chapters get an index of their own.
+
+    Args:
+        app: The application instance
+        chapter: Chapter dict with 'content' and optionally 'start'
+
+    Returns:
+        tuple: (StructureIndex, position of the chapter's first paragraph in it)
+    """
+    start = chapter.get('start')
+    index = getattr(app, 'structure_index', None)
+    if (start is not None and isinstance(index, StructureIndex)
+            and index.document is getattr(app, 'docx_content', None)
+            and start + len(chapter['content']) <= len(index)):
+        return index, start
+    style_cache = get_style_cache(getattr(app, 'docx_content', None))
+    return StructureIndex(chapter['content'], style_cache=style_cache), 0
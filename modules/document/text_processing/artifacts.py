@@ -0,0 +1,162 @@
+
+"""
+Transcription Artifact Module
+
+This module removes AI transcription artifacts (directive lines ending with
+a pilcrow, metadata tags and similar) from paragraph text. Every pattern is
+tagged with a trigger naming characters it cannot match without, such as a
+pilcrow or pipe, or an opening bracket, and is compiled once. A pattern only
+runs on text containing its trigger characters, so most paragraphs skip the
+regex passes entirely. Patterns are applied to the whole text in MULTILINE
+mode, in order, so whitespace classes can still match across line breaks.
+Extra patterns can be loaded from a JSON config file.
+"""
+
+import os
+import re
+import json
+import logging
+
+# Triggers: which texts a pattern can possibly match
+TRIGGER_TRAILING_MARK = 'trailing_mark'      # Text contains ¶ or |
+TRIGGER_LEADING_BRACKET = 'leading_bracket'  # Text contains [
+TRIGGER_ANY = 'any'                          # Every text (slowest, use sparingly)
+TRIGGERS = (TRIGGER_TRAILING_MARK, TRIGGER_LEADING_BRACKET, TRIGGER_ANY)
+
+# Characters required by each trigger, None for no requirement
+_TRIGGER_CHARACTERS = {
+    TRIGGER_TRAILING_MARK: ('¶', '|'),
+    TRIGGER_LEADING_BRACKET: ('[',),
+    TRIGGER_ANY: None,
+}
+
+# Optional court-specific patterns, added to the defaults
+ARTIFACT_CONFIG_PATH = os.path.join(os.getcwd(), "Config", "artifact_patterns.json")
+
+# Default artifact patterns, as (trigger, pattern) pairs applied in order
+DEFAULT_ARTIFACT_PATTERNS = [
+    # Paragraphs ending with ¶ or similar symbols
+    (TRIGGER_TRAILING_MARK, r'^[ •]*[\w\s]+·+¶[\s]*$'),
+    (TRIGGER_TRAILING_MARK, r'^[ •]*[\w\s].*[¶|]+[\s]*$'),
+
+    # Directive lines with bullet points
+    (TRIGGER_TRAILING_MARK, r'^[ •]*(Ensure|Do not|Use|Avoid|Correct|Incorrect)[\w\s\-\.]+[¶|]+[\s]*$'),
+
+    # Section markers with special symbols
+    (TRIGGER_TRAILING_MARK, r'^[\s]*[⚠️|🚫|⛔|🔴|🟠|🟡|🟢|🔵|🟣|⚪|⚫|✅|❌|⭕|❗|❓|❕|❔|🔺|🔻|🔸|🔹|🔶|🔷|🔘|🔲|🔳|🔈|🔉|🔊|🔇].*[¶|]+[\s]*$'),
+
+    # Common AI instruction patterns
+    (TRIGGER_TRAILING_MARK, r'^(Usage:|Example:|Note:|Important:|Warning:|Caution:|Remember:).*[¶|]+[\s]*$'),
+
+    # Common metadata patterns often included in AI-generated text
+    (TRIGGER_LEADING_BRACKET, r'^\[(Timestamp|Time|Speaker|ID|Note)\].*$'),
+
+    # Lines that appear to be formatting instructions
+    (TRIGGER_TRAILING_MARK, r'^[\s]*(Correct vs\. Incorrect).*[¶|]+[\s]*$'),
+    (TRIGGER_TRAILING_MARK, r'^[\s]*(Incorrect Usage:).*[¶|]+[\s]*$'),
+]
+
+_EXCESS_NEWLINES = re.compile(r'\n{3,}')
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+class ArtifactMatcher:
+    """
+    Precompiled matcher that blanks out artifact lines in text
+    """
+
+    def __init__(self, patterns):
+        """
+        Compile the patterns, keeping their order
+
+        Args:
+            patterns: Iterable of (trigger, pattern) pairs
+
+        Raises:
+            ValueError: If a trigger is unknown
+            re.error: If a pattern does not compile
+        """
+        self._patterns = []  # (trigger, compiled pattern), in order
+        for trigger, pattern in patterns:
+            if trigger not in _TRIGGER_CHARACTERS:
+                raise ValueError(f"Unknown artifact pattern trigger: {trigger}")
+            self._patterns.append((trigger, re.compile(pattern, re.MULTILINE)))
+
+    def remove(self, text):
+        """
+        Remove artifact lines from text.
+
+        Matches are removed, runs of three or more newlines are collapsed to
+        a paragraph break and the result is stripped. Removing text never
+        adds characters, so a trigger that fails once stays failed.
+
+        Args:
+            text: The text to clean
+
+        Returns:
+            The cleaned text
+        """
+        if not text:
+            return text
+
+        triggered = {}  # Trigger -> whether the text contains its characters
+        for trigger, regex in self._patterns:
+            hit = triggered.get(trigger)
+            if hit is None:
+                characters = _TRIGGER_CHARACTERS[trigger]
+                hit = triggered[trigger] = characters is None or any(char in text for char in characters)
+            if hit:
+                text = regex.sub('', text)
+
+        if '\n\n\n' in text:
+            text = _EXCESS_NEWLINES.sub('\n\n', text)
+
+        return text.strip()
+
+def load_artifact_patterns(config_path):
+    """
+    Load extra artifact patterns from a JSON config file.
+
+    The file holds {"patterns": [{"pattern": "...", "trigger": "trailing_mark"}]};
+    the trigger defaults to "any". Invalid entries are logged and skipped.
+
+    Args:
+        config_path: Path to the JSON config file
+
+    Returns:
+        List of (trigger, pattern) pairs
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    patterns = []
+    for entry in config.get('patterns', []):
+        pattern = entry.get('pattern') if isinstance(entry, dict) else None
+        trigger = entry.get('trigger', TRIGGER_ANY) if isinstance(entry, dict) else None
+        if not pattern or trigger not in TRIGGERS:
+            logger.warning(f"Skipping invalid artifact pattern entry in {config_path}: {entry!r}")
+            continue
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            logger.warning(f"Skipping artifact pattern {pattern!r} in {config_path}: {str(e)}")
+            continue
+        patterns.append((trigger, pattern))
+
+    return patterns
+
+_artifact_matcher = None
+
+def get_artifact_matcher():
+    """Return the shared ArtifactMatcher, built from the defaults and the config file."""
+    global _artifact_matcher
+    if _artifact_matcher is None:
+        patterns = list(DEFAULT_ARTIFACT_PATTERNS)
+        if os.path.exists(ARTIFACT_CONFIG_PATH):
+            try:
+                patterns.extend(load_artifact_patterns(ARTIFACT_CONFIG_PATH))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load artifact patterns from {ARTIFACT_CONFIG_PATH}: {str(e)}")
+        _artifact_matcher = ArtifactMatcher(patterns)
+    return _artifact_matcher
@@ -1,16 +1,110 @@
 
-import unicodedata
+import os
+import codecs
 import chardet
 import re
+from modules.document.text_processing.pipeline import TextPipeline, Stage, NormalizeStage
+
+# Byte order marks, longest first (the UTF-32 LE BOM starts with the UTF-16 LE one)
+_BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+SNIFF_PREFIX_SIZE = 64 * 1024  # Bytes validated from the start of the input
+SNIFF_WINDOW_SIZE = 16 * 1024  # Size of each sampled window after the prefix
+SNIFF_WINDOW_COUNT = 8         # Number of windows sampled across the input
+
+# chardet labels that are better decoded with a superset codec
+_ENCODING_SUPERSETS = {
+    'ascii': 'utf-8',
+    'iso-8859-1': 'cp1252',
+    'latin-1': 'cp1252',
+}
+
+def _is_utf8_sample(sample, starts_mid_stream, ends_mid_stream):
+    """Strictly validate a byte sample as UTF-8, tolerating cut characters at its edges."""
+    if starts_mid_stream:
+        # Skip continuation bytes of a character that started before the window
+        skip = 0
+        while skip < 3 and skip < len(sample) and 0x80 <= sample[skip] <= 0xBF:
+            skip += 1
+        sample = sample[skip:]
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=not ends_mid_stream)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+def _sample_windows(read_at, total_size):
+    """Collect the prefix and evenly spaced windows of an input of total_size bytes."""
+    samples = [(read_at(0, SNIFF_PREFIX_SIZE), False, total_size > SNIFF_PREFIX_SIZE)]
+
+    remaining = total_size - SNIFF_PREFIX_SIZE
+    if remaining > 0:
+        window_count = min(SNIFF_WINDOW_COUNT, max(1, remaining // SNIFF_WINDOW_SIZE))
+        stride = remaining // window_count
+        for i in range(window_count):
+            offset = SNIFF_PREFIX_SIZE + i * stride
+            size = min(SNIFF_WINDOW_SIZE, total_size - offset)
+            samples.append((read_at(offset, size), True, offset + size < total_size))
+
+    return samples
+
+def _sniff_samples(samples):
+    """Pick an encoding from sampled windows: BOM, then strict UTF-8, then chardet."""
+    head = samples[0][0]
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, 1.0
+
+    if all(_is_utf8_sample(*sample) for sample in samples):
+        return 'utf-8', 1.0
+
+    try:
+        result = chardet.detect(b''.join(sample for sample, _, _ in samples))
+    except Exception:
+        return 'cp1252', 0.0
+
+    encoding = (result.get('encoding') or 'cp1252').lower()
+    encoding = _ENCODING_SUPERSETS.get(encoding, encoding)
+    try:
+        encoding = codecs.lookup(encoding).name
+    except LookupError:
+        return 'cp1252', 0.0
+    return encoding, result.get('confidence') or 0.0
+
+def sniff_encoding(file_path):
+    """
+    Detect the encoding of a file from a bounded number of sampled bytes.
+
+    Byte order marks are checked first, then the prefix and a fixed number of
+    windows spread across the file are strictly validated as UTF-8. Only if
+    that fails is chardet run, and only over the same samples, so detection
+    time does not grow with file size.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Tuple of (encoding, confidence)
+    """
+    total_size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        def read_at(offset, size):
+            f.seek(offset)
+            return f.read(size)
+
+        return _sniff_samples(_sample_windows(read_at, total_size))
 
 def detect_encoding(text_bytes):
     """Detect encoding of text bytes."""
     try:
-        result = chardet.detect(text_bytes)
-        encoding = result['encoding'] or 'utf-8'
-        confidence = result['confidence']
-        return encoding, confidence
-    except:
+        return _sniff_samples(_sample_windows(lambda offset, size: text_bytes[offset:offset + size], len(text_bytes)))
+    except Exception:
         return 'utf-8', 0.0
 
 def normalize_whitespace(text):
@@ -27,6 +121,18 @@ def normalize_whitespace(text):
         print(f"Error normalizing whitespace: {str(e)}")
         return text  # Return original if normalization fails
 
+_preprocess_pipeline = None
+
+def get_preprocess_pipeline():
+    """Return the shared pipeline used to normalize text file content."""
+    global _preprocess_pipeline
+    if _preprocess_pipeline is None:
+        _preprocess_pipeline = TextPipeline([
+            NormalizeStage('NFKD'),
+            Stage('whitespace', normalize_whitespace),
+        ])
+    return _preprocess_pipeline
+
 def preprocess_text_file(file_content, file_encoding=None):
     """Preprocess text file content with encoding detection and normalization."""
     try:
@@ -56,13 +162,8 @@ def preprocess_text_file(file_content, file_encoding=None):
         
         # If content is already a string, just proceed with normalization
         if isinstance(file_content, str):
-            # Normalize unicode characters
-            file_content = unicodedata.normalize('NFKD', file_content)
-            
-            # Fix common issues
-            file_content = normalize_whitespace(file_content)
-            
-            return file_content
+            # Normalize unicode characters and fix common issues
+            return get_preprocess_pipeline().process(file_content)
             
         return file_content  # In case it's neither bytes nor string
     except Exception as e:
@@ -1,13 +1,40 @@
 
 from bs4 import BeautifulSoup
+import os
 import re
-import unicodedata
+import codecs
 import logging
+from functools import partial
 from typing import Optional
+from modules.document.text_processing.pipeline import TextPipeline, Stage, NormalizeStage
 
-def clean_html_content(html_content):
-    """Clean HTML content by removing scripts, styles, and unnecessary tags."""
+_html_text_pipeline = None
+
+def get_html_text_pipeline():
+    """Return the shared pipeline used to tidy text extracted from HTML."""
+    global _html_text_pipeline
+    if _html_text_pipeline is None:
+        _html_text_pipeline = TextPipeline([
+            Stage('newlines', partial(re.compile(r'\n{2,}').sub, '\n'), requires='\n\n'),
+            Stage('spaces', partial(re.compile(r' {2,}').sub, ' '), requires='  '),
+            NormalizeStage('NFKD'),
+            Stage('strip', str.strip),
+        ])
+    return _html_text_pipeline
+
+def clean_html_content(html_content, sanitize=False):
+    """
+    Clean HTML content by removing scripts, styles, and unnecessary tags.
+    
+    Args:
+        html_content: The HTML content to clean
+        sanitize: Whether to run the content through the HTML sanitizer first
+    """
     try:
+        if sanitize:
+            from modules.utils.security_utils import sanitize_html
+            html_content = sanitize_html(html_content)
+        
         soup = BeautifulSoup(html_content, 'html.parser')
         
         # Remove scripts, styles, and comments
@@ -32,14 +59,8 @@ def clean_html_content(html_content):
         # Get text content
         text = soup.get_text(separator=' ')
         
-        # Fix multiple spaces and newlines
-        text = re.sub(r'\n+', '\n', text)
-        text = re.sub(r' +', ' ', text)
-        
-        # Fix encoding issues
-        text = unicodedata.normalize('NFKD', text)
-        
-        return text.strip()
+        # Fix multiple spaces and newlines, and encoding issues
+        return get_html_text_pipeline().process(text)
     except Exception as e:
         logging.error(f"Error cleaning HTML: {str(e)}")
         return html_content  # Return original if cleaning fails
@@ -88,6 +109,68 @@ def extract_text_from_markdown(markdown_content):
         logging.error(f"Error processing markdown: {str(e)}")
         return markdown_content if isinstance(markdown_content, str) else ""
 
+MAX_FILE_SIZE = 50 * 1024 * 1024  # Largest file accepted by content validation
+VALIDATION_WINDOW_SIZE = 1024 * 1024  # Bytes read per window when validating a file
+
+# Opening or closing tags of elements that are unsafe in HTML input
+_UNSAFE_TAG = re.compile(r'<(/?)(script|object|iframe)(?=[\s/>])', re.IGNORECASE)
+_UNSAFE_TAG_CARRY = len('</iframe')  # Characters kept between chunks so tags split across them are found
+_UNSAFE_TAG_ERRORS = {
+    'script': "File contains potentially unsafe script tags",
+    'object': "File contains potentially unsafe object tags",
+    'iframe': "File contains potentially unsafe iframe tags",
+}
+
+class ContentValidator:
+    """
+    Incremental content checker fed with consecutive chunks of text
+
+    An element is unsafe once its opening tag and a later closing tag have
+    been seen, so the checker only keeps the set of open tags and a few
+    characters of carry-over between chunks.
+    """
+
+    def __init__(self, file_type):
+        self.file_type = file_type
+        self._carry = ''
+        self._offset = 0  # Position of the carry-over in the whole content
+        self._scanned_to = 0  # End of the last tag found
+        self._open_tags = set()
+
+    def feed(self, chunk):
+        """
+        Check the next chunk of content.
+
+        Args:
+            chunk: The next piece of text
+
+        Returns:
+            str: An error message for the first violation, or None
+        """
+        # Check for null bytes (potential binary file)
+        if '\x00' in chunk:
+            return "File contains invalid binary data"
+
+        if self.file_type != 'html':
+            return None
+
+        text = self._carry + chunk
+        for match in _UNSAFE_TAG.finditer(text):
+            start = self._offset + match.start()
+            if start < self._scanned_to:
+                continue  # Already found in the previous chunk
+            self._scanned_to = self._offset + match.end()
+            tag = match.group(2).lower()
+            if not match.group(1):
+                self._open_tags.add(tag)
+            elif tag in self._open_tags:
+                return _UNSAFE_TAG_ERRORS[tag]
+
+        carry_length = min(len(text), _UNSAFE_TAG_CARRY)
+        self._offset += len(text) - carry_length
+        self._carry = text[len(text) - carry_length:]
+        return None
+
 def validate_file_content(file_content: str, file_type: str) -> tuple[bool, Optional[str]]:
     """
     Validates file content for security threats
@@ -105,29 +188,67 @@ def validate_file_content(file_content: str, file_type: str) -> tuple[bool, Opti
             return False, "File is empty"
             
         # Check for reasonable file size to prevent DoS
-        if len(file_content) > 50 * 1024 * 1024:  # 50MB limit
+        if len(file_content) > MAX_FILE_SIZE:
             return False, "File is too large"
             
-        # Check for null bytes (potential binary file)
-        if '\x00' in file_content:
-            return False, "File contains invalid binary data"
-            
-        # Specific checks for HTML content
-        if file_type == 'html':
-            # Check for potential malicious scripts
-            if re.search(r'<script.*?>.*?</script>', file_content, re.DOTALL | re.IGNORECASE):
-                return False, "File contains potentially unsafe script tags"
-                
-            # Check for potential malicious objects
-            if re.search(r'<object.*?>.*?</object>', file_content, re.DOTALL | re.IGNORECASE):
-                return False, "File contains potentially unsafe object tags"
-                
-            # Check for iframe exploitation
-            if re.search(r'<iframe.*?>.*?</iframe>', file_content, re.DOTALL | re.IGNORECASE):
-                return False, "File contains potentially unsafe iframe tags"
+        # Binary data, and unsafe elements in HTML content, in one linear scan
+        error = ContentValidator(file_type).feed(file_content)
+        if error:
+            return False, error
                 
         return True, None
         
     except Exception as e:
         logging.error(f"Error validating file content: {str(e)}")
         return False, f"Error validating file content: {str(e)}"
+
+def validate_file_stream(file_path: str, file_type: str, encoding: str = 'utf-8',
+                         max_size: Optional[int] = MAX_FILE_SIZE,
+                         window_size: int = VALIDATION_WINDOW_SIZE,
+                         sample_size: Optional[int] = None) -> tuple[bool, Optional[str]]:
+    """
+    Validates a file for security threats without reading it into memory
+    
+    The size is checked with stat before anything is read, the file is then
+    read in fixed windows of raw bytes that are decoded incrementally (so
+    UTF-16 text is not mistaken for binary data), and scanning stops at the
+    first violation. Suitable as a pre-filter in the loaders.
+    
+    Args:
+        file_path: Path to the file
+        file_type: The file type/extension (e.g., 'txt', 'html', 'md')
+        encoding: Encoding used to decode the file
+        max_size: Largest accepted file size in bytes, or None for no limit
+        window_size: Number of bytes read per window
+        sample_size: Only check this many leading bytes, or None for the whole file
+        
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    try:
+        file_size = os.stat(file_path).st_size
+        if file_size == 0:
+            return False, "File is empty"
+        
+        # Check for reasonable file size to prevent DoS
+        if max_size is not None and file_size > max_size:
+            return False, "File is too large"
+        
+        validator = ContentValidator(file_type)
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        remaining = file_size if sample_size is None else min(sample_size, file_size)
+        with open(file_path, 'rb') as f:
+            while True:
+                window = f.read(min(window_size, remaining))
+                remaining -= len(window)
+                error = validator.feed(decoder.decode(window, final=not window))
+                if error:
+                    return False, error
+                if not window:
+                    break
+        
+        return True, None
+        
+    except (OSError, LookupError) as e:
+        logging.error(f"Error validating file {file_path}: {str(e)}")
+        return False, f"Error validating file: {str(e)}"
@@ -0,0 +1,129 @@
+
+"""
+Mojibake Repair Module
+
+This module repairs text whose UTF-8 bytes were decoded as cp1252 or
+Latin-1. A precompiled scanner finds runs of characters shaped like encoded
+UTF-8 characters (a lead byte followed by its continuation bytes), and only
+those segments are round-tripped back through the legacy codec and decoded
+as UTF-8. Segment repairs are memoized, since the same broken sequences
+repeat throughout a file.
+"""
+
+import re
+from functools import lru_cache
+
+MOJIBAKE_CACHE_SIZE = 4096  # Distinct broken segments remembered
+MOJIBAKE_MAX_PASSES = 2  # Repair passes, for text that was mis-decoded twice
+ROUND_TRIP_CODECS = ('cp1252', 'latin-1')  # Codecs the UTF-8 bytes were misread with
+
+def _byte_class(low, high):
+    """Regex class of the characters bytes low..high decode to in the round-trip codecs."""
+    chars = set()
+    for byte in range(low, high + 1):
+        for codec in ROUND_TRIP_CODECS:
+            try:
+                chars.add(bytes([byte]).decode(codec))
+            except UnicodeDecodeError:
+                pass
+    return '[' + ''.join(re.escape(char) for char in sorted(chars)) + ']'
+
+# Two-byte leads are limited to Â and Ã (U+0080-U+00FF), since other Latin-1
+# capitals followed by a curly quote are common in clean text
+_LEAD_2 = _byte_class(0xC2, 0xC3)
+_LEAD_3 = _byte_class(0xE0, 0xEF)
+_LEAD_4 = _byte_class(0xF0, 0xF4)
+_CONTINUATION = _byte_class(0x80, 0xBF)
+_ENCODED_CHAR = f'(?:{_LEAD_2}{_CONTINUATION}|{_LEAD_3}{_CONTINUATION}{{2}}|{_LEAD_4}{_CONTINUATION}{{3}})'
+
+# The first encoded character starts with a plain class of all lead bytes,
+# which lets the regex engine skip clean text quickly
+_SEGMENT_PATTERN = re.compile(
+    f'(?:{_LEAD_2}|{_LEAD_3}|{_LEAD_4})'
+    f'(?:(?<={_LEAD_2}){_CONTINUATION}|(?<={_LEAD_3}){_CONTINUATION}{{2}}|(?<={_LEAD_4}){_CONTINUATION}{{3}})'
+    f'{_ENCODED_CHAR}*'
+)
+
+class MojibakeRepairer:
+    """
+    Round-trip repairer for UTF-8 text decoded with a legacy codec
+    """
+
+    def __init__(self, overrides=None, cache_size=MOJIBAKE_CACHE_SIZE):
+        """
+        Set up the repairer
+
+        Args:
+            overrides: Optional dict of broken sequence -> replacement, used
+                       instead of the round trip for exact encoded characters
+            cache_size: Number of segment repairs to memoize
+        """
+        self._overrides = dict(overrides or {})
+        self._repair_segment = lru_cache(maxsize=cache_size)(self._round_trip)
+
+    def _round_trip(self, segment):
+        """Repair one segment, character by character, or return it unchanged."""
+        for codec in ROUND_TRIP_CODECS:
+            try:
+                raw = segment.encode(codec)
+            except UnicodeEncodeError:
+                continue
+            try:
+                decoded = raw.decode('utf-8')
+            except UnicodeDecodeError:
+                continue
+
+            if not self._overrides:
+                return decoded
+
+            # Map each encoded character separately so overrides apply
+            repaired = []
+            position = 0
+            for char in decoded:
+                width = len(char.encode('utf-8'))
+                # Every byte maps to one character in the codecs used here
+                encoded = segment[position:position + width]
+                repaired.append(self._overrides.get(encoded, char))
+                position += width
+            return ''.join(repaired)
+
+        return segment
+
+    def _replace_match(self, match):
+        return self._repair_segment(match.group())
+
+    def repair(self, text):
+        """
+        Repair mojibake segments in text.
+
+        Args:
+            text: The text to repair
+
+        Returns:
+            The repaired text
+        """
+        for _ in range(MOJIBAKE_MAX_PASSES):
+            # Mojibake is made of non-ASCII characters only
+            if text.isascii():
+                break
+            repaired = _SEGMENT_PATTERN.sub(self._replace_match, text)
+            if repaired == text:
+                break
+            text = repaired
+        return text
+
+    def cache_info(self):
+        """Return the hit and miss statistics of the segment cache."""
+        return self._repair_segment.cache_info()
+
+_mojibake_repairer = None
+
+def get_mojibake_repairer():
+    """Return the shared MojibakeRepairer, with the default sequence table as overrides."""
+    global _mojibake_repairer
+    if _mojibake_repairer is None:
+        from modules.document.text_processing.replacements import get_sequence_replacements
+        overrides = {sequence: replacement for sequence, replacement in get_sequence_replacements()
+                     if len(sequence) > 1}
+        _mojibake_repairer = MojibakeRepairer(overrides)
+    return _mojibake_repairer
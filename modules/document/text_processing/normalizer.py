@@ -0,0 +1,185 @@
+
+"""
+Text Normalizer Module
+
+This module compiles the character and sequence replacement tables used by
+the encoding-fix pipeline into a single-pass normalizer. One character-class
+scan finds the characters any rule starts with, so clean text is returned
+after a single pass. Mis-decoded UTF-8 in non-ASCII text is repaired by
+round trip first, the remaining multi-character sequences are matched by one
+combined regex, and single characters are mapped with targeted replaces, or
+a str.translate table for ASCII text with control characters.
+"""
+
+import re
+import unicodedata
+from modules.document.text_processing.replacements import (
+    get_character_replacements, get_sequence_replacements
+)
+from modules.document.text_processing.mojibake import get_mojibake_repairer
+
+# Control characters removed from text; tab, LF and CR are handled separately
+CONTROL_CHARACTERS = [chr(code) for code in range(0x20) if code not in (0x09, 0x0A, 0x0D)] + ['\x7f']
+
+class TextNormalizer:
+    """
+    Precompiled character normalizer
+
+    Sequences are replaced first, longest match first, so mojibake is repaired
+    before its characters are mapped individually or decomposed by NFKD. A
+    sequence containing an earlier rule's sequence is skipped, as it never
+    matched when the rules ran in order. Text
+    that contains none of the characters any rule starts with is recognized
+    with a single scan and returned unchanged.
+    """
+
+    def __init__(self, character_replacements, sequence_replacements, mojibake_repairer=None):
+        """
+        Compile the replacement tables
+
+        Args:
+            character_replacements: dict of single character -> replacement
+            sequence_replacements: (sequence, replacement) pairs for encoding problems
+            mojibake_repairer: Optional MojibakeRepairer run on non-ASCII text
+                               before the sequence table
+        """
+        self._mojibake_repairer = mojibake_repairer
+
+        # Control characters are dropped unless a sequence rule says otherwise
+        repair_map = {char: '' for char in CONTROL_CHARACTERS}
+        self._sequences = {}
+        earlier = []
+        for sequence, replacement in sequence_replacements:
+            # The rules used to be applied one after another, so a sequence
+            # holding an earlier rule's sequence was broken up before it could
+            # match; keep it out, so longest-first matching gives the same result
+            if any(prior in sequence for prior in earlier):
+                continue
+            earlier.append(sequence)
+            if len(sequence) == 1:
+                repair_map[sequence] = replacement
+            else:
+                self._sequences.setdefault(sequence, replacement)
+
+        self._repair_map = repair_map
+        self._full_map = {**character_replacements, **repair_map}
+        self._repair_table = str.maketrans(self._repair_map)
+        self._full_table = str.maketrans(self._full_map)
+        self._sequence_pattern = _compile_alternation(sorted(self._sequences, key=len, reverse=True))
+        self._character_pattern = _compile_class(character_replacements)
+
+        # Characters that can start a change; text without any is left alone
+        self._sequence_leads = frozenset(sequence[0] for sequence in self._sequences)
+        self._repair_triggers = _compile_class(self._sequence_leads | set(self._repair_map))
+        self._normalize_triggers = _compile_class(self._sequence_leads | set(self._full_map))
+
+        # Printable ASCII text can skip the scan when no rule starts with a
+        # printable ASCII character
+        self._printable_ascii_is_clean = not any(
+            char.isascii() and char.isprintable()
+            for char in self._sequence_leads | set(self._full_map)
+        )
+
+    def _replace_sequence(self, match):
+        return self._sequences[match.group()]
+
+    def _apply(self, text, triggers, char_map, table):
+        """Replace sequences, then map the single characters that occur in text."""
+        if self._printable_ascii_is_clean and text.isascii():
+            if text.isprintable() or not triggers.search(text):
+                return text
+            # Only control character rules can apply, and translate has an
+            # ASCII fast path
+            text = self._sequence_pattern.sub(self._replace_sequence, text)
+            return text.translate(table)
+
+        # Round-trip repair of mis-decoded UTF-8 goes first, so the sequence
+        # table only sees what it leaves behind
+        if self._mojibake_repairer is not None:
+            text = self._mojibake_repairer.repair(text)
+
+        found = triggers.findall(text)
+        if not found:
+            return text
+
+        found = set(found)
+        if not self._sequence_leads.isdisjoint(found):
+            text = self._sequence_pattern.sub(self._replace_sequence, text)
+
+        # A few targeted replaces beat a per-character translate on the
+        # mostly-clean paragraphs of real transcripts
+        for char in found:
+            replacement = char_map.get(char)
+            if replacement is not None:
+                text = text.replace(char, replacement)
+        return text
+
+    def repair(self, text):
+        """
+        Repair mojibake sequences, line endings and control characters.
+
+        Args:
+            text: The text to repair
+
+        Returns:
+            The repaired text
+        """
+        return self._apply(text, self._repair_triggers, self._repair_map, self._repair_table)
+
+    def replace(self, text):
+        """
+        Repair the text and map special characters, without NFKD normalization.
+
+        Args:
+            text: The text to process
+
+        Returns:
+            The processed text
+        """
+        return self._apply(text, self._normalize_triggers, self._full_map, self._full_table)
+
+    def normalize(self, text):
+        """
+        Repair the text, map special characters and apply NFKD normalization.
+
+        Args:
+            text: The text to normalize
+
+        Returns:
+            The normalized text
+        """
+        text = self.replace(text)
+
+        # NFKD leaves ASCII unchanged
+        if text.isascii():
+            return text
+        return unicodedata.normalize('NFKD', text)
+
+    def count_replacements(self, text):
+        """Count the characters in text that the character map replaces."""
+        if self._printable_ascii_is_clean and text.isascii() and text.isprintable():
+            return 0
+        return len(self._character_pattern.findall(text))
+
+def _compile_class(chars):
+    """Compile a regex matching any one of chars, or nothing if chars is empty."""
+    if not chars:
+        return re.compile(r'(?!)')
+    return re.compile('[' + ''.join(re.escape(char) for char in sorted(chars)) + ']')
+
+def _compile_alternation(sequences):
+    """Compile a regex matching any of sequences, in the given order of preference."""
+    if not sequences:
+        return re.compile(r'(?!)')
+    return re.compile('|'.join(re.escape(sequence) for sequence in sequences))
+
+_normalizer = None
+
+def get_normalizer():
+    """Return the shared TextNormalizer built from the default tables."""
+    global _normalizer
+    if _normalizer is None:
+        _normalizer = TextNormalizer(
+            get_character_replacements(), get_sequence_replacements(), get_mojibake_repairer()
+        )
+    return _normalizer
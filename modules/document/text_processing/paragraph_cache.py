@@ -0,0 +1,121 @@
+
+"""
+Paragraph Cache Module
+
+This module provides a bounded LRU cache keyed by paragraph text. Court
+transcripts repeat the same lines (page headers, "Q.", "A.", speaker labels,
+certification boilerplate) thousands of times, so text-processing results
+are remembered per distinct paragraph instead of being recomputed for each
+occurrence. Hit rates are written to the performance log. Lookups and
+updates are guarded by a lock, so one cache can be shared between threads.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+PARAGRAPH_CACHE_SIZE = 50000  # Distinct paragraph texts remembered per cache
+PARAGRAPH_CACHE_MAX_LENGTH = 1000  # Longer paragraphs rarely repeat and are not cached
+
+class ParagraphCache:
+    """
+    Bounded LRU cache from paragraph text to a processing result
+
+    Attributes:
+        hits: Number of lookups answered from the cache
+        misses: Number of lookups that were not
+    """
+
+    def __init__(self, maxsize=PARAGRAPH_CACHE_SIZE, max_length=PARAGRAPH_CACHE_MAX_LENGTH):
+        """
+        Set up an empty cache
+
+        Args:
+            maxsize: Maximum number of entries kept
+            max_length: Texts longer than this are never cached
+        """
+        self.maxsize = maxsize
+        self.max_length = max_length
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, text):
+        """
+        Look up the cached result for a text.
+
+        Args:
+            text: The paragraph text
+
+        Returns:
+            The cached result, or None if there is none
+        """
+        with self._lock:
+            result = self._entries.get(text)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(text)
+            self.hits += 1
+            return result
+
+    def put(self, text, result):
+        """
+        Remember the result for a text, evicting the least recently used entry when full.
+
+        Args:
+            text: The paragraph text
+            result: The result to remember (not None)
+        """
+        if len(text) > self.max_length:
+            return
+        with self._lock:
+            self._entries[text] = result
+            self._entries.move_to_end(text)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def memoize(self, func):
+        """
+        Wrap a function of one text argument so its results come from the cache.
+
+        Args:
+            func: Function taking a paragraph text
+
+        Returns:
+            The wrapped function
+        """
+        def cached(text):
+            result = self.get(text)
+            if result is None:
+                result = func(text)
+                self.put(text, result)
+            return result
+        cached.cache = self
+        return cached
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+def log_cache_stats(name, hits, misses):
+    """
+    Write a cache hit rate to the performance log.
+
+    Args:
+        name: Name of the cached operation
+        hits: Number of lookups answered from the cache
+        misses: Number of lookups that were computed
+    """
+    lookups = hits + misses
+    hit_rate = hits / lookups * 100 if lookups else 0.0
+    logging.getLogger("performance").info(
+        f"Cache: {name}, Hits: {hits}/{lookups} ({hit_rate:.1f}%)"
+    )
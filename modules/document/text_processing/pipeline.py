@@ -0,0 +1,217 @@
+
+"""
+Text Pipeline Module
+
+This module provides TextPipeline, which runs a declared sequence of text
+stages. Adjacent stages that can be combined are fused when the pipeline is
+built (translate tables are merged, repeated normalization forms collapse),
+stages can be gated on a substring so they are skipped when they cannot
+apply, and Unicode normalization is skipped for text that is already
+normalized. Each stage records its cumulative time, calls and hits (calls
+that changed the text), either on the pipeline or in a statistics record
+the caller passes in, so a shared pipeline can be used from several threads.
+"""
+
+import time
+import unicodedata
+
+class Stage:
+    """
+    A named text transformation
+
+    Attributes:
+        name: Stage name used in statistics
+        func: Callable taking and returning a string
+        requires: Optional substring; the stage is skipped for text without it
+    """
+
+    def __init__(self, name, func, requires=None):
+        self.name = name
+        self.func = func
+        self.requires = requires
+
+    def fuse(self, other):
+        """Return a single stage doing the work of self then other, or None."""
+        return None
+
+class TranslateStage(Stage):
+    """
+    A str.translate stage; adjacent translate stages merge into one table
+    """
+
+    def __init__(self, name, table):
+        self.table = {
+            (ord(key) if isinstance(key, str) else key): value
+            for key, value in table.items()
+        }
+        super().__init__(name, self._translate)
+
+    def _translate(self, text):
+        return text.translate(self.table)
+
+    def fuse(self, other):
+        if not isinstance(other, TranslateStage):
+            return None
+        # Run each output of the first table through the second table
+        merged = {}
+        for key, value in self.table.items():
+            if value is None:
+                merged[key] = None
+            else:
+                value = chr(value) if isinstance(value, int) else value
+                merged[key] = value.translate(other.table)
+        for key, value in other.table.items():
+            merged.setdefault(key, value)
+        return TranslateStage(f"{self.name}+{other.name}", merged)
+
+class NormalizeStage(Stage):
+    """
+    A Unicode normalization stage that skips already normalized text
+    """
+
+    def __init__(self, form='NFKD', name=None):
+        self.form = form
+        super().__init__(name or form.lower(), self._normalize)
+
+    def _normalize(self, text):
+        # ASCII text is unchanged by every normalization form
+        if text.isascii() or unicodedata.is_normalized(self.form, text):
+            return text
+        return unicodedata.normalize(self.form, text)
+
+    def fuse(self, other):
+        if isinstance(other, NormalizeStage) and other.form == self.form:
+            return self
+        return None
+
+class TextPipeline:
+    """
+    Fused sequence of text stages with per-stage statistics
+    """
+
+    def __init__(self, stages):
+        """
+        Build the pipeline, fusing adjacent compatible stages
+
+        Args:
+            stages: Iterable of Stage objects, in the order they run
+        """
+        fused = []
+        for stage in stages:
+            # Gated stages keep their own gate, so they are never fused
+            combined = None
+            if fused and fused[-1].requires is None and stage.requires is None:
+                combined = fused[-1].fuse(stage)
+            if combined is not None:
+                fused[-1] = combined
+            else:
+                fused.append(stage)
+        self.stages = fused
+        self.reset_stats()
+
+    def new_stats(self):
+        """Return an empty statistics record, for callers that keep their own."""
+        return {stage.name: [0, 0, 0.0] for stage in self.stages}
+
+    def reset_stats(self):
+        """Clear the pipeline's own per-stage statistics."""
+        self._stats = self.new_stats()
+
+    def process(self, text, stats=None):
+        """
+        Run text through every stage.
+
+        Args:
+            text: The text to process
+            stats: Statistics record from new_stats() to update, or None for the pipeline's own
+
+        Returns:
+            The processed text
+        """
+        stats = self._stats if stats is None else stats
+        clock = time.perf_counter
+        for stage in self.stages:
+            if stage.requires is not None and stage.requires not in text:
+                continue
+            started = clock()
+            new_text = stage.func(text)
+            stage_stats = stats[stage.name]
+            stage_stats[2] += clock() - started
+            stage_stats[0] += 1
+            if new_text is not text and new_text != text:
+                stage_stats[1] += 1
+                text = new_text
+        return text
+
+    def process_batch(self, texts, stats=None):
+        """
+        Run a list of texts through every stage, one stage at a time.
+
+        Running stage by stage keeps the per-text overhead to a list
+        comprehension and times each stage once per batch.
+
+        Args:
+            texts: List of texts to process
+            stats: Statistics record from new_stats() to update, or None for the pipeline's own
+
+        Returns:
+            list: The processed texts, in order
+        """
+        stats = self._stats if stats is None else stats
+        clock = time.perf_counter
+        for stage in self.stages:
+            func = stage.func
+            requires = stage.requires
+            started = clock()
+            if requires is None:
+                new_texts = [func(text) for text in texts]
+                calls = len(texts)
+            else:
+                new_texts = [func(text) if requires in text else text for text in texts]
+                calls = sum(1 for text in texts if requires in text)
+            stage_stats = stats[stage.name]
+            stage_stats[2] += clock() - started
+            stage_stats[0] += calls
+            stage_stats[1] += sum(1 for old, new in zip(texts, new_texts) if old is not new and old != new)
+            texts = new_texts
+        return texts
+
+    def stats(self, stats=None):
+        """
+        Return the per-stage statistics.
+
+        Args:
+            stats: Statistics record from new_stats() to report, or None for the pipeline's own
+
+        Returns:
+            dict: stage name -> {'calls', 'hits', 'seconds'}, in stage order
+        """
+        stats = self._stats if stats is None else stats
+        return {
+            name: {'calls': calls, 'hits': hits, 'seconds': seconds}
+            for name, (calls, hits, seconds) in stats.items()
+        }
+
+def merge_stats(total, stats):
+    """
+    Add pipeline statistics into a running total.
+
+    Args:
+        total: dict to accumulate into, in the format returned by stats()
+        stats: Statistics to add
+
+    Returns:
+        The updated total
+    """
+    for name, values in stats.items():
+        entry = total.setdefault(name, {'calls': 0, 'hits': 0, 'seconds': 0.0})
+        for key in ('calls', 'hits', 'seconds'):
+            entry[key] += values[key]
+    return total
+
+def format_stats(stats):
+    """Format pipeline statistics as a single log line."""
+    return ", ".join(
+        f"{name} {values['seconds']:.3f}s ({values['hits']}/{values['calls']} changed)"
+        for name, values in stats.items()
+    )
@@ -47,3 +47,32 @@ def get_character_replacements():
         '\u2248': '~',  # Almost equal to
         '\u00b1': '+/-',# Plus-minus sign
     }
+
+# Characters a UTF-8 continuation byte (0x80-0xBF) turns into when UTF-8 text
+# is read as Latin-1 or cp1252
+UTF8_CONTINUATION_CHARACTERS = ''.join(sorted(
+    set(bytes(range(0x80, 0xC0)).decode('latin-1')) |
+    set(bytes(range(0x80, 0xC0)).decode('cp1252', errors='ignore'))
+))
+
+def get_sequence_replacements():
+    """Return (sequence, replacement) pairs for common encoding problems."""
+    return [
+        ('�', ''),             # Remove replacement character
+        # Common UTF-8 over Latin-1 issue: a stray 'Â' lead byte before a
+        # continuation character, or before the space a no-break space often
+        # became. A bare 'Â' is a real letter ("CHÂTEAU") and is kept
+        *[('Â' + char, char) for char in UTF8_CONTINUATION_CHARACTERS + ' '],
+        ('\x00', ''),          # Null bytes
+        ('\r\n', '\n'),        # Normalize line endings
+        ('\r', '\n'),          # Convert CR to LF
+        ('��', "'"),           # Common apostrophe issue
+        ('â€™', "'"),          # Smartquote as UTF-8 bytes interpreted as Latin-1
+        ('â€œ', '"'),          # Left double quote
+        ('â€', '"'),           # Right double quote
+        ('Ã©', 'é'),           # Common Latin-1/UTF-8 mix for é
+        ('Ã¨', 'è'),           # Common Latin-1/UTF-8 mix for è
+        ('Ã\xa0', 'à'),        # Common Latin-1/UTF-8 mix for à ("Ã " is a real word end)
+        ('Ã¢', 'â'),           # Common Latin-1/UTF-8 mix for â
+        ('Ã§', 'ç'),           # Common Latin-1/UTF-8 mix for ç
+    ]
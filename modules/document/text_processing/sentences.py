@@ -0,0 +1,143 @@
+
+"""
+Sentence Segmentation Module
+
+This module splits paragraph text into sentences with one precompiled
+pattern and a single left-to-right scan. Sentences are returned as
+(start, end) offsets into the original text rather than as copies, so
+callers can inspect or patch the text in place. A period after a known
+abbreviation ("Mr.", "No.", "Inc."), a single letter ("F.", "Q.") or an
+initialism ("U.S.C.", "a.m.") does not end a sentence, which matters in
+legal text where these are everywhere.
+
+The same segmenter is used for capitalization fixes in the content
+enhancer, the local review statistics and chunking chapter text for AI
+requests. The enhancer's missing-space fix after punctuation skips the same
+abbreviations, so "U.S.C." and "p.m." are not pulled apart.
+"""
+
+import re
+
+# Lowercase abbreviations, without their final period, that do not end a sentence
+ABBREVIATIONS = frozenset({
+    'mr', 'mrs', 'ms', 'messrs', 'dr', 'prof', 'rev', 'hon', 'jr', 'sr', 'esq', 'atty',
+    'gen', 'col', 'lt', 'sgt', 'capt', 'det', 'ofc', 'gov', 'sen', 'rep', 'st', 'ave', 'blvd',
+    'no', 'nos', 'vs', 'etc', 'inc', 'ltd', 'co', 'corp', 'llc', 'dept', 'assn', 'bros',
+    'sec', 'secs', 'art', 'para', 'paras', 'p', 'pp', 'ch', 'cl', 'vol', 'fig', 'ex', 'exh',
+    'cf', 'id', 'ibid', 'al', 'approx', 'supp', 'app', 'cir', 'cert', 'ct', 'ed', 'stat',
+    'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec',
+})
+
+def _abbreviation_lookbehinds():
+    """Negative lookbehinds for a period after an abbreviation, initial or initialism."""
+    by_length = {1: ['[a-z]']}
+    for word in sorted(ABBREVIATIONS):
+        if len(word) > 1:
+            by_length.setdefault(len(word), []).append(re.escape(word))
+    # Lookbehinds need a fixed width, so there is one per abbreviation length
+    lookbehinds = [rf'(?<!\b(?:{"|".join(words)})\.)' for _, words in sorted(by_length.items())]
+    lookbehinds.append(r'(?<!\.[a-z]\.)')
+    return ''.join(lookbehinds)
+
+# Terminal punctuation with any closing quotes or brackets, followed by whitespace.
+# A single period after a word longer than any abbreviation is accepted at
+# once; otherwise it only counts when none of the lookbehinds match, so the
+# whole test runs inside the regex engine.
+_BOUNDARY = re.compile(
+    r'([.?!](?:(?<=[?!])[.?!]*|[.?!]+|'
+    rf'(?<=[a-z]{{{max(map(len, ABBREVIATIONS)) + 1}}}\.)|{_abbreviation_lookbehinds()})'
+    r'[)\]"\'”’]*)\s+',
+    re.IGNORECASE
+)
+
+# Punctuation directly followed by another character that should be spaced
+# off, unless it is a period ending an abbreviation, initial or initialism
+_MISSING_SPACE = re.compile(
+    rf'([!?:;,]|\.{_abbreviation_lookbehinds()})([^\s\d"])',
+    re.IGNORECASE
+)
+
+def space_after_punctuation(text):
+    """
+    Insert a missing space after punctuation.
+
+    Args:
+        text: The text to fix
+
+    Returns:
+        str: The text with a space after each punctuation mark followed by a
+             non-space character other than a digit or double quote, except
+             after abbreviations ("Mr.", "U.S.C.", "p.m.")
+    """
+    return _MISSING_SPACE.sub(r'\1 \2', text)
+
+def iter_sentence_spans(text):
+    """
+    Lazily yield the sentences of a text as offsets.
+
+    Args:
+        text: The text to segment, usually one paragraph
+
+    Yields:
+        tuple: (start, end) of each sentence, excluding surrounding whitespace
+    """
+    start = len(text) - len(text.lstrip())
+    for match in _BOUNDARY.finditer(text, start):
+        yield start, match.end(1)
+        start = match.end()
+
+    end = len(text.rstrip())
+    if start < end:
+        yield start, end
+
+def sentence_spans(text):
+    """Return the (start, end) offsets of the sentences of a text as a list."""
+    return list(iter_sentence_spans(text))
+
+def count_sentences(text):
+    """Count the sentences of a text."""
+    return sum(1 for _ in iter_sentence_spans(text))
+
+def _split_long_text(text, max_chars):
+    """Split a text longer than max_chars into runs of whole sentences."""
+    piece_start = piece_end = None
+    for start, end in iter_sentence_spans(text):
+        if piece_start is None:
+            piece_start = start
+        elif end - piece_start > max_chars:
+            yield text[piece_start:piece_end]
+            piece_start = start
+        piece_end = end
+
+    if piece_start is not None:
+        yield text[piece_start:piece_end]
+
+def chunk_sentences(texts, max_chars):
+    """
+    Pack paragraphs into chunks of at most max_chars characters.
+
+    Paragraphs are kept whole and joined with newlines where possible. A
+    paragraph longer than max_chars is split between sentences; only a
+    single sentence longer than max_chars yields an oversized chunk.
+
+    Args:
+        texts: Iterable of paragraph texts, in order
+        max_chars: Largest chunk size in characters
+
+    Yields:
+        str: Each chunk of text
+    """
+    chunk = []
+    size = 0
+    for text in texts:
+        pieces = [text] if len(text) <= max_chars else _split_long_text(text, max_chars)
+        for piece in pieces:
+            if chunk and size + 1 + len(piece) > max_chars:
+                yield '\n'.join(chunk)
+                chunk = []
+                size = 0
+            size += len(piece) + (1 if chunk else 0)
+            chunk.append(piece)
+
+    if chunk:
+        yield '\n'.join(chunk)
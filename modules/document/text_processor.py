@@ -1,67 +1,160 @@
 
-import unicodedata
-import re
+import os
+import logging
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from modules.document.text_processing.encoding import detect_encoding, normalize_whitespace
-from modules.document.text_processing.replacements import get_character_replacements
-from modules.utils.encoding_utils import contains_encoding_issues
+from modules.document.text_processing.normalizer import get_normalizer
+from modules.document.text_processing.artifacts import get_artifact_matcher
+from modules.document.text_processing.pipeline import (
+    TextPipeline, Stage, NormalizeStage, merge_stats, format_stats
+)
+from modules.document.text_processing.paragraph_cache import ParagraphCache, log_cache_stats
+from modules.document.paragraph_patch import apply_paragraph_text
+from modules.utils.encoding_utils import scan_paragraphs
 
-def fix_text_encoding(app):
+PARAGRAPHS_PER_TASK = 5000  # Paragraphs fixed by one worker task
+PARALLEL_MIN_PARAGRAPHS = 20000  # Smaller documents are fixed in this process
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+_fix_pipeline = None
+
+def get_fix_pipeline():
+    """Return the shared pipeline used to fix paragraph text."""
+    global _fix_pipeline
+    if _fix_pipeline is None:
+        _fix_pipeline = TextPipeline([
+            # Repair mojibake and map special characters
+            Stage('characters', get_normalizer().replace),
+            NormalizeStage('NFKD'),
+            # Fix XML/HTML entities
+            Stage('entities', fix_html_entities, requires='&'),
+            # Remove AI transcription artifacts
+            Stage('artifacts', remove_transcription_artifacts),
+        ])
+    return _fix_pipeline
+
+_fix_cache = None
+
+def get_fix_cache():
+    """Return the shared cache of fixed paragraph texts and replacement counts."""
+    global _fix_cache
+    if _fix_cache is None:
+        _fix_cache = ParagraphCache()
+    return _fix_cache
+
+def fix_paragraph_batch(start, texts):
+    """
+    Run the encoding fix pipeline over a batch of paragraph texts.
+
+    Runs in worker processes, so it takes and returns plain values and only
+    sends back the paragraphs that changed.
+
+    Args:
+        start: Document index of the first paragraph in the batch
+        texts: List of paragraph texts
+
+    Returns:
+        tuple: (list of (index, new_text) for changed paragraphs,
+                number of characters replaced, whether encoding issues were seen,
+                pipeline stage statistics for the batch, paragraph cache hits
+                and misses for the batch)
+    """
+    normalizer = get_normalizer()
+    pipeline = get_fix_pipeline()
+    stats = pipeline.new_stats()  # Per call, so concurrent batches do not mix statistics
+    cache = get_fix_cache()
+    changes = []
+    replacement_count = 0
+
+    # Check for encoding issues (suspicious patterns of characters) in one pass
+    has_encoding_issues = any(region.has_issues for region in scan_paragraphs(texts))
+
+    # Each distinct text is fixed once: repeats in the batch and texts fixed
+    # in earlier batches come from the cache
+    occurrences = Counter(texts)
+    results = {}
+    pending = []
+    for text in occurrences:
+        cached = cache.get(text)
+        if cached is None:
+            pending.append(text)
+        else:
+            results[text] = cached
+    for text, new_text in zip(pending, pipeline.process_batch(pending, stats)):
+        # Count characters that were replaced
+        result = (new_text, normalizer.count_replacements(text) if new_text != text else 0)
+        results[text] = result
+        # Only repeated lines (headers, speaker labels, boilerplate) are worth keeping
+        if occurrences[text] > 1:
+            cache.put(text, result)
+
+    for offset, original_text in enumerate(texts):
+        new_text, count = results[original_text]
+        if new_text != original_text:
+            replacement_count += count
+            changes.append((start + offset, new_text))
+
+    cache_stats = {'hits': len(texts) - len(pending), 'misses': len(pending)}
+    return changes, replacement_count, has_encoding_issues, pipeline.stats(stats), cache_stats
+
+def _iter_fix_batches(texts, paragraphs_per_task, max_workers):
+    """Yield fix_paragraph_batch results, fixing in parallel when worthwhile."""
+    starts = list(range(0, len(texts), paragraphs_per_task))
+    done = 0
+
+    if len(texts) >= PARALLEL_MIN_PARAGRAPHS and len(starts) > 1:
+        workers = min(max_workers or os.cpu_count() or 1, len(starts))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for result in executor.map(
+                    fix_paragraph_batch,
+                    starts,
+                    [texts[start:start + paragraphs_per_task] for start in starts]
+                ):
+                    done += 1
+                    yield result
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning(
+                f"Parallel encoding repair stopped after {done} of {len(starts)} batches, "
+                f"continuing serially: {str(e)}"
+            )
+
+    # Serial fixing for small documents, or the batches a failed pool left over
+    for start in starts[done:]:
+        yield fix_paragraph_batch(start, texts[start:start + paragraphs_per_task])
+
+def fix_text_encoding(app, paragraphs_per_task=PARAGRAPHS_PER_TASK, max_workers=None):
     app.log.info("Fixing text encoding issues...")
     
-    # Get character replacements
-    replacements = get_character_replacements()
-    
     # Count of replacements made
     replacement_count = 0
     has_encoding_issues = False
     
-    # Process each paragraph in the document
-    for para in app.docx_content.paragraphs:
-        original_text = para.text
-        
-        # Check for encoding issues (suspicious patterns of characters)
-        if contains_encoding_issues(original_text):
-            has_encoding_issues = True
-            
-        # Apply aggressive encoding fixes
-        new_text = original_text
-        
-        # Apply all basic replacements
-        for char, replacement in replacements.items():
-            if char in new_text:
-                new_text = new_text.replace(char, replacement)
-        
-        # Use unicodedata to normalize text
-        new_text = unicodedata.normalize('NFKD', new_text)
-        
-        # Additional encoding fixes for common issues
-        new_text = fix_common_encoding_issues(new_text)
-        
-        # Fix XML/HTML entities
-        new_text = fix_html_entities(new_text)
-        
-        # Remove AI transcription artifacts
-        new_text = remove_transcription_artifacts(new_text)
+    # Ship the paragraph texts to the fix pipeline, in worker processes for
+    # large documents, and get back only the paragraphs that changed
+    paragraphs = app.docx_content.paragraphs
+    texts = [para.text for para in paragraphs]
+    
+    stage_stats = {}
+    cache_hits = cache_misses = 0
+    for changes, batch_replacements, batch_issues, batch_stats, batch_cache in _iter_fix_batches(
+            texts, paragraphs_per_task, max_workers):
+        replacement_count += batch_replacements
+        has_encoding_issues = has_encoding_issues or batch_issues
+        merge_stats(stage_stats, batch_stats)
+        cache_hits += batch_cache['hits']
+        cache_misses += batch_cache['misses']
         
-        # If changes were made, update the paragraph text
-        if new_text != original_text:
-            # Count characters that were replaced
-            for char in replacements:
-                replacement_count += original_text.count(char)
-            
-            # Update paragraph text
-            for run in para.runs:
-                run_text = run.text
-                for char, replacement in replacements.items():
-                    if char in run_text:
-                        run_text = run_text.replace(char, replacement)
-                
-                # Normalize run text
-                run_text = unicodedata.normalize('NFKD', run_text)
-                run_text = fix_common_encoding_issues(run_text)
-                run_text = fix_html_entities(run_text)
-                run_text = remove_transcription_artifacts(run_text)
-                run.text = run_text
+        # Write the fixed text back, touching only the runs that changed
+        for index, new_text in changes:
+            apply_paragraph_text(paragraphs[index], new_text)
+    
+    logger.debug(f"Encoding fix stages: {format_stats(stage_stats)}")
+    log_cache_stats("fix_text_encoding", cache_hits, cache_misses)
     
     # Log fix results
     if has_encoding_issues:
@@ -73,34 +166,15 @@ def fix_text_encoding(app):
 
 def fix_common_encoding_issues(text):
     """Fix common encoding issues"""
-    # Replace common problematic sequences
-    replacements = [
-        ('�', ''),             # Remove replacement character
-        ('Â', ''),             # Common UTF-8 over Latin-1 issue
-        ('\x00', ''),          # Null bytes
-        ('\r\n', '\n'),        # Normalize line endings
-        ('\r', '\n'),          # Convert CR to LF
-        ('��', "'"),           # Common apostrophe issue
-        ('â€™', "'"),          # Smartquote as UTF-8 bytes interpreted as Latin-1
-        ('â€œ', '"'),          # Left double quote
-        ('â€', '"'),           # Right double quote
-        ('Ã©', 'é'),           # Common Latin-1/UTF-8 mix for é
-        ('Ã¨', 'è'),           # Common Latin-1/UTF-8 mix for è
-        ('Ã ', 'à'),           # Common Latin-1/UTF-8 mix for à
-        ('Ã¢', 'â'),           # Common Latin-1/UTF-8 mix for â
-        ('Ã§', 'ç'),           # Common Latin-1/UTF-8 mix for ç
-    ]
-    
-    for bad, good in replacements:
-        text = text.replace(bad, good)
-    
-    # Remove control characters
-    text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text)
-    
-    return text
+    # Mojibake sequences, line endings and control characters, in one pass
+    return get_normalizer().repair(text)
 
 def fix_html_entities(text):
     """Fix HTML/XML entities in text"""
+    # Every entity starts with an ampersand
+    if '&' not in text:
+        return text
+    
     from html import unescape
     
     # Common XML entities
@@ -129,41 +203,8 @@ def fix_html_entities(text):
 
 def remove_transcription_artifacts(text):
     """Removes common AI transcription artifacts like directive lines ending with ¶"""
-    if not text:
-        return text
-        
-    # Common transcription artifact patterns
-    artifact_patterns = [
-        # Paragraphs ending with ¶ or similar symbols
-        r'^[ •]*[\w\s]+·+¶[\s]*$',
-        r'^[ •]*[\w\s].*[¶|]+[\s]*$',
-        
-        # Directive lines with bullet points
-        r'^[ •]*(Ensure|Do not|Use|Avoid|Correct|Incorrect)[\w\s\-\.]+[¶|]+[\s]*$',
-        
-        # Section markers with special symbols
-        r'^[\s]*[⚠️|🚫|⛔|🔴|🟠|🟡|🟢|🔵|🟣|⚪|⚫|✅|❌|⭕|❗|❓|❕|❔|🔺|🔻|🔸|🔹|🔶|🔷|🔘|🔲|🔳|🔈|🔉|🔊|🔇].*[¶|]+[\s]*$',
-        
-        # Common AI instruction patterns
-        r'^(Usage:|Example:|Note:|Important:|Warning:|Caution:|Remember:).*[¶|]+[\s]*$',
-        
-        # Common metadata patterns often included in AI-generated text
-        r'^\[(Timestamp|Time|Speaker|ID|Note)\].*$',
-        
-        # Lines that appear to be formatting instructions
-        r'^[\s]*(Correct vs\. Incorrect).*[¶|]+[\s]*$',
-        r'^[\s]*(Incorrect Usage:).*[¶|]+[\s]*$'
-    ]
-    
-    # Apply all removals - multiline mode
-    result = text
-    for pattern in artifact_patterns:
-        result = re.sub(pattern, '', result, flags=re.MULTILINE)
-    
-    # Clean up any resulting empty lines
-    result = re.sub(r'\n{3,}', '\n\n', result)
-    
-    return result.strip()
+    # Precompiled patterns that only run on candidate lines
+    return get_artifact_matcher().remove(text)
 
 # Re-export these functions so they can be imported from text_processor
 def preprocess_text_file(file_content, file_encoding=None):
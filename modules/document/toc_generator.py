@@ -1,4 +1,6 @@
 
+from modules.document.structure_index import get_chapter_index, FLAG_HEADING
+
 def generate_table_of_contents(app):
     """Generate table of contents from chapters."""
     if not app.generate_toc.get():
@@ -28,16 +30,15 @@ def _process_chapter_for_toc(app, chapter, index):
 
 def _process_subheadings_for_toc(app, chapter, chapter_index):
     """Process subheadings within a chapter for the table of contents."""
-    for para in chapter['content']:
-        if para.style.name.startswith('Heading 2'):
-            app.toc.append({
-                'title': para.text,
-                'level': 2,
-                'index': chapter_index
-            })
-        elif para.style.name.startswith('Heading 3'):
+    index, offset = get_chapter_index(app, chapter)
+    paragraphs = chapter['content']
+    
+    # Level 2 and 3 heading styles become subentries, in document order
+    for position in index.headings_in(offset, offset + len(paragraphs)):
+        level = index.heading_levels[position]
+        if level in (2, 3) and index.flags[position] & FLAG_HEADING:
             app.toc.append({
-                'title': para.text,
-                'level': 3,
+                'title': paragraphs[position - offset].text,
+                'level': level,
                 'index': chapter_index
             })
@@ -8,11 +8,11 @@ This module creates the AI tab interface, composing the various sections
 import tkinter as tk
 from tkinter import ttk
 
-from .sections.api_config import create_api_config
-from .sections.enhancement_options import create_enhancement_options
-from .sections.review_options import create_review_options
+from .sections.api_config import create_api_config_section
+from .sections.enhancement_options import create_enhancement_options_section
+from .sections.review_options import create_review_options_section
 from .sections.action_buttons import create_action_buttons
-from .sections.error_handling import setup_error_handling
+from .sections.error_handling import create_error_handling_section
 
 def create_ai_tab(tab, app):
     """Create the AI enhancement tab"""
@@ -29,22 +29,23 @@ def create_ai_tab(tab, app):
     app.suggest_improvements = tk.BooleanVar(value=True)
     
     # Create AI API configuration section
-    api_frame = create_api_config(tab, app)
+    api_frame = create_api_config_section(tab, app)
     api_frame.pack(fill=tk.X, pady=10)
     
     # Create review options section
-    review_frame = create_review_options(tab, app)
+    review_frame = create_review_options_section(tab, app)
     review_frame.pack(fill=tk.X, pady=10)
     
     # Create enhancement options section
-    enhance_frame = create_enhancement_options(tab, app)
+    enhance_frame = create_enhancement_options_section(tab, app)
     enhance_frame.pack(fill=tk.X, pady=10)
     
     # Create action buttons section
     button_frame = create_action_buttons(tab, app)
     button_frame.pack(fill=tk.X, pady=10)
     
-    # Setup error handling and validation
-    setup_error_handling(app)
+    # Create error handling options section
+    error_frame = create_error_handling_section(tab, app)
+    error_frame.pack(fill=tk.X, pady=10)
     
     return tab
@@ -14,16 +14,16 @@ Sections:
 - error_handling: Error handling utilities for the AI tab
 """
 
-from .api_config import create_api_config
-from .enhancement_options import create_enhancement_options
-from .review_options import create_review_options
+from .api_config import create_api_config_section
+from .enhancement_options import create_enhancement_options_section
+from .review_options import create_review_options_section
 from .action_buttons import create_action_buttons
-from .error_handling import setup_error_handling
+from .error_handling import create_error_handling_section
 
 __all__ = [
-    'create_api_config',
-    'create_enhancement_options',
-    'create_review_options',
+    'create_api_config_section',
+    'create_enhancement_options_section',
+    'create_review_options_section',
     'create_action_buttons',
-    'setup_error_handling'
+    'create_error_handling_section'
 ]
@@ -23,8 +23,9 @@ def add_files(app):
     files = filedialog.askopenfilenames(
         title="Select Input Files",
         filetypes=[
-            ("Document Files", "*.docx *.txt *.md"),
+            ("Document Files", "*.docx *.pdf *.txt *.md"),
             ("Word Documents", "*.docx"),
+            ("PDF Files", "*.pdf"),
             ("Text Files", "*.txt"),
             ("Markdown Files", "*.md"),
             ("All Files", "*.*")
@@ -21,7 +21,7 @@ def browse_input_file(app):
         print("Opening file browser for document files...")
         
         file_paths = filedialog.askopenfilenames(
-            filetypes=[("Document Files", "*.docx *.txt *.md"), ("Word Documents", "*.docx"), ("All Files", "*.*")]
+            filetypes=[("Document Files", "*.docx *.pdf *.txt *.md"), ("Word Documents", "*.docx"), ("PDF Files", "*.pdf"), ("All Files", "*.*")]
         )
         
         if file_paths:
@@ -87,20 +87,16 @@ class DocumentOperationHandler(BaseOperationHandler):
             self.operation_results['process_document'] = None
             
             # Check for encoding issues before processing
-            if hasattr(self.app, 'docx_content'):
-                samples = [p.text for p in self.app.docx_content.paragraphs[:10] if p.text.strip()]
-                for sample in samples:
-                    if self.check_for_encoding_issues(sample):
-                        result = messagebox.askyesno(
-                            "Encoding Issues Detected", 
-                            "Potential encoding issues detected in the document. "
-                            "Text may appear garbled or contain strange characters. "
-                            "Would you like to apply automatic encoding fixes?"
-                        )
-                        if result:
-                            print("Applying automatic encoding fixes...")
-                            self.app.fix_encoding.set(True)
-                        break
+            if hasattr(self.app, 'docx_content') and self.find_encoding_issue_regions(self.app.docx_content):
+                result = messagebox.askyesno(
+                    "Encoding Issues Detected", 
+                    "Potential encoding issues detected in the document. "
+                    "Text may appear garbled or contain strange characters. "
+                    "Would you like to apply automatic encoding fixes?"
+                )
+                if result:
+                    print("Applying automatic encoding fixes...")
+                    self.app.fix_encoding.set(True)
             
             # Import here to avoid circular imports
             from modules.document.document_processor import process_document
@@ -6,7 +6,8 @@ This module provides the base class for all operation handlers with common funct
 """
 
 from modules.utils.error_handler import ErrorHandler
-from modules.utils.encoding_utils import contains_encoding_issues, log_encoding_issues
+from modules.utils.encoding_utils import contains_encoding_issues, log_encoding_issues, scan_paragraphs
+from modules.document.loaders.records import snapshot_document
 import os
 import logging
 import time
@@ -91,6 +92,19 @@ class BaseOperationHandler:
         """
         return contains_encoding_issues(text)
     
+    def find_encoding_issue_regions(self, document) -> list:
+        """
+        Scan a whole document for encoding issues in one pass
+        
+        Args:
+            document: The document object
+            
+        Returns:
+            List of EncodingRegion objects that likely contain encoding issues
+        """
+        texts = [paragraph.text for paragraph in snapshot_document(document).paragraphs]
+        return [region for region in scan_paragraphs(texts) if region.has_issues]
+    
     def get_memory_usage(self) -> float:
         """
         Get current memory usage in MB
@@ -116,6 +130,9 @@ class BaseOperationHandler:
         try:
             if not hasattr(document, 'paragraphs'):
                 return
+            
+            # Read a python-docx paragraph list only once
+            document = snapshot_document(document)
                 
             # Log basic document info
             self.app.log.info(f"Document has {len(document.paragraphs)} paragraphs")
@@ -125,40 +142,20 @@ class BaseOperationHandler:
                 file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
                 self.app.log.info(f"Document file size: {file_size_mb:.2f} MB")
             
-            # Sample a few paragraphs to check for encoding issues
-            # Use limited sampling for better performance
-            paragraph_count = len(document.paragraphs)
-            sample_indices = []
-            
-            if paragraph_count <= 10:
-                # For small documents, check all paragraphs
-                sample_indices = list(range(paragraph_count))
-            else:
-                # For larger documents, check first, last, and some middle paragraphs
-                sample_indices = [0, 1, 2, paragraph_count//4, paragraph_count//2, 
-                                 (3*paragraph_count)//4, paragraph_count-3, 
-                                 paragraph_count-2, paragraph_count-1]
-                # Remove duplicates (important for smaller docs)
-                sample_indices = list(set(sample_indices))
-                # Ensure indices are valid
-                sample_indices = [i for i in sample_indices if 0 <= i < paragraph_count]
-                # Sort for readability in logs
-                sample_indices.sort()
-            
-            # Extract and check samples
-            samples = [document.paragraphs[i].text for i in sample_indices if document.paragraphs[i].text.strip()]
+            # Score the whole document for encoding issues, region by region
+            issue_regions = self.find_encoding_issue_regions(document)
+            has_issues = bool(issue_regions)
             
-            # Check samples for encoding issues
-            has_issues = False
-            for i, sample in enumerate(samples):
-                if contains_encoding_issues(sample):
-                    has_issues = True
-                    self.app.log.warning(f"Encoding issues detected in paragraph {sample_indices[i]}")
-                    log_encoding_issues(sample, file_path, self.encoding_logger)
-                    # Only log a limited number of issues to avoid performance problems
-                    if i >= 2:  # Log at most 3 examples
-                        self.app.log.warning(f"More encoding issues may exist. See log for details.")
-                        break
+            # Only log a limited number of regions to keep the log readable
+            for region in issue_regions[:3]:
+                self.app.log.warning(
+                    f"Encoding issues detected in paragraphs {region.start}-{region.stop - 1} "
+                    f"(score {region.score:.1f})"
+                )
+                sample = "\n".join(para.text for para in document.paragraphs[region.start:region.stop])
+                log_encoding_issues(sample, file_path, self.encoding_logger)
+            if len(issue_regions) > 3:
+                self.app.log.warning(f"Encoding issues found in {len(issue_regions)} regions. See log for details.")
             
             if has_issues:
                 print("WARNING: Encoding issues detected in document. See 'Logs/encoding_issues.log' for details.")
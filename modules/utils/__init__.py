@@ -11,14 +11,15 @@ Modules:
 """
 
 from .error_handler import ErrorHandler
-from .security_utils import validate_file_path, secure_filename
-from .encoding_utils import contains_encoding_issues, log_encoding_issues
+from .security_utils import sanitize_filename, sanitize_filename_and_path
+from .encoding_utils import contains_encoding_issues, log_encoding_issues, scan_paragraphs
 
 __all__ = [
     'ErrorHandler',
-    'validate_file_path',
-    'secure_filename',
+    'sanitize_filename',
+    'sanitize_filename_and_path',
     'contains_encoding_issues',
-    'log_encoding_issues'
+    'log_encoding_issues',
+    'scan_paragraphs'
 ]
 
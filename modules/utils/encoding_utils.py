@@ -11,6 +11,177 @@ import logging
 # Set up logger for this module
 logger = logging.getLogger(__name__)
 
+REGION_SIZE = 4096  # Characters of text scored together in a document scan
+NON_PRINTABLE_THRESHOLD = 0.15  # Fraction of non-printable characters that flags a region
+MIN_SCORED_LENGTH = 20  # Regions shorter than this are not judged by the fraction
+
+_CONTROL = r'\x01-\x08\x0B\x0C\x0E-\x1F\x7F'
+_SPECIAL = r'\\/@#$%^&*+='
+
+# cp1252 characters that UTF-8 continuation bytes turn into when misread
+_CONTINUATION = (r'\u0080-¿ŒœŠšŸŽžƒˆ˜'
+                 r'–—‘-„†-•…‰‹›€™')
+
+# Suspicious patterns as (kind, first character class, rest of the match),
+# in the order they are tried at each position
+ISSUE_PATTERNS = [
+    ('binary', r'\x00', ''),                                               # Binary data
+    ('control', f'[{_CONTROL}]', f'[{_CONTROL}]{{2,}}'),                   # Control characters
+    ('mojibake', r'[ÂÃâ]',
+     f'(?:(?<=[\\u00c2\\u00c3])[{_CONTINUATION}]|(?<=\\u00e2)\\u20ac.)'),   # UTF-8 read as cp1252
+    ('high_ascii', r'[\xC0-\xFF]', r'[\xC0-\xFF]{2,}'),                    # High ASCII chars in sequence
+    ('question', r'\?', r'\?{2,}'),                                        # Multiple question marks
+    ('replacement', r'�', r'�+'),                                # Unicode replacement chars
+    ('brackets', r'[\]\[)(]', r'(?:(?<=\])\]{2,}|(?<=\[)\[{2,}|(?<=\))\){2,}|(?<=\()\({2,})'),  # Multiple brackets in sequence
+    ('special', f'[{_SPECIAL}]', f'[{_SPECIAL}]{{3,}}'),                   # Repeated special chars
+]
+
+# Kinds whose matched characters count as non-printable
+_NON_PRINTABLE_KINDS = frozenset(['binary', 'control', 'non_printable'])
+
+class EncodingRegion:
+    """
+    Encoding issue counts for a run of consecutive paragraphs
+
+    Attributes:
+        start: Index of the first paragraph in the region
+        stop: Index one past the last paragraph in the region
+        length: Number of characters scanned
+        counts: dict of issue kind -> number of matches, plus 'non_printable'
+                characters
+    """
+
+    __slots__ = ('start', 'stop', 'length', 'counts')
+
+    def __init__(self, start, stop, length):
+        self.start = start
+        self.stop = stop
+        self.length = length
+        self.counts = {}
+
+    @property
+    def non_printable_ratio(self):
+        """Fraction of the scanned characters that are non-printable."""
+        return self.counts.get('non_printable', 0) / self.length if self.length else 0.0
+
+    @property
+    def score(self):
+        """Suspicious matches and non-printable characters per 1,000 characters."""
+        return 1000 * sum(self.counts.values()) / self.length if self.length else 0.0
+
+    @property
+    def has_issues(self):
+        """Whether the region likely contains encoding issues."""
+        if any(kind != 'non_printable' for kind in self.counts):
+            return True
+        return self.length > MIN_SCORED_LENGTH and self.non_printable_ratio > NON_PRINTABLE_THRESHOLD
+
+    def __repr__(self):
+        return f"EncodingRegion(paragraphs {self.start}-{self.stop}, score={self.score:.2f}, counts={self.counts})"
+
+def _non_printable_ranges():
+    """Build regex class ranges of the non-printable, non-whitespace characters above U+001F."""
+    ranges = []
+    for code in range(0x10000):
+        char = chr(code)
+        if char.isprintable() or char.isspace() or code <= 0x1F or code == 0x7F:
+            continue
+        if ranges and ranges[-1][1] == code - 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    # Supplementary private use planes
+    ranges.append([0xF0000, 0x10FFFF])
+    return ''.join(
+        f'\\U{low:08x}' if low == high else f'\\U{low:08x}-\\U{high:08x}'
+        for low, high in ranges
+    )
+
+_issue_pattern = None
+
+def _get_issue_pattern():
+    """
+    Return the combined issue pattern, compiled on first use.
+
+    The pattern starts with a plain class of every character a match can
+    start with, which lets the regex engine skip clean text quickly, and a
+    lookbehind then picks the kind of match.
+    """
+    global _issue_pattern
+    if _issue_pattern is None:
+        # Other control and non-printable characters are counted on their own
+        non_printable = '[\\x01-\\x08\\x0E-\\x1B\\x7F' + _non_printable_ranges() + ']'
+        patterns = ISSUE_PATTERNS + [('non_printable', non_printable, non_printable + '*')]
+
+        leads = '|'.join(first for _, first, _ in patterns)
+        kinds = '|'.join(f'(?<={first})(?P<{kind}>{rest})' for kind, first, rest in patterns)
+        _issue_pattern = re.compile(f'(?:{leads})(?:{kinds})')
+    return _issue_pattern
+
+def scan_paragraphs(texts, region_size=REGION_SIZE):
+    """
+    Score paragraph texts for encoding issues in a single pass.
+
+    The texts are joined and searched once with a combined pattern of all
+    suspicious sequences and non-printable characters. Matches are tallied
+    per region of consecutive paragraphs holding about region_size
+    characters, so callers can see where in a document the issues are.
+
+    Args:
+        texts: Sequence of paragraph texts
+        region_size: Approximate number of characters per region
+
+    Returns:
+        list: EncodingRegion objects covering all paragraphs, in order
+    """
+    regions = []
+    region_offsets = []
+    offset = 0
+    region_start = 0
+    region_offset = 0
+    region_length = 0
+
+    for index, text in enumerate(texts):
+        region_length += len(text) + 1
+        if region_length >= region_size:
+            regions.append(EncodingRegion(region_start, index + 1, region_length - 1))
+            region_offsets.append(region_offset)
+            region_start = index + 1
+            region_offset = offset + len(text) + 1
+            region_length = 0
+        offset += len(text) + 1
+    if region_start < len(texts):
+        regions.append(EncodingRegion(region_start, len(texts), region_length - 1))
+        region_offsets.append(region_offset)
+
+    # Newlines between paragraphs break every pattern, so matches stay
+    # inside their paragraph
+    joined = '\n'.join(texts)
+    region_index = 0
+    for match in _get_issue_pattern().finditer(joined):
+        while region_index + 1 < len(region_offsets) and region_offsets[region_index + 1] <= match.start():
+            region_index += 1
+        counts = regions[region_index].counts
+        kind = match.lastgroup
+        if kind in _NON_PRINTABLE_KINDS:
+            counts['non_printable'] = counts.get('non_printable', 0) + match.end() - match.start()
+        if kind != 'non_printable':
+            counts[kind] = counts.get(kind, 0) + 1
+
+    return regions
+
+def scan_text(text):
+    """
+    Score a single text for encoding issues.
+
+    Args:
+        text: The text string to check
+
+    Returns:
+        EncodingRegion: The counts for the whole text
+    """
+    return scan_paragraphs([text], region_size=len(text) + 1)[0]
+
 def contains_encoding_issues(text):
     """
     Detect if text likely contains encoding issues
@@ -24,34 +195,10 @@ def contains_encoding_issues(text):
     # Early return for empty or very short text
     if not text or len(text) < 5:
         return False
-        
-    # Pattern for suspicious sequences of symbols that might indicate encoding issues
-    suspicious_patterns = [
-        r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]{3,}',  # Control characters
-        r'[\xC0-\xFF]{3,}',                       # High ASCII chars in sequence
-        r'(\?{3,})',                              # Multiple question marks
-        r'(�{2,})',                               # Unicode replacement chars
-        r'(\]{3,}|\[{3,}|\){3,}|\({3,})',         # Multiple brackets in sequence
-        r'([\\/@#$%^&*+=]{4,})'                   # Repeated special chars
-    ]
-    
-    # Check for quick binary data detection
-    if '\x00' in text:
-        logger.debug("Binary data detected in text content")
-        return True
-    
-    # Check for patterns
-    for pattern in suspicious_patterns:
-        if re.search(pattern, text):
-            logger.debug(f"Suspicious encoding pattern detected: {pattern}")
-            return True
-    
-    # Count non-printable characters
-    non_printable = sum(1 for c in text if not c.isprintable() and not c.isspace())
     
-    # If more than 15% of the text is non-printable, suspect encoding issues
-    if len(text) > 20 and non_printable / len(text) > 0.15:
-        logger.debug(f"High percentage of non-printable characters: {non_printable/len(text)*100:.2f}%")
+    region = scan_text(text)
+    if region.has_issues:
+        logger.debug(f"Suspicious encoding patterns detected: {region.counts}")
         return True
     
     return False
@@ -13,9 +13,22 @@ import datetime
 import sys
 from tkinter import messagebox
 
+# Path of this process's log file, once setup_logging() has run
+log_file_path = None
+
 # Configure logger
 def setup_logging():
-    """Set up logging to both console and file"""
+    """
+    Set up logging to both console and file
+    
+    Only the first call in a process creates a log file; later calls return
+    its path. Nothing is set up on import, so worker processes that import
+    the application modules do not each start a log file.
+    """
+    global log_file_path
+    if log_file_path is not None:
+        return log_file_path
+    
     # Create logs directory if it doesn't exist
     log_dir = os.path.join(os.getcwd(), "Logs")
     os.makedirs(log_dir, exist_ok=True)
@@ -49,10 +62,9 @@ def setup_logging():
     logging.info(f"Logs are being saved to: {log_file}")
     print(f"Log file created at: {log_file}")
     
+    log_file_path = log_file
     return log_file
 
-# Initialize logging
-log_file_path = setup_logging()
 logger = logging.getLogger(__name__)
 
 class ErrorHandler:
@@ -0,0 +1,199 @@
+
+import unittest
+import sys
+import os
+import codecs
+import tempfile
+
+# Add the parent directory to the path so we can import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.document.text_processing import encoding as encoding_module
+from modules.document.text_processing.encoding import sniff_encoding, detect_encoding
+from modules.document.text_processing.normalizer import TextNormalizer, get_normalizer
+from modules.document.text_processing.replacements import get_sequence_replacements
+from modules.document.text_processing.mojibake import MojibakeRepairer
+from modules.utils.encoding_utils import contains_encoding_issues, scan_paragraphs, scan_text
+
+class TestSniffEncoding(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_bytes(self, name, data):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_byte_order_marks(self):
+        """Test that byte order marks decide the encoding"""
+        cases = [
+            (codecs.BOM_UTF8 + "Café".encode('utf-8'), 'utf-8-sig'),
+            ("Café".encode('utf-16'), 'utf-16'),
+            ("Café".encode('utf-32'), 'utf-32'),
+        ]
+        for data, expected in cases:
+            path = self._write_bytes('bom.txt', data)
+            self.assertEqual(sniff_encoding(path), (expected, 1.0))
+
+    def test_utf8_detected_without_chardet(self):
+        """Test that valid UTF-8 is accepted by strict validation alone"""
+        path = self._write_bytes('utf8.txt', "Q. Did you see the café?\nA. Yes — I did.\n".encode('utf-8') * 50)
+
+        self.assertEqual(sniff_encoding(path), ('utf-8', 1.0))
+
+    def test_utf8_sampled_windows_tolerate_split_characters(self):
+        """Test that windows starting or ending mid-character still validate"""
+        line = "Witness: éè’“” ü\n".encode('utf-8')
+        data = line * ((encoding_module.SNIFF_PREFIX_SIZE * 4) // len(line))
+        path = self._write_bytes('large_utf8.txt', data)
+
+        self.assertEqual(sniff_encoding(path), ('utf-8', 1.0))
+
+    def test_legacy_encoding_found_past_ascii_prefix(self):
+        """Test that non-UTF-8 bytes after a long ASCII prefix are still noticed"""
+        ascii_part = b"Plain ASCII transcript line.\n" * ((encoding_module.SNIFF_PREFIX_SIZE * 2) // 29)
+        legacy_part = "The witness said “naïve café” again.\n".encode('cp1252') * 2000
+        path = self._write_bytes('legacy.txt', ascii_part + legacy_part)
+
+        encoding, _ = sniff_encoding(path)
+
+        self.assertNotEqual(encoding, 'utf-8')
+        self.assertIn("café", legacy_part.decode(encoding))
+
+    def test_detect_encoding_on_bytes(self):
+        """Test that detect_encoding applies the same rules to in-memory bytes"""
+        self.assertEqual(detect_encoding("résumé".encode('utf-8')), ('utf-8', 1.0))
+        self.assertEqual(detect_encoding(codecs.BOM_UTF8 + b"text"), ('utf-8-sig', 1.0))
+
+class TestTextNormalizer(unittest.TestCase):
+    def setUp(self):
+        self.normalizer = get_normalizer()
+
+    def test_clean_ascii_is_returned_unchanged(self):
+        """Test the ASCII fast path returns the same string object"""
+        text = "Q. Where were you on the night of June 5th?"
+        self.assertIs(self.normalizer.normalize(text), text)
+        self.assertEqual(self.normalizer.count_replacements(text), 0)
+
+    def test_mojibake_is_repaired_before_characters_are_mapped(self):
+        """Test that sequences win over the single characters they contain"""
+        self.assertEqual(self.normalizer.normalize("It isnâ€™t 50€"), "It isn't 50EUR")
+        self.assertEqual(self.normalizer.normalize("Caf\u00c3\u00a9"), "Cafe\u0301")
+
+    def test_special_characters_and_controls(self):
+        """Test character mapping, control characters and line endings"""
+        self.assertEqual(
+            self.normalizer.normalize("“Yes” — sir\x01\r\nNext\rline\x00end"),
+            '"Yes" -- sir\nNext\nlineend'
+        )
+        self.assertEqual(self.normalizer.count_replacements("“Yes” — sir"), 3)
+
+    def test_repair_leaves_typographic_characters(self):
+        """Test that repair only fixes encoding problems"""
+        self.assertEqual(self.normalizer.repair("“Yes” Ã© Â\xa0\t"), "“Yes” é \xa0\t")
+
+    def test_accented_capitals_are_kept(self):
+        """Test that letters which look like mojibake lead bytes survive outside mojibake"""
+        import unicodedata
+        from modules.document.text_processor import get_fix_pipeline
+
+        for text in ["CHÂTEAU", "L'ÂME ÂGÉE", "IRMÃ E", "MÃE"]:
+            self.assertEqual(self.normalizer.repair(text), text)
+            self.assertEqual(get_fix_pipeline().process(text), unicodedata.normalize('NFKD', text))
+        self.assertEqual(self.normalizer.repair("costs Â£5, voilÃ\xa0"), "costs £5, voilà")
+
+    def test_longest_sequence_wins(self):
+        """Test that overlapping sequences resolve to the longest match"""
+        normalizer = TextNormalizer({'b': 'B'}, [('abc', '2'), ('ab', '1')])
+        self.assertEqual(normalizer.normalize("abc ab b"), "2 1 B")
+
+    def test_sequences_match_in_order_replacement(self):
+        """Test parity with replacing the sequence rules one after another"""
+        def legacy_repair(text):
+            for bad, good in get_sequence_replacements():
+                text = text.replace(bad, good)
+            return text
+
+        # '\ufffd' is removed before the two-character apostrophe rule can match
+        self.assertEqual(self.normalizer.repair("it\ufffd\ufffds"), "its")
+        self.assertEqual(self.normalizer.repair("null\x00byte"), "nullbyte")
+        for text in ["it\ufffd\ufffds", "a\x00b\r\nc\rd", "donâ€™t â€œquoteâ€", "Ã© Ã¨ Ã¢ Ã§"]:
+            self.assertEqual(self.normalizer.repair(text), legacy_repair(text), repr(text))
+
+class TestEncodingIssueDetector(unittest.TestCase):
+    def test_issue_kinds(self):
+        """Test that each suspicious pattern is counted under its kind"""
+        cases = [
+            ("Text with â€™ encoding issues", 'mojibake'),
+            ("Caf\u00c3\u00a9 au lait", 'mojibake'),
+            ("Data\x00here", 'binary'),
+            ("Lost ????? chars", 'question'),
+            ("Broken \ufffd\ufffd text", 'replacement'),
+            ("Path ////// here", 'special'),
+        ]
+        for text, kind in cases:
+            self.assertTrue(contains_encoding_issues(text), text)
+            self.assertIn(kind, scan_text(text).counts)
+
+    def test_clean_text_has_no_issues(self):
+        """Test that accented and typographic text is not flagged"""
+        for text in ["Normal text", "Déjà vu, “quoted” — âge", "Q. Where? A. Here."]:
+            self.assertFalse(contains_encoding_issues(text), text)
+
+    def test_non_printable_ratio(self):
+        """Test the non-printable character threshold"""
+        self.assertTrue(contains_encoding_issues("\u200b" * 10 + "a" * 20))
+        self.assertFalse(contains_encoding_issues("\u200b" + "a" * 40))
+
+    def test_regions_locate_issues(self):
+        """Test that document scans report which paragraphs hold the issues"""
+        texts = ["Clean transcript paragraph number %d." % i for i in range(1000)]
+        texts[700] = "It isnâ€™t right"
+
+        regions = scan_paragraphs(texts, region_size=1000)
+        flagged = [region for region in regions if region.has_issues]
+
+        self.assertEqual(regions[0].start, 0)
+        self.assertEqual(regions[-1].stop, len(texts))
+        self.assertTrue(all(a.stop == b.start for a, b in zip(regions, regions[1:])))
+        self.assertEqual(len(flagged), 1)
+        self.assertTrue(flagged[0].start <= 700 < flagged[0].stop)
+        self.assertGreater(flagged[0].score, 0)
+
+class TestMojibakeRepairer(unittest.TestCase):
+    def test_round_trip_repairs(self):
+        """Test that cp1252 and Latin-1 misreads of UTF-8 are decoded back"""
+        repairer = MojibakeRepairer()
+        cases = [
+            ("CafÃ© â€” done â€¦", "Café — done …"),
+            ("Se\u00c3\u00b1or M\u00c3\u00bcller", "Señor Müller"),
+            ("It isnÃ¢â‚¬â„¢t twice", "It isn’t twice"),
+            ("Latin-1 \u00c3\u0089", "Latin-1 É"),
+        ]
+        for broken, expected in cases:
+            self.assertEqual(repairer.repair(broken), expected)
+
+    def test_clean_text_is_left_alone(self):
+        """Test that accented capitals before curly quotes are not repaired"""
+        repairer = MojibakeRepairer()
+        for text in ["“CAFÉ”", "Déjà vu — naïve", "plain ascii"]:
+            self.assertIs(repairer.repair(text), text)
+
+    def test_overrides_and_cache(self):
+        """Test that overrides win over the round trip and repairs are memoized"""
+        repairer = MojibakeRepairer({'â€™': "'"})
+        for _ in range(3):
+            self.assertEqual(repairer.repair("isnâ€™t Ã©"), "isn't é")
+        self.assertEqual(repairer.cache_info().misses, 2)
+        self.assertEqual(repairer.cache_info().hits, 4)
+
+    def test_normalizer_repairs_before_sequence_table(self):
+        """Test that the truncated quote rule no longer splits other sequences"""
+        self.assertEqual(get_normalizer().repair("Yes â€” no"), "Yes — no")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,709 @@
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the parent directory to the path so we can import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from docx import Document
+from modules.document.loaders.text_loader import iter_text_paragraphs, iter_text_paragraphs_mmap
+from modules.document.loaders.reflow import estimate_wrap_width, reflow_lines
+from modules.document.loaders.docx_loader import iter_docx_paragraphs
+from modules.document.loaders.html_loader import iter_html_blocks, parse_html_blocks
+from modules.document.loaders.markdown_loader import MarkdownBlockParser, iter_markdown_blocks, parse_markdown_blocks
+from modules.document.loaders.pdf_loader import iter_pdf_paragraphs
+from modules.document.loaders.records import ParagraphRecord, DocumentModel, DocumentSnapshot, snapshot_document
+from modules.document.loaders.styles import StyleCache, get_style_cache, style_heading_level
+from modules.document.format_handler import extract_chapters_from_headings
+from modules.document.structure_index import (
+    StructureIndex, FLAG_HEADING, FLAG_TITLE, FLAG_BLANK, FLAG_CHAPTER_START, FLAG_CHAPTER_HEADING
+)
+from modules.document.text_processing.format_processors import validate_file_content, validate_file_stream
+from modules.utils.security_utils import (
+    SAFE_ATTRIBUTES, SAFE_TAGS, get_html_cleaner, iter_html_chunks, sanitize_html
+)
+
+class TestTextLoader(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_file(self, name, content, encoding='utf-8'):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'w', encoding=encoding, newline='') as f:
+            f.write(content)
+        return path
+
+    def test_iter_text_paragraphs_skips_empty_lines(self):
+        """Test that blank lines are dropped and line endings are normalized"""
+        path = self._write_file('sample.txt', "First line\r\n\r\n   \nSecond line\nLast line")
+
+        self.assertEqual(
+            list(iter_text_paragraphs(path)),
+            ["First line", "Second line", "Last line"]
+        )
+
+    def test_iter_text_paragraphs_carries_lines_across_chunks(self):
+        """Test that lines split by chunk boundaries are reassembled"""
+        lines = [f"Q. Line number {i} of the transcript" for i in range(200)]
+        path = self._write_file('large.txt', '\n'.join(lines) + '\n')
+
+        # A tiny chunk size forces most lines to span several chunks
+        for chunk_size in (1, 7, 64):
+            self.assertEqual(list(iter_text_paragraphs(path, read_chunk_size=chunk_size)), lines)
+
+    def test_iter_text_paragraphs_progress_counts_bytes(self):
+        """Test that progress reaches the end of multi-byte files, measured in bytes"""
+        from unittest.mock import MagicMock
+        lines = [f"Q. Où étiez-vous le {i} juin ?" for i in range(5000)]
+        path = self._write_file('utf16.txt', '\n'.join(lines), encoding='utf-16')
+        app = MagicMock()
+
+        self.assertEqual(list(iter_text_paragraphs(path, app, read_chunk_size=4096, encoding='utf-16')), lines)
+
+        progress = [call.args[0] for call in app.update_progress.call_args_list]
+        self.assertEqual(progress, sorted(progress))
+        self.assertLess(progress[0], 20)
+        self.assertEqual(progress[-1], 40)
+
+    def test_iter_text_paragraphs_mmap_matches_streaming_loader(self):
+        """Test that the memory-mapped loader yields the same paragraphs"""
+        content = "Le témoin répond\r\n\nQ. Où étiez-vous ?\nA. À la maison — seul.\n" * 50
+        path = self._write_file('mapped.txt', content)
+
+        expected = list(iter_text_paragraphs(path))
+        for window_size in (3, 16, 1024):
+            self.assertEqual(list(iter_text_paragraphs_mmap(path, window_size=window_size)), expected)
+
+    def test_iter_text_paragraphs_mmap_decodes_other_encodings(self):
+        """Test incremental decoding of single-byte and UTF-16 files"""
+        lines = ["Café résumé", "naïve façade"]
+        cp1252_path = self._write_file('cp1252.txt', '\n'.join(lines), encoding='cp1252')
+        utf16_path = self._write_file('utf16.txt', '\n'.join(lines), encoding='utf-16')
+
+        self.assertEqual(list(iter_text_paragraphs_mmap(cp1252_path, window_size=4, encoding='cp1252')), lines)
+        self.assertEqual(list(iter_text_paragraphs_mmap(utf16_path, window_size=4, encoding='utf-16')), lines)
+
+    def test_iter_text_paragraphs_mmap_empty_file(self):
+        """Test that empty files yield nothing"""
+        path = self._write_file('empty.txt', '')
+        self.assertEqual(list(iter_text_paragraphs_mmap(path)), [])
+
+    def test_iter_text_paragraphs_can_keep_empty_lines(self):
+        """Test that both loaders yield the same lines when empty ones are kept"""
+        content = "First line\r\n\r\nSecond line\n\n\nLast line\n" * 20
+        path = self._write_file('blank.txt', content)
+
+        expected = content.replace('\r\n', '\n').split('\n')[:-1]
+        self.assertEqual(list(iter_text_paragraphs(path, read_chunk_size=5, skip_empty=False)), expected)
+        for window_size in (3, 16, 1024):
+            self.assertEqual(
+                list(iter_text_paragraphs_mmap(path, window_size=window_size, skip_empty=False)),
+                expected
+            )
+
+class TestLineReflow(unittest.TestCase):
+    WRAPPED_TRANSCRIPT = (
+        "                    DIRECT EXAMINATION\n"
+        "\n"
+        "BY MR. SMITH:\n"
+        "     Q.   Good morning.  Could you please state your full\n"
+        "name for the record and spell your last name for the\n"
+        "court reporter?\n"
+        "     A.   My name is John Doe, D-O-E.\n"
+        "     Q.   And where were you employed during the month of\n"
+        "June of last year, when the incident described in the com-\n"
+        "plaint took place?\n"
+        "     A.   I was employed at the warehouse on Fifth Street as a\n"
+        "forklift operator, working the second shift most days.\n"
+        "          THE COURT:  Let's take a short recess.\n"
+        "     Q.   Were the safety procedures at the warehouse\n"
+        "well-known to the staff, and were they posted near the\n"
+        "loading docks where the incident happened?\n"
+        "     A.   They were well-\n"
+        "known, yes.\n"
+    ).split('\n')
+
+    def test_reflow_joins_wrapped_lines(self):
+        """Test that wrapped lines become one paragraph per question, answer or label"""
+        self.assertEqual(estimate_wrap_width(self.WRAPPED_TRANSCRIPT), 58)
+        self.assertEqual(list(reflow_lines(self.WRAPPED_TRANSCRIPT)), [
+            "                    DIRECT EXAMINATION",
+            "BY MR. SMITH:",
+            "     Q.   Good morning.  Could you please state your full name for the record "
+            "and spell your last name for the court reporter?",
+            "     A.   My name is John Doe, D-O-E.",
+            "     Q.   And where were you employed during the month of June of last year, "
+            "when the incident described in the complaint took place?",
+            "     A.   I was employed at the warehouse on Fifth Street as a forklift operator, "
+            "working the second shift most days.",
+            "          THE COURT:  Let's take a short recess.",
+            "     Q.   Were the safety procedures at the warehouse well-known to the staff, "
+            "and were they posted near the loading docks where the incident happened?",
+            "     A.   They were well-known, yes.",
+        ])
+
+    def test_reflow_streams_after_the_sample(self):
+        """Test that a small read-ahead sample gives the same paragraphs"""
+        lines = self.WRAPPED_TRANSCRIPT * 3
+        self.assertEqual(list(reflow_lines(lines, sample_size=20)), list(reflow_lines(lines)))
+
+    def test_reflow_leaves_unwrapped_text_alone(self):
+        """Test that text with one paragraph per line passes through unchanged"""
+        lines = [f"Q. Line number {i} of the transcript." for i in range(50)] + ['', 'Last line']
+        self.assertIsNone(estimate_wrap_width(lines))
+        self.assertEqual(list(reflow_lines(lines)), [line for line in lines if line])
+
+class TestDocxLoader(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'sample.docx')
+
+        doc = Document()
+        doc.add_heading('Deposition of John Doe', level=0)
+        doc.add_heading('Chapter 1', level=1)
+        para = doc.add_paragraph('Q. Where were you ')
+        para.add_run('on the night').bold = True
+        para.add_run('?')
+        doc.add_table(rows=1, cols=1).cell(0, 0).text = 'Table text is not a body paragraph'
+        doc.add_paragraph('Exhibit A', style='List Bullet')
+        doc.add_heading('Cross-examination', level=2)
+        doc.save(self.path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_iter_docx_paragraphs_yields_records_in_order(self):
+        """Test that body paragraphs stream out with text, style id and level"""
+        self.assertEqual(list(iter_docx_paragraphs(self.path)), [
+            ParagraphRecord('Deposition of John Doe', 'Title', 0),
+            ParagraphRecord('Chapter 1', 'Heading1', 1),
+            ParagraphRecord('Q. Where were you on the night?', 'Normal', 0),
+            ParagraphRecord('Exhibit A', 'ListBullet', 0),
+            ParagraphRecord('Cross-examination', 'Heading2', 2),
+        ])
+
+    def test_iter_docx_paragraphs_matches_python_docx_text(self):
+        """Test that the streamed text matches python-docx paragraph text"""
+        expected = [para.text for para in Document(self.path).paragraphs]
+        self.assertEqual([record.text for record in iter_docx_paragraphs(self.path)], expected)
+
+    def test_formatting_survives_load_process_save(self):
+        """Test that bold runs and tables of a loaded DOCX are kept through processing and saving"""
+        from unittest.mock import MagicMock, patch
+        from modules.document.loaders.core_loader import load_document
+        from modules.document.text_processor import fix_text_encoding
+
+        doc = Document(self.path)
+        doc.paragraphs[2].runs[0].text = 'Q. Whereâ€™s the car, and where were you '
+        doc.save(self.path)
+
+        app = MagicMock()
+        app.input_file.get.return_value = self.path
+        with patch('modules.document.loaders.core_loader.messagebox'):
+            load_document(app)
+        fix_text_encoding(app)
+
+        output = os.path.join(self.temp_dir.name, 'processed.docx')
+        app.docx_content.save(output)
+        saved = Document(output)
+
+        runs = saved.paragraphs[2].runs
+        self.assertEqual(saved.paragraphs[2].text, "Q. Where's the car, and where were you on the night?")
+        self.assertEqual([run.text for run in runs if run.bold], ['on the night'])
+        self.assertEqual(len(saved.tables), 1)
+        self.assertEqual(saved.tables[0].cell(0, 0).text, 'Table text is not a body paragraph')
+
+def assert_progress_reaches_end(test, iter_blocks, content, name):
+    """Check that a streaming loader reports byte progress up to the end of a UTF-16 file."""
+    from unittest.mock import MagicMock
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, name)
+        with open(path, 'w', encoding='utf-16') as f:
+            f.write(content)
+        app = MagicMock()
+
+        list(iter_blocks(path, app, read_chunk_size=4096, encoding='utf-16'))
+
+    progress = [call.args[0] for call in app.update_progress.call_args_list]
+    test.assertEqual(progress, sorted(progress))
+    test.assertLess(progress[0], 20)
+    test.assertEqual(progress[-1], 40)
+
+class TestHtmlLoader(unittest.TestCase):
+    SAMPLE_HTML = (
+        "<html><head><title>Ignored</title><style>p { color: red; }</style></head><body>"
+        "<h1>Chapter 1</h1><p>First &amp; foremost,\n   the witness.</p>"
+        "<ul><li>Exhibit A</li><li>Exhibit B</li></ul>"
+        "<script>var p = '<p>not text</p>';</script>"
+        "<h2>Section 1.1</h2><p>Unclosed paragraph<p>Next paragraph"
+        "<ol><li>Step one</li></ol></body></html>"
+    )
+
+    def test_parse_html_blocks_preserves_document_order(self):
+        """Test that headings, paragraphs and list items come out in order"""
+        self.assertEqual(parse_html_blocks(self.SAMPLE_HTML), [
+            ParagraphRecord('Chapter 1', 'Heading1', 1),
+            ParagraphRecord('First & foremost, the witness.'),
+            ParagraphRecord('Exhibit A', 'ListBullet'),
+            ParagraphRecord('Exhibit B', 'ListBullet'),
+            ParagraphRecord('Section 1.1', 'Heading2', 2),
+            ParagraphRecord('Unclosed paragraph'),
+            ParagraphRecord('Next paragraph'),
+            ParagraphRecord('Step one', 'ListNumber'),
+        ])
+
+    def test_iter_html_blocks_streams_across_chunks(self):
+        """Test that feeding the file in small chunks gives the same blocks"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'sample.html')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.SAMPLE_HTML)
+
+            for chunk_size in (5, 64):
+                self.assertEqual(
+                    list(iter_html_blocks(path, read_chunk_size=chunk_size)),
+                    parse_html_blocks(self.SAMPLE_HTML)
+                )
+
+    def test_empty_files_load_as_empty_documents(self):
+        """Test that empty text, Markdown and HTML files load without paragraphs"""
+        from unittest.mock import MagicMock
+        from modules.document.loaders.core_loader import _iter_document_records
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for file_format in ('txt', 'md', 'html'):
+                path = os.path.join(temp_dir, f'empty.{file_format}')
+                open(path, 'w').close()
+
+                self.assertEqual(list(_iter_document_records(MagicMock(), path, file_format, False)), [])
+
+    def test_progress_counts_bytes(self):
+        """Test that progress on a multi-byte HTML file is measured in bytes"""
+        content = "<p>Q. Où étiez-vous le 5 juin ?</p>" * 2000
+        assert_progress_reaches_end(self, iter_html_blocks, content, 'utf16.html')
+
+    def test_load_path_accepts_script_elements(self):
+        """Test that a web-saved page with a script loads, while binary files are rejected"""
+        from unittest.mock import MagicMock
+        from modules.document.loaders.core_loader import _iter_document_records
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'saved.html')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.SAMPLE_HTML)
+            binary = os.path.join(temp_dir, 'binary.html')
+            with open(binary, 'wb') as f:
+                f.write(b"<p>text\x00more</p>")
+
+            records = list(_iter_document_records(MagicMock(), path, 'html', False))
+
+            self.assertEqual(records, parse_html_blocks(self.SAMPLE_HTML))
+            with self.assertRaises(ValueError):
+                _iter_document_records(MagicMock(), binary, 'html', False)
+
+class TestHtmlSanitizer(unittest.TestCase):
+    SAMPLE_HTML = (
+        "<h1 onclick='go()'>Chapter 1</h1><p>First &amp; <b>foremost</b>.</p>"
+        "<div class='exhibit'><p>Exhibit A</p><p>Exhibit B</p></div>"
+        "<!-- <p>hidden</p> --><p><a href='javascript:go()'>Link</a></p>"
+        "<table><tr><td><p>Cell</p></td></tr></table><p>Last <iframe>frame</iframe></p>"
+    )
+
+    def test_sanitize_html_matches_bleach(self):
+        """Test that the shared cleaner gives the same result as bleach.clean"""
+        import bleach
+        expected = bleach.clean(self.SAMPLE_HTML, tags=SAFE_TAGS, attributes=SAFE_ATTRIBUTES, strip=True)
+        self.assertEqual(sanitize_html(self.SAMPLE_HTML), expected)
+        self.assertEqual(sanitize_html(""), "")
+
+    def test_chunks_end_on_block_boundaries(self):
+        """Test that chunks cover the content and never split a container or comment"""
+        chunks = list(iter_html_chunks(self.SAMPLE_HTML, chunk_size=1))
+        self.assertEqual(''.join(chunks), self.SAMPLE_HTML)
+        self.assertEqual(chunks[2], "<div class='exhibit'><p>Exhibit A</p><p>Exhibit B</p></div>")
+        self.assertTrue(chunks[3].startswith("<!-- <p>hidden</p> -->"))
+        self.assertIn("<table><tr><td><p>Cell</p></td></tr></table>", chunks)
+
+    def test_chunked_sanitization_matches_whole(self):
+        """Test that sanitizing in small chunks gives the same output as one pass"""
+        content = self.SAMPLE_HTML * 20
+        expected = sanitize_html(content, chunk_size=len(content) + 1)
+        for chunk_size in (1, 100, 1000):
+            self.assertEqual(sanitize_html(content, chunk_size=chunk_size), expected)
+
+    def test_script_and_style_content_is_removed(self):
+        """Test that script and style elements are dropped with their content"""
+        content = (
+            "<style>p { color: red; }</style><p>Before</p>"
+            "<SCRIPT>var p = '<p>not text</p>';</script ><p>After</p><script>unclosed"
+        )
+        self.assertEqual(sanitize_html(content, chunk_size=1), "<p>Before</p><p>After</p>")
+
+    def test_cleaner_is_shared_per_thread(self):
+        """Test that each thread reuses its own cleaner"""
+        import threading
+        self.assertIs(get_html_cleaner(), get_html_cleaner())
+
+        cleaners = []
+        thread = threading.Thread(target=lambda: cleaners.append(get_html_cleaner()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(cleaners[0], get_html_cleaner())
+
+class TestMarkdownLoader(unittest.TestCase):
+    SAMPLE_MARKDOWN = (
+        "# Deposition Transcript #\n"
+        "The witness was sworn\n"
+        "and testified as follows.\n"
+        "\n"
+        "- Exhibit A\n"
+        "- Exhibit B\n"
+        "  continued on the next line\n"
+        "1. First question\n"
+        "```\n"
+        "# not a heading\n"
+        "\n"
+        "raw code\n"
+        "```\n"
+        "## Cross-examination\n"
+        "Last paragraph"
+    )
+
+    def test_parse_markdown_blocks(self):
+        """Test headings, paragraphs, list items and code fences"""
+        self.assertEqual(parse_markdown_blocks(self.SAMPLE_MARKDOWN), [
+            ParagraphRecord('Deposition Transcript', 'Heading1', 1),
+            ParagraphRecord('The witness was sworn and testified as follows.'),
+            ParagraphRecord('Exhibit A', 'ListBullet'),
+            ParagraphRecord('Exhibit B continued on the next line', 'ListBullet'),
+            ParagraphRecord('First question', 'ListNumber'),
+            ParagraphRecord('# not a heading\n\nraw code', 'Code'),
+            ParagraphRecord('Cross-examination', 'Heading2', 2),
+            ParagraphRecord('Last paragraph'),
+        ])
+
+    def test_state_is_kept_across_chunk_boundaries(self):
+        """Test that splitting the input anywhere gives the same blocks"""
+        expected = parse_markdown_blocks(self.SAMPLE_MARKDOWN)
+
+        for chunk_size in (1, 3, 17):
+            parser = MarkdownBlockParser()
+            blocks = []
+            for i in range(0, len(self.SAMPLE_MARKDOWN), chunk_size):
+                parser.feed(self.SAMPLE_MARKDOWN[i:i + chunk_size])
+                blocks.extend(parser.pop_blocks())
+            parser.close()
+            blocks.extend(parser.pop_blocks())
+
+            self.assertEqual(blocks, expected)
+
+    def test_progress_counts_bytes(self):
+        """Test that progress on a multi-byte Markdown file is measured in bytes"""
+        content = "Q. Où étiez-vous le 5 juin ?\n\n" * 2000
+        assert_progress_reaches_end(self, iter_markdown_blocks, content, 'utf16.md')
+
+def write_text_pdf(path, pages):
+    """Write a minimal PDF with one page per list of text lines."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for lines in pages:
+        operators = " ".join(f"({line}) Tj T*" for line in lines)
+        stream = f"BT /F1 12 Tf 14 TL 72 720 Td {operators} ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>"
+
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1')
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    data += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('latin-1')
+    data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('latin-1')
+
+    with open(path, 'wb') as f:
+        f.write(data)
+
+class TestPdfLoader(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'transcript.pdf')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_iter_pdf_paragraphs_keeps_page_numbers(self):
+        """Test that page lines stream out in order with their page numbers"""
+        write_text_pdf(self.path, [["Q. Where were you?", "A. At home."], ["Q. Alone?"]])
+
+        self.assertEqual(list(iter_pdf_paragraphs(self.path)), [
+            ParagraphRecord("Q. Where were you?", page=1),
+            ParagraphRecord("A. At home.", page=1),
+            ParagraphRecord("Q. Alone?", page=2),
+        ])
+
+    def test_parallel_extraction_preserves_page_order(self):
+        """Test that page ranges extracted by worker processes come back in order"""
+        write_text_pdf(self.path, [[f"Page {i} line"] for i in range(1, 61)])
+
+        records = list(iter_pdf_paragraphs(self.path, pages_per_task=7, max_workers=3))
+
+        self.assertEqual([record.page for record in records], list(range(1, 61)))
+        self.assertEqual(records[-1].text, "Page 60 line")
+
+class TestContentValidation(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_bytes(self, name, data):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_unsafe_tags_split_across_windows(self):
+        """Test that tags split between read windows are still found"""
+        html = "<p>" + "x" * 37 + "<SCRIPT type='a'>alert(1)</scr" + "ipt><p>after</p>"
+        path = self._write_bytes('page.html', html.encode('utf-8'))
+
+        for window_size in (1, 3, 7, 64):
+            self.assertEqual(
+                validate_file_stream(path, 'html', window_size=window_size),
+                (False, "File contains potentially unsafe script tags")
+            )
+        self.assertEqual(validate_file_stream(path, 'txt', window_size=7), (True, None))
+
+    def test_unclosed_or_reversed_tags_are_allowed(self):
+        """Test that a violation needs an opening tag followed by a closing tag"""
+        self.assertEqual(validate_file_content("</iframe> then <iframe src=x>", 'html'), (True, None))
+        self.assertEqual(
+            validate_file_content("<object data=x></OBJECT >", 'html'),
+            (False, "File contains potentially unsafe object tags")
+        )
+
+    def test_size_and_binary_checks(self):
+        """Test the stat size limit and binary detection, which ignores UTF-16 zero bytes"""
+        path = self._write_bytes('big.txt', b"a" * 101)
+        self.assertEqual(validate_file_stream(path, 'txt', max_size=100), (False, "File is too large"))
+        self.assertEqual(validate_file_stream(self._write_bytes('empty.txt', b""), 'txt'), (False, "File is empty"))
+
+        binary = self._write_bytes('binary.txt', b"text\x00more")
+        self.assertEqual(validate_file_stream(binary, 'txt'), (False, "File contains invalid binary data"))
+        wide = self._write_bytes('wide.txt', "Wide text".encode('utf-16'))
+        self.assertEqual(validate_file_stream(wide, 'txt', encoding='utf-16'), (True, None))
+
+    def test_sample_size_limits_the_bytes_checked(self):
+        """Test that only the leading sample is read when a sample size is given"""
+        path = self._write_bytes('late.txt', b"a" * 100 + b"\x00")
+
+        self.assertEqual(validate_file_stream(path, 'txt', window_size=7, sample_size=100), (True, None))
+        self.assertEqual(
+            validate_file_stream(path, 'txt', window_size=7, sample_size=101),
+            (False, "File contains invalid binary data")
+        )
+
+class TestDocumentModel(unittest.TestCase):
+    def test_records_expose_python_docx_style_names(self):
+        """Test that records answer style.name like python-docx paragraphs"""
+        model = DocumentModel()
+        model.add_heading("Title page", 0)
+        model.add_heading("Chapter One", 1)
+        model.add_paragraph("Item", 'ListBullet')
+        model.add_paragraph("Body")
+        model.paragraphs.append(ParagraphRecord("Custom heading", 'CourtHeading', 2))
+
+        self.assertEqual(
+            [para.style.name for para in model.paragraphs],
+            ['Title', 'Heading 1', 'List Bullet', 'Normal', 'Heading 2']
+        )
+        self.assertIs(model[1].style, ParagraphRecord("Other", 'Heading1', 1).style)
+
+    def test_processing_stages_accept_the_model(self):
+        """Test that chapter extraction works on model paragraphs"""
+        model = DocumentModel([
+            ParagraphRecord.heading("Chapter 1", 1),
+            ParagraphRecord("First body"),
+            ParagraphRecord.heading("Detail", 3),
+            ParagraphRecord.heading("Chapter 2", 1),
+            ParagraphRecord("Second body"),
+        ])
+
+        chapters = extract_chapters_from_headings(model)
+
+        self.assertEqual([chapter['title'] for chapter in chapters], ["Chapter 1", "Chapter 2"])
+        self.assertEqual(len(chapters[0]['content']), 3)
+        self.assertIs(chapters[1]['content'][1], model[4])
+
+    def test_snapshot_builds_paragraph_list_once(self):
+        """Test that a wrapped python-docx document reuses its paragraph list until changed"""
+        doc = Document()
+        doc.add_heading("Chapter One", 1)
+        doc.add_paragraph("First")
+        doc.add_paragraph("Second")
+        model = DocumentModel()
+
+        snapshot = snapshot_document(doc)
+
+        self.assertIsInstance(snapshot, DocumentSnapshot)
+        self.assertIs(snapshot_document(snapshot), snapshot)
+        self.assertIs(snapshot_document(model), model)
+        self.assertIs(snapshot.paragraphs, snapshot.paragraphs)
+        self.assertEqual([para.text for para in snapshot[1:]], ["First", "Second"])
+        self.assertEqual(snapshot[0].style.name, 'Heading 1')
+
+        snapshot.add_paragraph("Third")
+
+        self.assertEqual(len(snapshot), 4)
+        self.assertEqual(snapshot[-1].text, "Third")
+        self.assertIs(snapshot.document, doc)
+
+
+class TestStyleCache(unittest.TestCase):
+    def _custom_heading_document(self):
+        """Build a python-docx document with a custom outline-level heading style"""
+        from docx.enum.style import WD_STYLE_TYPE
+        from docx.oxml import OxmlElement
+        from docx.oxml.ns import qn
+
+        doc = Document()
+        style = doc.styles.add_style('Court Heading', WD_STYLE_TYPE.PARAGRAPH)
+        outline = OxmlElement('w:outlineLvl')
+        outline.set(qn('w:val'), '0')
+        style.element.get_or_add_pPr().append(outline)
+
+        doc.add_paragraph("Proceedings", style='Court Heading')
+        doc.add_paragraph("Opening statement")
+        doc.add_heading("Direct examination", 3)
+        doc.add_paragraph("Sentencing", style='Court Heading')
+        doc.add_paragraph("Closing")
+        return doc
+
+    def test_resolves_each_style_id_once(self):
+        """Test that paragraphs sharing a style id share one resolved entry"""
+        doc = self._custom_heading_document()
+        paragraphs = doc.paragraphs
+        cache = StyleCache()
+
+        self.assertEqual(
+            [cache.resolve(para) for para in paragraphs],
+            [('Court Heading', 1), ('Normal', 0), ('Heading 3', 3), ('Court Heading', 1), ('Normal', 0)]
+        )
+        self.assertIs(cache.resolve(paragraphs[0]), cache.resolve(paragraphs[3]))
+        self.assertTrue(cache.is_heading(paragraphs[2]))
+        self.assertEqual(cache.heading_level(ParagraphRecord.heading("Part", 3)), 3)
+        self.assertEqual(style_heading_level('Heading 1 Char'), 0)
+
+    def test_custom_heading_styles_start_chapters(self):
+        """Test chapter extraction on custom heading styles without a trailing digit"""
+        snapshot = snapshot_document(self._custom_heading_document())
+
+        chapters = extract_chapters_from_headings(snapshot)
+
+        self.assertIs(get_style_cache(snapshot), snapshot.style_cache)
+        self.assertEqual([chapter['title'] for chapter in chapters], ["Proceedings", "Sentencing"])
+        self.assertEqual(len(chapters[0]['content']), 3)
+
+class _StubApp:
+    """Minimal stand-in for the application object used by the processing stages"""
+
+    def __init__(self, document):
+        self.docx_content = document
+        self.book_title = type('Var', (), {'get': lambda self: "Book"})()
+        self.messages = []
+
+    def log(self, message):
+        self.messages.append(message)
+
+    def update_progress(self, value, message):
+        pass
+
+class TestStructureIndex(unittest.TestCase):
+    def test_index_summarizes_paragraphs_in_one_pass(self):
+        """Test the per-paragraph levels, flags, blank runs and lengths"""
+        model = DocumentModel([
+            ParagraphRecord("Transcript", 'Title'),
+            ParagraphRecord.heading("Chapter 1", 1),
+            ParagraphRecord(""),
+            ParagraphRecord("   "),
+            ParagraphRecord("  Part 2 begins"),
+            ParagraphRecord.heading("Custom", 12),
+            ParagraphRecord("1. First point"),
+        ])
+
+        index = StructureIndex(model.paragraphs, model)
+
+        self.assertEqual(len(index), 7)
+        self.assertEqual(list(index.heading_levels), [1, 1, 0, 0, 0, 12, 0])
+        self.assertEqual(index.flags[0], FLAG_TITLE)
+        self.assertEqual(index.flags[1], FLAG_HEADING | FLAG_CHAPTER_START | FLAG_CHAPTER_HEADING)
+        self.assertEqual(index.flags[4], FLAG_CHAPTER_HEADING)
+        self.assertEqual(list(index.blank_runs), [0, 0, 0, 1, 2, 0, 0])
+        self.assertEqual(list(index.text_lengths), [10, 9, 0, 3, 15, 6, 14])
+        self.assertEqual(index.headings_in(), [0, 1, 5])
+        self.assertEqual(index.headings_in(1, 5), [1])
+        self.assertEqual(index.find(FLAG_BLANK), [2, 3])
+        self.assertEqual(index.find(FLAG_CHAPTER_START, 2), [6])
+
+    def test_blank_line_sections_use_index(self):
+        """Test the blank-line fallback of chapter extraction"""
+        from modules.document.chapter_extractor import extract_chapters
+
+        model = DocumentModel([ParagraphRecord(text) for text in [
+            "Opening", "more opening", "", "", "Second section", "", "body", "", "", "", "Third",
+        ]])
+        app = _StubApp(model)
+
+        chapters = extract_chapters(app)
+
+        self.assertEqual([chapter['title'] for chapter in chapters], ["Opening", "Second section", "Third"])
+        self.assertEqual([para.text for para in chapters[1]['content']], ["Second section", "body"])
+        self.assertIsInstance(app.structure_index, StructureIndex)
+
+    def test_toc_and_enhancement_share_document_index(self):
+        """Test that later stages read chapter structure from the shared index"""
+        from modules.document.chapter_extractor import extract_chapters
+        from modules.document.content_enhancer import enhance_book_content
+        from modules.document.toc_generator import generate_table_of_contents
+
+        model = DocumentModel([
+            ParagraphRecord.heading("Chapter 1", 1),
+            ParagraphRecord("the witness  was sworn."),
+            ParagraphRecord.heading("direct examination", 3),
+            ParagraphRecord.heading("Chapter 2", 1),
+            ParagraphRecord.heading("cross", 3),
+            ParagraphRecord(""),
+            ParagraphRecord("no further questions."),
+        ])
+        app = _StubApp(model)
+        app.generate_toc = type('Var', (), {'get': lambda self: True})()
+
+        chapters = extract_chapters(app)
+        toc = generate_table_of_contents(app)
+        enhance_book_content(app)
+
+        self.assertEqual([chapter['start'] for chapter in chapters], [0, 3])
+        self.assertEqual(
+            [(entry['title'], entry['level'], entry['index']) for entry in toc],
+            [("Chapter 1", 1, 0), ("direct examination", 3, 0), ("Chapter 2", 1, 1), ("cross", 3, 1)]
+        )
+        self.assertEqual(model[1].text, "The witness was sworn.")
+        self.assertEqual(model[2].text, "direct examination")
+        self.assertEqual(model[6].text, "No further questions.")
+
+if __name__ == '__main__':
+    unittest.main()
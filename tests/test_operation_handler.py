@@ -4,6 +4,7 @@ from unittest.mock import patch, MagicMock
 import sys
 import os
 import time
+import logging
 
 # Add the parent directory to the path so we can import modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -21,6 +22,11 @@ class TestOperationHandler(unittest.TestCase):
         self.app.progress_value = MagicMock()
         self.app.update_progress = MagicMock()
         
+        # Remove the mocked file handlers the handler adds to shared loggers
+        for name in ("encoding_issues", "performance"):
+            logger = logging.getLogger(name)
+            self.addCleanup(setattr, logger, 'handlers', list(logger.handlers))
+        
         # Create an instance of the handler
         with patch('os.makedirs') as mock_makedirs, \
              patch('logging.FileHandler') as mock_file_handler:
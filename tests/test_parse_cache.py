@@ -0,0 +1,86 @@
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the parent directory to the path so we can import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.document.loaders.parse_cache import ParseCache
+from modules.document.loaders.records import ParagraphRecord
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ParseCache(os.path.join(self.temp_dir.name, 'cache'))
+        self.input_path = os.path.join(self.temp_dir.name, 'input.txt')
+        with open(self.input_path, 'w', encoding='utf-8') as f:
+            f.write("Original content")
+
+        self.records = [
+            ParagraphRecord.heading('Chapter 1', 1),
+            ParagraphRecord('Q. Où étiez-vous? — 😀'),
+            ParagraphRecord(''),
+            ParagraphRecord('Exhibit A', 'ListBullet'),
+            ParagraphRecord('Page two line', page=2),
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        """Test that stored records load back unchanged"""
+        key = self.cache.make_key(self.input_path, 'txt')
+        self.assertIsNone(self.cache.load(key))
+
+        self.cache.store(key, self.records)
+        self.assertEqual(self.cache.load(key), self.records)
+
+    def test_iter_and_store_caches_exhausted_stream(self):
+        """Test that records are cached only once the stream is consumed"""
+        key = self.cache.make_key(self.input_path, 'txt')
+        stream = self.cache.iter_and_store(key, iter(self.records))
+
+        next(stream)
+        self.assertIsNone(self.cache.load(key))
+
+        self.assertEqual(len(list(stream)), len(self.records) - 1)
+        self.assertEqual(self.cache.load(key), self.records)
+
+    def test_key_depends_on_content_and_format(self):
+        """Test that changed content or format gives a different key"""
+        key = self.cache.make_key(self.input_path, 'txt')
+        self.assertNotEqual(key, self.cache.make_key(self.input_path, 'md'))
+
+        with open(self.input_path, 'w', encoding='utf-8') as f:
+            f.write("Changed content!")
+        os.utime(self.input_path, ns=(1, 1))
+        self.assertNotEqual(key, self.cache.make_key(self.input_path, 'txt'))
+
+    def test_corrupt_entry_is_discarded(self):
+        """Test that unreadable entries count as misses"""
+        key = self.cache.make_key(self.input_path, 'txt')
+        self.cache.store(key, self.records)
+        with open(self.cache._entry_path(key), 'wb') as f:
+            f.write(b'garbage')
+
+        self.assertIsNone(self.cache.load(key))
+        self.assertFalse(os.path.exists(self.cache._entry_path(key)))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """Test that the cache stays within its size limit"""
+        self.cache.store('first', self.records)
+        self.cache.store('second', self.records)
+        entry_size = os.path.getsize(self.cache._entry_path('first'))
+
+        # Make 'first' the oldest entry, then shrink the budget to one entry
+        os.utime(self.cache._entry_path('first'), (0, 0))
+        self.cache.max_size = entry_size
+        self.cache.evict()
+
+        self.assertIsNone(self.cache.load('first'))
+        self.assertEqual(self.cache.load('second'), self.records)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the parent directory to the path so we can import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from docx import Document
+from modules.document.preflight import inspect_file, inspect_files, PreflightResult
+from modules.document.batch_processor import _pack_batches
+
+class TestPreflight(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_bytes(self, name, data):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_inspect_text_file(self):
+        """Test that text files get an encoding and a paragraph estimate"""
+        path = self._write_bytes('sample.txt', "Q. Where were you?\nA. At home.\n\n".encode('utf-8') * 100)
+
+        result = inspect_file(path)
+
+        self.assertTrue(result.is_supported)
+        self.assertEqual(result.file_format, 'txt')
+        self.assertEqual(result.encoding, 'utf-8')
+        self.assertEqual(result.estimated_paragraphs, 200)
+        self.assertGreater(result.estimated_memory, result.file_size)
+
+    def test_inspect_docx_file(self):
+        """Test that DOCX packages are validated and their paragraphs estimated"""
+        doc = Document()
+        for i in range(50):
+            doc.add_paragraph(f"Paragraph {i}")
+        path = os.path.join(self.temp_dir.name, 'sample.docx')
+        doc.save(path)
+
+        result = inspect_file(path)
+
+        self.assertTrue(result.is_supported)
+        self.assertEqual(result.content_format, 'zip')
+        self.assertEqual(result.estimated_paragraphs, 50)
+
+    def test_problem_files_are_reported(self):
+        """Test that unsupported, empty and corrupt files are flagged without raising"""
+        cases = {
+            'notes.rtf': b"{\\rtf1 text}",
+            'empty.txt': b"",
+            'fake.docx': b"This is not a zip archive",
+            'broken.docx': b"PK\x03\x04" + b"\x00" * 100,
+            'image.txt': b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR",
+        }
+        for name, data in cases.items():
+            result = inspect_file(self._write_bytes(name, data))
+            self.assertFalse(result.is_supported, name)
+            self.assertTrue(result.error, name)
+
+    def test_inspect_files_keeps_order(self):
+        """Test that parallel inspection returns results in input order"""
+        paths = [
+            self._write_bytes(f"file{i}.txt", b"line\n" * (i + 1))
+            for i in range(5)
+        ]
+
+        results = inspect_files(paths, max_workers=2)
+
+        self.assertEqual([result.file_path for result in results], paths)
+        self.assertEqual([result.estimated_paragraphs for result in results], [1, 2, 3, 4, 5])
+
+    def test_pack_batches_by_estimated_memory(self):
+        """Test that batches respect the memory budget and oversized files run alone"""
+        inspections = []
+        for name, memory in (('a', 30), ('b', 40), ('c', 50), ('d', 150), ('e', 10)):
+            inspection = PreflightResult(name)
+            inspection.estimated_memory = memory
+            inspections.append(inspection)
+
+        batches = _pack_batches(inspections, 100)
+
+        self.assertEqual(
+            [[inspection.file_path for inspection in batch] for batch in batches],
+            [['a', 'b'], ['c'], ['d'], ['e']]
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -90,5 +90,346 @@ class TestTextProcessor(unittest.TestCase):
         # Verify the function reported no encoding issues
         self.assertFalse(result)
 
+    def test_parallel_fix_matches_serial(self):
+        """Test that fixing in worker processes gives the same result as in process"""
+        from modules.document import text_processor
+        from modules.document.loaders.records import DocumentModel, ParagraphRecord
+        texts = ["Plain line", "It isnâ€™t “quoted”", "Tom &amp; Jerry", "Usage: do this ¶"] * 10
+
+        results = []
+        for min_paragraphs in (len(texts) + 1, 1):
+            app = MagicMock()
+            app.docx_content = DocumentModel([ParagraphRecord(text) for text in texts])
+            with patch.object(text_processor, 'PARALLEL_MIN_PARAGRAPHS', min_paragraphs):
+                has_issues = fix_text_encoding(app, paragraphs_per_task=7, max_workers=2)
+            results.append((has_issues, [para.text for para in app.docx_content]))
+
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0][1][:4], ["Plain line", "It isn't \"quoted\"", "Tom & Jerry", ""])
+
+class TestTextPipeline(unittest.TestCase):
+    def test_adjacent_stages_are_fused(self):
+        """Test that translate tables merge and repeated forms collapse"""
+        import unicodedata
+        from modules.document.text_processing.pipeline import TextPipeline, TranslateStage, NormalizeStage
+
+        first = TranslateStage('quotes', {'“': '"', '”': '"', 'x': 'y'})
+        second = TranslateStage('letters', {'y': 'z', '"': "'"})
+        pipeline = TextPipeline([first, second, NormalizeStage('NFKD'), NormalizeStage('NFKD')])
+
+        self.assertEqual([stage.name for stage in pipeline.stages], ['quotes+letters', 'nfkd'])
+        text = '“xy” café'
+        expected = unicodedata.normalize('NFKD', text.translate(first.table).translate(second.table))
+        self.assertEqual(pipeline.process(text), expected)
+
+    def test_gated_stages_and_statistics(self):
+        """Test that gated stages are skipped and hits count changed text"""
+        from modules.document.text_processing.pipeline import TextPipeline, Stage
+
+        calls = []
+        def entities(text):
+            calls.append(text)
+            return text.replace('&amp;', '&')
+        pipeline = TextPipeline([Stage('entities', entities, requires='&'), Stage('strip', str.strip)])
+
+        results = [pipeline.process(text) for text in ["plain", "Tom &amp; Jerry ", "a & b"]]
+
+        self.assertEqual(results, ["plain", "Tom & Jerry", "a & b"])
+        self.assertEqual(calls, ["Tom &amp; Jerry ", "a & b"])
+        stats = pipeline.stats()
+        self.assertEqual((stats['entities']['calls'], stats['entities']['hits']), (2, 1))
+        self.assertEqual((stats['strip']['calls'], stats['strip']['hits']), (3, 1))
+
+    def test_normalized_text_is_returned_unchanged(self):
+        """Test the is_normalized short circuit"""
+        import unicodedata
+        from modules.document.text_processing.pipeline import TextPipeline, NormalizeStage
+        text = unicodedata.normalize('NFKD', "Déjà vu")
+        self.assertIs(TextPipeline([NormalizeStage('NFKD')]).process(text), text)
+
+class TestParagraphCache(unittest.TestCase):
+    def test_lru_eviction_and_length_limit(self):
+        """Test that the least recently used entry goes first and long texts are not kept"""
+        from modules.document.text_processing.paragraph_cache import ParagraphCache
+        cache = ParagraphCache(maxsize=2, max_length=10)
+        cache.put("Q.", "q")
+        cache.put("A.", "a")
+        cache.get("Q.")
+        cache.put("MR. SMITH:", "smith")
+        cache.put("x" * 11, "long")
+
+        self.assertEqual(cache.get("Q."), "q")
+        self.assertIsNone(cache.get("A."))
+        self.assertIsNone(cache.get("x" * 11))
+        self.assertEqual(len(cache), 2)
+
+    def test_memoize_counts_hits(self):
+        """Test that repeated texts are computed once"""
+        from modules.document.text_processing.paragraph_cache import ParagraphCache
+        calls = []
+        cache = ParagraphCache()
+        upper = cache.memoize(lambda text: calls.append(text) or text.upper())
+
+        results = [upper(text) for text in ["Q.", "A.", "Q.", "Q."]]
+
+        self.assertEqual(results, ["Q.", "A.", "Q.", "Q."])
+        self.assertEqual(calls, ["Q.", "A."])
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_fix_batch_processes_each_distinct_text_once(self):
+        """Test that duplicate paragraphs in a fix batch reuse one result"""
+        from modules.document import text_processor
+        text_processor.get_fix_cache().clear()
+        texts = ["Q. “Yes”", "A.", "Q. “Yes”", "A.", "Q. “Yes”"]
+
+        changes, count, _, _, cache_stats = text_processor.fix_paragraph_batch(10, texts)
+
+        self.assertEqual(changes, [(10, 'Q. "Yes"'), (12, 'Q. "Yes"'), (14, 'Q. "Yes"')])
+        self.assertEqual(count, 6)
+        self.assertEqual(cache_stats, {'hits': 3, 'misses': 2})
+
+    def test_concurrent_fix_batches_keep_their_own_statistics(self):
+        """Test that batches fixed from several threads report only their own stage statistics"""
+        from concurrent.futures import ThreadPoolExecutor
+        from modules.document import text_processor
+        text_processor.get_fix_cache().clear()
+        batches = [[f"Batch {batch} line {line} “quoted”" for line in range(300)] for batch in range(8)]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(text_processor.fix_paragraph_batch, range(8), batches))
+
+        for changes, _, _, stats, cache_stats in results:
+            self.assertEqual(len(changes), 300)
+            self.assertEqual(cache_stats, {'hits': 0, 'misses': 300})
+            self.assertEqual((stats['characters']['calls'], stats['characters']['hits']), (300, 300))
+
+class TestWorkerImports(unittest.TestCase):
+    def test_importing_modules_does_not_start_logging(self):
+        """Test that a process importing the processing modules, like a pool worker, creates no log file"""
+        import subprocess
+        import tempfile
+
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            subprocess.run(
+                [sys.executable, '-c', 'import modules.utils.error_handler, modules.document.text_processor'],
+                cwd=temp_dir, env={**os.environ, 'PYTHONPATH': root}, check=True, capture_output=True
+            )
+
+            self.assertFalse(os.path.exists(os.path.join(temp_dir, 'Logs')))
+
+class TestSentenceSegmenter(unittest.TestCase):
+    def _sentences(self, text):
+        from modules.document.text_processing.sentences import sentence_spans
+        return [text[start:end] for start, end in sentence_spans(text)]
+
+    def test_abbreviations_do_not_end_sentences(self):
+        """Test that abbreviations, initials and initialisms are not boundaries"""
+        from modules.document.text_processing.sentences import sentence_spans, count_sentences
+
+        text = "Mr. Smith sued under 42 U.S.C. § 1983. the court agreed! Did it?  \"Yes.\" At 9 a.m. John F. Doe left."
+        self.assertEqual(self._sentences(text), [
+            "Mr. Smith sued under 42 U.S.C. § 1983.",
+            "the court agreed!",
+            "Did it?",
+            "\"Yes.\"",
+            "At 9 a.m. John F. Doe left.",
+        ])
+        self.assertEqual(self._sentences("  Q. Where were you?  A. At home.  "), ["Q. Where were you?", "A. At home."])
+        self.assertEqual(count_sentences("Paid $3.50 in No. 5 Inc. today. Done"), 2)
+        self.assertEqual(sentence_spans("   "), [])
+
+    def test_chunks_end_between_sentences(self):
+        """Test that paragraphs are packed whole and long ones split at sentence ends"""
+        from modules.document.text_processing.sentences import chunk_sentences
+
+        texts = ["a" * 10, "Short one. Another one here. And a third sentence.", "b" * 5]
+        self.assertEqual(list(chunk_sentences(texts, 20)), [
+            "a" * 10, "Short one.", "Another one here.", "And a third sentence.", "b" * 5
+        ])
+        self.assertEqual(list(chunk_sentences(texts, 100)), ["\n".join(texts)])
+
+    def test_enhancer_capitalizes_sentences_only(self):
+        """Test that capitalization keeps abbreviations and the spaces between sentences"""
+        from modules.document.content_enhancer import enhance_paragraph_text
+
+        self.assertEqual(
+            enhance_paragraph_text("the witness, Mr. jones, arrived. he sat down."),
+            "The witness, Mr. jones, arrived. He sat down."
+        )
+
+    def test_enhancer_keeps_abbreviations_together(self):
+        """Test that punctuation spacing leaves abbreviations and initialisms intact"""
+        from modules.document.content_enhancer import enhance_paragraph_text
+
+        self.assertEqual(
+            enhance_paragraph_text("under 18 U.S.C. section 1001,as charged"),
+            "Under 18 U.S.C. section 1001, as charged"
+        )
+        self.assertEqual(
+            enhance_paragraph_text("we recessed at 3 p.m. and returned.The jury was seated"),
+            "We recessed at 3 p.m. and returned. The jury was seated"
+        )
+
+class TestArtifactMatcher(unittest.TestCase):
+    def test_remove_transcription_artifacts(self):
+        """Test that artifact lines are removed and ordinary text is kept"""
+        from modules.document.text_processor import remove_transcription_artifacts
+
+        test_cases = [
+            ("Ensure the speaker is named ¶", ""),
+            ("[Timestamp] 00:01:02", ""),
+            ("Note: keep this ¶\nReal text", "Real text"),
+            ("a\nUsage: x¶\n\n\nb", "a\n\nb"),
+            ("[Exhibit 1] admitted", "[Exhibit 1] admitted"),
+            ("Q. Where were you?", "Q. Where were you?"),
+        ]
+
+        for input_text, expected_output in test_cases:
+            self.assertEqual(remove_transcription_artifacts(input_text), expected_output)
+
+    def test_matches_sequential_multiline_substitution(self):
+        """Test parity with the former per-pattern MULTILINE re.sub passes across line breaks"""
+        import re
+        from modules.document.text_processing.artifacts import ArtifactMatcher, DEFAULT_ARTIFACT_PATTERNS
+
+        def legacy_remove(text):
+            for _, pattern in DEFAULT_ARTIFACT_PATTERNS:
+                text = re.sub(pattern, '', text, flags=re.MULTILINE)
+            return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+        matcher = ArtifactMatcher(DEFAULT_ARTIFACT_PATTERNS)
+        test_cases = [
+            "\n•¶",
+            "Q. Yes.\n\n   \n•¶\nA. No.",
+            "first line\nsecond ¶\n",
+            "Ensure\nthe speaker\nis named |\nA. Yes.",
+            "Note: a\n[Speaker] Smith\nb ¶  \n\n",
+            "\n\n[Time] 10:00\n\nUsage: x |\n\n\nText",
+            "  \n  Correct vs. Incorrect ¶\nkept",
+            "no trigger\n\n\n\nhere",
+        ]
+
+        self.assertEqual(matcher.remove("\n•¶"), "")
+        for text in test_cases:
+            self.assertEqual(matcher.remove(text), legacy_remove(text), repr(text))
+
+    def test_config_patterns_extend_defaults(self):
+        """Test that patterns loaded from a config file are applied"""
+        import json
+        import tempfile
+        from modules.document.text_processing.artifacts import (
+            ArtifactMatcher, DEFAULT_ARTIFACT_PATTERNS, load_artifact_patterns
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = os.path.join(temp_dir, 'artifact_patterns.json')
+            with open(config_path, 'w', encoding='utf-8') as f:
+                json.dump({'patterns': [
+                    {'pattern': r'^\[(Sealed|Redacted)\].*$', 'trigger': 'leading_bracket'},
+                    {'pattern': r'^\s*--- page break ---\s*$'},
+                    {'pattern': r'(unclosed', 'trigger': 'any'},
+                    {'pattern': r'^x$', 'trigger': 'unknown'},
+                ]}, f)
+
+            patterns = load_artifact_patterns(config_path)
+
+        self.assertEqual(len(patterns), 2)
+        matcher = ArtifactMatcher(DEFAULT_ARTIFACT_PATTERNS + patterns)
+        self.assertEqual(
+            matcher.remove("[Sealed] bench conference\n--- page break ---\nQ. Next question"),
+            "Q. Next question"
+        )
+
+class TestParagraphPatch(unittest.TestCase):
+    def _make_paragraph(self, parts):
+        """Build a python-docx paragraph from (text, bold) parts"""
+        import docx
+        paragraph = docx.Document().add_paragraph()
+        for text, bold in parts:
+            paragraph.add_run(text).bold = bold
+        return paragraph
+
+    def test_map_edits_to_runs(self):
+        """Test that edits land in the runs holding the edited characters"""
+        from modules.document.paragraph_patch import map_edits_to_runs
+
+        runs = ["The ", "witness", " saidâ€™ yes"]
+        self.assertEqual(
+            map_edits_to_runs(runs, "The witness said' yes"),
+            ["The ", "witness", " said' yes"]
+        )
+        # Insertions go to the run before them, replacements spanning runs to the first
+        self.assertEqual(map_edits_to_runs(["ab", "cd"], "abXcd"), ["abX", "cd"])
+        self.assertEqual(map_edits_to_runs(["ab", "cd"], "aZd"), ["aZ", "d"])
+        self.assertEqual(map_edits_to_runs(["", "ab"], "xab"), ["", "xab"])
+
+    def test_formatting_survives_and_unchanged_runs_are_kept(self):
+        """Test that only changed runs are rewritten and bold runs stay bold"""
+        from modules.document.paragraph_patch import apply_paragraph_text
+
+        paragraph = self._make_paragraph([("Q. ", False), ("Objection", True), (" , your honor", False)])
+        bold_element = paragraph.runs[1]._r
+
+        self.assertTrue(apply_paragraph_text(paragraph, "Q. Objection, your honor"))
+
+        self.assertEqual(paragraph.text, "Q. Objection, your honor")
+        self.assertEqual([run.bold for run in paragraph.runs], [False, True, False])
+        self.assertIs(paragraph.runs[1]._r, bold_element)
+        self.assertFalse(apply_paragraph_text(paragraph, "Q. Objection, your honor"))
+
+    def test_long_multi_run_paragraph_is_patched_in_linear_time(self):
+        """Test that a long paragraph with scattered edits is written back quickly and correctly"""
+        import time
+        from modules.document.paragraph_patch import apply_paragraph_text
+
+        text = "Q. Whereâ€™s the car, sir? " * 1500
+        paragraph = self._make_paragraph([(text[:12000], False), (text[12000:24000], True), (text[24000:], False)])
+        new_text = text.replace("â€™", "'")
+
+        started = time.perf_counter()
+        self.assertTrue(apply_paragraph_text(paragraph, new_text))
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(paragraph.text, new_text)
+        self.assertEqual([run.bold for run in paragraph.runs], [False, True, False])
+        self.assertLess(elapsed, 1.0)
+
+    def test_model_paragraph_takes_text(self):
+        """Test that paragraphs without runs are updated directly"""
+        from modules.document.loaders.records import ParagraphRecord
+        from modules.document.paragraph_patch import apply_paragraph_text
+        record = ParagraphRecord("old")
+
+        self.assertTrue(apply_paragraph_text(record, "new"))
+        self.assertEqual(record.text, "new")
+
+    def test_enhancement_keeps_runs_of_loaded_docx(self):
+        """Test that enhancing a loaded DOCX edits its runs in place and keeps bold text"""
+        import tempfile
+        import docx
+        from modules.document.chapter_extractor import extract_chapters
+        from modules.document.content_enhancer import enhance_book_content
+        from modules.document.loaders.docx_loader import load_docx_document
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'transcript.docx')
+            doc = docx.Document()
+            doc.add_heading("Chapter 1", level=1)
+            paragraph = doc.add_paragraph("the witness  was ")
+            paragraph.add_run("sworn").bold = True
+            paragraph.add_run(" in.")
+            doc.save(path)
+
+            app = MagicMock()
+            app.docx_content = load_docx_document(path)
+            app.chapters = extract_chapters(app)
+            enhance_book_content(app)
+
+            paragraph = app.docx_content.paragraphs[1]
+            self.assertEqual(paragraph.text, "The witness was sworn in.")
+            self.assertEqual([(run.text, run.bold) for run in paragraph.runs],
+                             [("The witness was ", None), ("sworn", True), (" in.", None)])
+
 if __name__ == '__main__':
     unittest.main()